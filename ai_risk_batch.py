@@ -0,0 +1,204 @@
+"""
+Jobless AI - 批量风险评估（NumPy 列式实现）
+
+与 ``AIAutomationRiskModel.full_assessment`` 的计算逐项相同，但一次处理成千上万个画像：
+任务、技能按列存放，用 offsets 表示每个画像的区间（第 i 个画像的任务为
+``task_offsets[i]:task_offsets[i+1]``）。
+
+为保证与逐个评估的结果完全一致（逐位相同）：
+- 加权求和按画像内顺序逐项累加，不使用成对求和；
+- 同名技能按字典语义处理（保留首次出现的位置、最后一次的取值），分母仍为技能条数；
+- 对数和 1 位小数舍入使用 ``math.log`` / ``round``，与标量路径一致。
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ai_risk_model import DEFAULT_BENCHMARK, AIAutomationRiskModel, SkillRequirement, TaskAssessment
+
+
+TASK_FACTORS = ("重复性", "规则明确度", "创造性要求", "人际交互", "物理操作")
+RISK_LEVELS = np.array(["低", "中", "高", "极高"])
+
+
+@dataclass
+class ProfileBatch:
+    """列式画像批次：任务、技能各自拼接，offsets 长度为画像数 + 1"""
+    task_offsets: np.ndarray
+    重复性: np.ndarray
+    规则明确度: np.ndarray
+    创造性要求: np.ndarray
+    人际交互: np.ndarray
+    物理操作: np.ndarray
+    工时占比: np.ndarray
+    skill_offsets: np.ndarray
+    技能名称: np.ndarray
+    重要程度: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.task_offsets) - 1
+
+    def skill_codes(self) -> Tuple[np.ndarray, List[str]]:
+        """技能名称的字典编码：(编码, 词表)"""
+        vocab, codes = np.unique(np.asarray(self.技能名称, dtype=str), return_inverse=True)
+        return codes.astype(np.int64), [str(v) for v in vocab]
+
+    @classmethod
+    def from_profiles(cls, profiles: Sequence[Tuple[Sequence[TaskAssessment], Sequence[SkillRequirement]]]) -> "ProfileBatch":
+        tasks = [t for ts, _ in profiles for t in ts]
+        skills = [s for _, ss in profiles for s in ss]
+        return cls(
+            task_offsets=np.concatenate([[0], np.cumsum([len(ts) for ts, _ in profiles])]).astype(np.int64),
+            **{f: np.array([getattr(t, f) for t in tasks], dtype=np.int64) for f in TASK_FACTORS},
+            工时占比=np.array([t.工时占比 for t in tasks], dtype=np.float64),
+            skill_offsets=np.concatenate([[0], np.cumsum([len(ss) for _, ss in profiles])]).astype(np.int64),
+            技能名称=np.array([s.技能名称 for s in skills], dtype=str),
+            重要程度=np.array([s.重要程度 for s in skills], dtype=np.int64),
+        )
+
+
+@dataclass
+class BatchAssessmentResult:
+    """批量评估结果（每个画像一行；任务、技能级结果与输入数组对齐）"""
+    任务评分: np.ndarray
+    技能脆弱性: np.ndarray
+    技能平均风险: np.ndarray
+    总体风险评分: np.ndarray  # 已保留 1 位小数，同 full_assessment
+    风险等级: np.ndarray
+    预计替代年份: np.ndarray
+    最早年份: np.ndarray
+    最晚年份: np.ndarray
+
+
+def benchmark_columns(
+    vocab: Sequence[str], benchmarks: dict, default: dict = DEFAULT_BENCHMARK
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """按词表展开 AI 能力基准：(当前, 年增长率, 上限)，缺省值同标量路径"""
+    rows = [benchmarks.get(name, default) for name in vocab]
+    return (
+        np.array([r["当前"] for r in rows], dtype=np.float64),
+        np.array([r["年增长率"] for r in rows], dtype=np.float64),
+        np.array([r["上限"] for r in rows], dtype=np.float64),
+    )
+
+
+def segment_sum_ordered(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """每段从 0 开始按顺序逐项累加（与 Python 循环的舍入相同）"""
+    lengths = np.diff(offsets)
+    out = np.zeros(len(lengths))
+    for k in range(int(lengths.max(initial=0))):
+        rows = np.flatnonzero(lengths > k)
+        out[rows] = out[rows] + values[offsets[rows] + k]
+    return out
+
+
+def task_scores(batch: ProfileBatch) -> np.ndarray:
+    """assess_task_automatability 的列式版本"""
+    f = {name: np.asarray(getattr(batch, name), dtype=np.float64) for name in TASK_FACTORS}
+    automation_friendly = f["重复性"] * 0.30 + f["规则明确度"] * 0.25
+    automation_resistant = (100 - f["创造性要求"]) * 0.20 + (100 - f["人际交互"]) * 0.15 + (100 - f["物理操作"]) * 0.10
+    return automation_friendly + automation_resistant
+
+
+def _dict_slots(profile: np.ndarray, codes: np.ndarray, n_codes: int) -> Tuple[np.ndarray, np.ndarray]:
+    """同一画像内同名技能：(首次出现位置, 最后一次出现位置)"""
+    key = profile * max(n_codes, 1) + codes
+    _, first = np.unique(key, return_index=True)
+    _, last_rev = np.unique(key[::-1], return_index=True)
+    return first, len(key) - 1 - last_rev
+
+
+def predict_timelines(current_year: int, scores: np.ndarray, growth: np.ndarray, threshold: float = 90) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """predict_automation_timeline 的列式版本：(预计年份, 最早年份, 最晚年份)"""
+    n = len(scores)
+    predicted = np.full(n, current_year, dtype=np.int64)
+    earliest = predicted.copy()
+    latest = predicted.copy()
+    todo = np.flatnonzero(~(scores >= threshold))
+    if len(todo):
+        remaining = threshold - scores[todo]
+        base_years = remaining / growth[todo]
+        ratio = threshold / (threshold - remaining + 1)
+        log_ratio = np.fromiter(map(math.log, ratio.tolist()), dtype=np.float64, count=len(ratio))
+        estimated = base_years * (1 + log_ratio * 0.3)
+        predicted[todo] = current_year + np.ceil(estimated).astype(np.int64)
+        earliest[todo] = current_year + np.ceil(estimated * 0.7).astype(np.int64)
+        latest[todo] = current_year + np.ceil(estimated * 1.5).astype(np.int64)
+    return predicted, earliest, latest
+
+
+@dataclass
+class ScoreComponents:
+    """未舍入的中间结果（供 batch_assess 与蒙特卡洛时间线共用）"""
+    任务评分: np.ndarray
+    技能脆弱性: np.ndarray
+    技能平均风险: np.ndarray
+    总体风险评分: np.ndarray  # 未舍入
+    平均增长率: np.ndarray
+    技能编码: np.ndarray
+    技能词表: List[str]
+
+
+def score_components(model: AIAutomationRiskModel, batch: ProfileBatch, year: Optional[int] = None) -> ScoreComponents:
+    """batch_assess 的数值部分（总体风险评分未舍入；year 为评估年份）"""
+    n = len(batch)
+    t_off = np.asarray(batch.task_offsets, dtype=np.int64)
+    s_off = np.asarray(batch.skill_offsets, dtype=np.int64)
+
+    # 1. 任务评分与工时加权
+    scores = task_scores(batch)
+    total_risk = segment_sum_ordered(scores * np.asarray(batch.工时占比, dtype=np.float64), t_off)
+
+    # 2. 技能脆弱性（字典语义：同名技能只计一次，取最后一次的值）
+    codes, vocab = batch.skill_codes()
+    current, growth_rate, _ = benchmark_columns(vocab, *model.benchmarks_for(year))
+    vulnerability = (current[codes] / 100) * (np.asarray(batch.重要程度, dtype=np.float64) / 5)
+    n_skills = np.diff(s_off)
+    profile = np.repeat(np.arange(n), n_skills)
+    first, last = _dict_slots(profile, codes, len(vocab))
+    counted = np.zeros(len(codes))
+    counted[first] = vulnerability[last]
+    has_skills = n_skills > 0
+    avg_skill_risk = np.full(n, 0.5)
+    avg_skill_risk[has_skills] = segment_sum_ordered(counted, s_off)[has_skills] / n_skills[has_skills]
+
+    # 3. 综合评分（70%任务风险 + 30%技能风险）
+    overall = total_risk * 0.7 + avg_skill_risk * 100 * 0.3
+
+    # 4. 平均增长率按技能条数计（含重复）
+    avg_growth = np.full(n, 12.0)
+    avg_growth[has_skills] = segment_sum_ordered(growth_rate[codes], s_off)[has_skills] / n_skills[has_skills]
+    return ScoreComponents(
+        任务评分=scores,
+        技能脆弱性=vulnerability,
+        技能平均风险=avg_skill_risk,
+        总体风险评分=overall,
+        平均增长率=avg_growth,
+        技能编码=codes,
+        技能词表=vocab,
+    )
+
+
+def batch_assess(model: AIAutomationRiskModel, batch: ProfileBatch, year: Optional[int] = None) -> BatchAssessmentResult:
+    """对整批画像执行 full_assessment 的评分部分（不生成文字建议；year 为评估年份）"""
+    c = score_components(model, batch, year)
+    overall = c.总体风险评分
+    level = np.select([overall >= 80, overall >= 60, overall >= 40], [3, 2, 1], default=0)
+    base_year = model.current_year if year is None else year
+    predicted, earliest, latest = predict_timelines(base_year, overall, c.平均增长率)
+
+    return BatchAssessmentResult(
+        任务评分=c.任务评分,
+        技能脆弱性=c.技能脆弱性,
+        技能平均风险=c.技能平均风险,
+        总体风险评分=np.fromiter((round(v, 1) for v in overall.tolist()), dtype=np.float64, count=len(overall)),
+        风险等级=RISK_LEVELS[level],
+        预计替代年份=predicted,
+        最早年份=earliest,
+        最晚年份=latest,
+    )
@@ -0,0 +1,89 @@
+"""
+Jobless AI - full_assessment 批量调用的耗时与内存基准
+
+对同一组随机画像比较三种用法：
+- eager：评估后立即访问关键脆弱点 / 建议行动 / 详细分析（等同于旧的即时构造）；
+- lazy：只读取总体风险评分、风险等级、预计替代年份（重字段从未生成）；
+- scores_only：full_assessment(..., scores_only=True)，不保留中间结果。
+
+耗时按 n 次评估统计；内存用 tracemalloc 在前 alloc_sample 次上测量
+（分配总量 = 峰值，保留量 = 结果列表仍持有的内存），按每次评估折算。
+
+用法:
+    python ai_risk_benchmark.py [--n 1000000] [--alloc-sample 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable, List, Sequence, Tuple
+
+from ai_risk_model import AIAutomationRiskModel, SkillRequirement, TaskAssessment
+
+
+Profile = Tuple[List[TaskAssessment], List[SkillRequirement]]
+
+
+def random_profiles(n: int, seed: int = 0) -> List[Profile]:
+    rnd = random.Random(seed)
+    names = list(AIAutomationRiskModel.AI_CAPABILITY_BENCHMARKS) + ["其他"]
+    profiles = []
+    for _ in range(n):
+        tasks = [
+            TaskAssessment(f"任务{k}", *(rnd.randint(0, 100) for _ in range(5)), 工时占比=rnd.random() / 3)
+            for k in range(rnd.randint(1, 6))
+        ]
+        skills = [SkillRequirement(rnd.choice(names), rnd.randint(1, 5), 0) for _ in range(rnd.randint(1, 4))]
+        profiles.append((tasks, skills))
+    return profiles
+
+
+def _modes(model: AIAutomationRiskModel) -> List[Tuple[str, Callable[[Profile], object]]]:
+    def eager(p: Profile):
+        r = model.full_assessment(*p, job_title="基准")
+        r.关键脆弱点, r.建议行动, r.详细分析
+        return r
+
+    return [
+        ("eager", eager),
+        ("lazy", lambda p: model.full_assessment(*p, job_title="基准")),
+        ("scores_only", lambda p: model.full_assessment(*p, job_title="基准", scores_only=True)),
+    ]
+
+
+def _cycle(profiles: Sequence[Profile], n: int):
+    for i in range(n):
+        yield profiles[i % len(profiles)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark eager vs lazy vs scores-only assessments.")
+    parser.add_argument("--n", type=int, default=1_000_000)
+    parser.add_argument("--alloc-sample", type=int, default=20_000)
+    parser.add_argument("--profiles", type=int, default=10_000, help="Distinct random profiles (cycled).")
+    args = parser.parse_args()
+
+    profiles = random_profiles(args.profiles)
+    model = AIAutomationRiskModel()
+    print(f"{'mode':<12} {'time (s)':>10} {'us/call':>9} {'peak B/call':>12} {'kept B/call':>12}")
+    for name, fn in _modes(model):
+        t0 = time.perf_counter()
+        for p in _cycle(profiles, args.n):
+            r = fn(p)
+            r.总体风险评分, r.风险等级, r.预计替代年份
+        elapsed = time.perf_counter() - t0
+
+        m = min(args.alloc_sample, args.n)
+        tracemalloc.start()
+        kept = [fn(p) for p in _cycle(profiles, m)]
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del kept
+        print(f"{name:<12} {elapsed:>10.2f} {elapsed / args.n * 1e6:>9.2f} {peak / m:>12.0f} {current / m:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ Jobless AI - AI替代风险评估模型
 核心算法：基于多维度加权的替代风险评分和时间预测
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import math
@@ -13,6 +13,7 @@ import math
 @dataclass
 class TaskAssessment:
     """单个任务评估"""
+    __slots__ = ("任务名称", "重复性", "规则明确度", "创造性要求", "人际交互", "物理操作", "工时占比")
     任务名称: str
     重复性: int  # 0-100, 越高越容易被替代
     规则明确度: int  # 0-100
@@ -25,21 +26,114 @@ class TaskAssessment:
 @dataclass
 class SkillRequirement:
     """技能要求"""
+    __slots__ = ("技能名称", "重要程度", "AI能力现状")
     技能名称: str
     重要程度: int  # 1-5
     AI能力现状: int  # 0-100, AI当前能达到的水平
 
 
-@dataclass
 class RiskAssessmentResult:
-    """风险评估结果"""
-    总体风险评分: float  # 0-100
-    风险等级: str  # 低/中/高/极高
-    预计替代年份: int
-    置信区间: tuple  # (最早, 最晚)
-    关键脆弱点: List[str]
-    建议行动: List[str]
-    详细分析: Dict = field(default_factory=dict)
+    """
+    风险评估结果
+
+    关键脆弱点、建议行动、详细分析在首次访问时才生成（之后缓存）：full_assessment 只保存
+    生成它们所需的中间结果 source = (模型, 任务评分, 技能分析, 职位名称)。
+    scores_only 模式不保存中间结果，这三项为空。
+    """
+    __slots__ = ("总体风险评分", "风险等级", "预计替代年份", "置信区间",
+                 "_关键脆弱点", "_建议行动", "_详细分析", "_source")
+    FIELDS = ("总体风险评分", "风险等级", "预计替代年份", "置信区间", "关键脆弱点", "建议行动", "详细分析")
+
+    def __init__(self, 总体风险评分: float, 风险等级: str, 预计替代年份: int, 置信区间: tuple,
+                 关键脆弱点: Optional[List[str]] = None, 建议行动: Optional[List[str]] = None,
+                 详细分析: Optional[Dict] = None, source: Optional[tuple] = None):
+        self.总体风险评分 = 总体风险评分  # 0-100
+        self.风险等级 = 风险等级  # 低/中/高/极高
+        self.预计替代年份 = 预计替代年份
+        self.置信区间 = 置信区间  # (最早, 最晚)
+        self._关键脆弱点 = 关键脆弱点
+        self._建议行动 = 建议行动
+        self._详细分析 = 详细分析
+        self._source = source
+
+    @property
+    def 关键脆弱点(self) -> List[str]:
+        if self._关键脆弱点 is None:
+            self._关键脆弱点 = [] if self._source is None else self._source[0].identify_vulnerabilities(*self._source[1:3])
+        return self._关键脆弱点
+
+    @property
+    def 建议行动(self) -> List[str]:
+        if self._建议行动 is None:
+            self._建议行动 = [] if self._source is None else self._source[0].generate_improvement_suggestions(
+                self._source[2], self._source[1])
+        return self._建议行动
+
+    @property
+    def 详细分析(self) -> Dict:
+        if self._详细分析 is None:
+            if self._source is None:
+                self._详细分析 = {}
+            else:
+                _, task_scores, skill_vulnerabilities, job_title = self._source
+                self._详细分析 = {"任务评分": task_scores, "技能分析": skill_vulnerabilities, "职位名称": job_title}
+        return self._详细分析
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RiskAssessmentResult):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.FIELDS)
+
+    def __repr__(self) -> str:
+        return "RiskAssessmentResult(" + ", ".join(f"{f}={getattr(self, f)!r}" for f in self.FIELDS) + ")"
+
+
+DEFAULT_BENCHMARK = {"当前": 50, "年增长率": 10, "上限": 90}
+
+
+class CapabilityTrajectory:
+    """
+    AI能力随年份的演化：每项技能一条以"上限"为渐近线的逻辑斯蒂曲线
+
+    曲线在基准年经过"当前"值、斜率等于"年增长率"。构造时把 years 内每一年的基准一次算好，
+    之后按年份 O(1) 查表；基准年的"当前"与"瞬时增长率"即原始的"当前"与"年增长率"。
+
+    每年的基准中"当前"取曲线值，"瞬时增长率"为曲线斜率；"年增长率"保持基准值，
+    因为时间线的放缓系数已经刻画了增长放缓，再用衰减后的斜率会重复计入
+    """
+
+    def __init__(self, benchmarks: Dict[str, Dict], base_year: int, years: range):
+        if base_year not in years:
+            raise ValueError(f"基准年 {base_year} 不在年份范围 {years} 内")
+        self.base_year = base_year
+        self.years = years
+        self._table: Dict[int, tuple] = {}
+        for year in years:
+            dt = year - base_year
+            self._table[year] = (
+                {name: self.at(b, dt) for name, b in benchmarks.items()},
+                self.at(DEFAULT_BENCHMARK, dt),
+            )
+
+    @staticmethod
+    def logistic(current: float, growth: float, ceiling: float, dt: float) -> tuple:
+        """基准年之后 dt 年的 (能力, 曲线斜率)；已达上限或不增长时保持不变"""
+        if dt == 0 or not (0 < current < ceiling) or growth <= 0:
+            return current, growth
+        k = growth / (current * (1 - current / ceiling))
+        level = ceiling / (1 + (ceiling - current) / current * math.exp(-k * dt))
+        return level, k * level * (1 - level / ceiling)
+
+    @classmethod
+    def at(cls, benchmark: Dict, dt: float) -> Dict:
+        level, growth = cls.logistic(benchmark["当前"], benchmark["年增长率"], benchmark["上限"], dt)
+        return {"当前": level, "年增长率": benchmark["年增长率"], "上限": benchmark["上限"], "瞬时增长率": growth}
+
+    def benchmarks(self, year: int) -> tuple:
+        """(该年的技能基准, 未知技能的缺省基准)"""
+        if year not in self._table:
+            raise ValueError(f"年份 {year} 超出能力曲线范围 {self.years.start}-{self.years.stop - 1}")
+        return self._table[year]
 
 
 class AIAutomationRiskModel:
@@ -59,8 +153,18 @@ class AIAutomationRiskModel:
         "销售": {"当前": 45, "年增长率": 15, "上限": 75},
     }
 
-    def __init__(self, current_year: int = 2025):
+    def __init__(self, current_year: int = 2025, horizon: int = 15):
         self.current_year = current_year
+        # 能力曲线：current_year 至 current_year + horizon 每年的基准，评估任一年份无需重建模型
+        self.trajectory = CapabilityTrajectory(
+            self.AI_CAPABILITY_BENCHMARKS, current_year, range(current_year, current_year + horizon + 1)
+        )
+
+    def benchmarks_for(self, year: Optional[int] = None) -> tuple:
+        """评估年份的 (技能基准, 缺省基准)；year 为 None 时即 current_year"""
+        if year is None or year == self.current_year:
+            return self.AI_CAPABILITY_BENCHMARKS, DEFAULT_BENCHMARK
+        return self.trajectory.benchmarks(year)
 
     def assess_task_automatability(self, task: TaskAssessment) -> float:
         """
@@ -83,13 +187,15 @@ class AIAutomationRiskModel:
 
         return automation_friendly + automation_resistant
 
-    def calculate_skill_vulnerability(self, skills: List[SkillRequirement]) -> Dict[str, float]:
+    def calculate_skill_vulnerability(self, skills: List[SkillRequirement],
+                                      year: Optional[int] = None) -> Dict[str, float]:
         """
-        计算技能的脆弱性评分
+        计算技能的脆弱性评分（year 指定评估年份，默认 current_year）
         """
+        benchmarks, default = self.benchmarks_for(year)
         vulnerabilities = {}
         for skill in skills:
-            benchmark = self.AI_CAPABILITY_BENCHMARKS.get(skill.技能名称, {"当前": 50, "年增长率": 10, "上限": 90})
+            benchmark = benchmarks.get(skill.技能名称, default)
             current_ai = benchmark["当前"]
             growth_rate = benchmark["年增长率"]
             ceiling = benchmark["上限"]
@@ -105,14 +211,15 @@ class AIAutomationRiskModel:
         return vulnerabilities
 
     def predict_automation_timeline(self, current_score: float, growth_rate: float,
-                                   threshold: float = 90) -> tuple:
+                                   threshold: float = 90, year: Optional[int] = None) -> tuple:
         """
-        预测自动化时间线
+        预测自动化时间线（从评估年份 year 起算，默认 current_year）
 
         返回: (预计年份, 最早年份, 最晚年份)
         """
+        base_year = self.current_year if year is None else year
         if current_score >= threshold:
-            return (self.current_year, self.current_year, self.current_year)
+            return (base_year, base_year, base_year)
 
         # 使用对数增长模型（AI能力提升会逐渐放缓）
         remaining = threshold - current_score
@@ -122,12 +229,25 @@ class AIAutomationRiskModel:
         slowdown_factor = 1 + math.log(threshold / (threshold - remaining + 1)) * 0.3
         estimated_years = base_years * slowdown_factor
 
-        predicted_year = self.current_year + math.ceil(estimated_years)
-        earliest = self.current_year + math.ceil(estimated_years * 0.7)
-        latest = self.current_year + math.ceil(estimated_years * 1.5)
+        predicted_year = base_year + math.ceil(estimated_years)
+        earliest = base_year + math.ceil(estimated_years * 0.7)
+        latest = base_year + math.ceil(estimated_years * 1.5)
 
         return (predicted_year, earliest, latest)
 
+    def identify_vulnerabilities(self, task_scores: Dict[str, float], skill_vulnerabilities: Dict) -> List[str]:
+        """
+        识别关键脆弱点（高自动化任务、高脆弱性技能）
+        """
+        vulnerabilities = []
+        for task_name, score in task_scores.items():
+            if score > 70:
+                vulnerabilities.append(f"{task_name} (自动化风险: {score:.0f}%)")
+        for skill_name, data in skill_vulnerabilities.items():
+            if data["评分"] > 0.6:
+                vulnerabilities.append(f"{skill_name} (AI能力: {data['AI当前水平']:.0f}%)")
+        return vulnerabilities
+
     def generate_improvement_suggestions(self, vulnerabilities: Dict,
                                        task_scores: Dict[str, float]) -> List[str]:
         """
@@ -164,9 +284,14 @@ class AIAutomationRiskModel:
     def full_assessment(self,
                        tasks: List[TaskAssessment],
                        skills: List[SkillRequirement],
-                       job_title: str = "") -> RiskAssessmentResult:
+                       job_title: str = "",
+                       year: Optional[int] = None,
+                       scores_only: bool = False) -> RiskAssessmentResult:
         """
         完整的AI替代风险评估
+
+        year: 评估年份（默认 current_year），按能力曲线取该年的AI能力和增长率
+        scores_only: 只计算评分、等级和时间线，不保留生成脆弱点/建议/详细分析所需的中间结果
         """
         # 1. 任务层面的自动化评分（加权平均）
         task_scores = {}
@@ -177,7 +302,7 @@ class AIAutomationRiskModel:
             total_risk += score * task.工时占比
 
         # 2. 技能层面的脆弱性分析
-        skill_vulnerabilities = self.calculate_skill_vulnerability(skills)
+        skill_vulnerabilities = self.calculate_skill_vulnerability(skills, year)
         avg_skill_risk = sum(v["评分"] for v in skill_vulnerabilities.values()) / len(skills) if skills else 0.5
 
         # 3. 综合评分（70%任务风险 + 30%技能风险）
@@ -194,39 +319,41 @@ class AIAutomationRiskModel:
             level = "低"
 
         # 5. 预测时间线（基于平均AI增长率）
+        benchmarks, default = self.benchmarks_for(year)
         avg_growth_rate = sum(
-            self.AI_CAPABILITY_BENCHMARKS.get(s.技能名称, {}).get("年增长率", 10)
+            benchmarks.get(s.技能名称, default)["年增长率"]
             for s in skills
         ) / len(skills) if skills else 12
 
-        predicted, earliest, latest = self.predict_automation_timeline(overall_score, avg_growth_rate)
-
-        # 6. 识别关键脆弱点
-        vulnerabilities = []
-        for task_name, score in task_scores.items():
-            if score > 70:
-                vulnerabilities.append(f"{task_name} (自动化风险: {score:.0f}%)")
-        for skill_name, data in skill_vulnerabilities.items():
-            if data["评分"] > 0.6:
-                vulnerabilities.append(f"{skill_name} (AI能力: {data['AI当前水平']}%)")
-
-        # 7. 生成建议
-        suggestions = self.generate_improvement_suggestions(skill_vulnerabilities, task_scores)
+        predicted, earliest, latest = self.predict_automation_timeline(overall_score, avg_growth_rate, year=year)
 
+        # 6-7. 关键脆弱点、建议行动和详细分析在首次访问时生成
         return RiskAssessmentResult(
             总体风险评分=round(overall_score, 1),
             风险等级=level,
             预计替代年份=predicted,
             置信区间=(earliest, latest),
-            关键脆弱点=vulnerabilities,
-            建议行动=suggestions,
-            详细分析={
-                "任务评分": task_scores,
-                "技能分析": skill_vulnerabilities,
-                "职位名称": job_title
-            }
+            source=None if scores_only else (self, task_scores, skill_vulnerabilities, job_title),
         )
 
+    def batch_assess(self, batch, year: Optional[int] = None):
+        """
+        批量评估（列式输入：ai_risk_batch.ProfileBatch 或 ai_risk_store.ProfileTable）
+
+        评分、风险等级和时间线与逐个调用 full_assessment 完全一致；需要 NumPy
+        """
+        from ai_risk_batch import batch_assess
+        return batch_assess(self, batch, year=year)
+
+    def simulate_timelines(self, batch, n_samples: int = 10000, seed: Optional[int] = 0, workers: int = 1, **kwargs):
+        """
+        蒙特卡洛替代时间线（见 ai_risk_montecarlo.simulate_timelines）
+
+        对各技能的年增长率和上限抽样，返回每个画像的预计年份分位数；需要 NumPy
+        """
+        from ai_risk_montecarlo import simulate_timelines
+        return simulate_timelines(self, batch, n_samples=n_samples, seed=seed, workers=workers, **kwargs)
+
 
 # 使用示例
 if __name__ == "__main__":
@@ -0,0 +1,222 @@
+"""
+Jobless AI - 替代时间线的蒙特卡洛模拟
+
+predict_automation_timeline 给出点估计，并用固定的 0.7x / 1.5x 作为“置信区间”。
+这里对 AI_CAPABILITY_BENCHMARKS 中每项技能抽样：
+
+- 年增长率：以基准值为中位数的对数正态分布（对数标准差 growth_sigma）；
+- 上限：在基准表（current_year）上以基准值为均值的正态分布（标准差 ceiling_sd），
+  截断到 [当前 + 1, 100]，记为相对基准余量的比例 ``(上限样本 - 当前) / (上限 - 当前)``。
+
+评估年份不是 current_year 时，能力曲线已逼近上限、余量可能只剩零点几分，
+因此上限样本按同一比例缩放该年的余量，而不在该年重新截断（否则截断会把余量放大上百倍）。
+
+每个样本中，画像的增长率 = 其技能增长率的平均（无技能时以 12 为基准），
+再乘以上限余量比例 ``mean(余量样本) / mean(基准余量)``（基准余量为 0 时取 1），
+然后代入与点估计相同的放缓模型。两项噪声都为 0 时，任一评估年份的各分位数都是点估计的预计年份。
+
+内存有界：按画像分块，每块最多 max_cells 个（画像 x 样本）单元。
+可复现：技能级样本在主进程用 seed 一次抽取，各块（含多进程 workers > 1）共用，
+因此结果与分块方式、进程数无关。
+多进程时画像按进程数切成连续分片，样本经进程池 initializer 每个进程只传一次，
+各分片只携带自己的评分与技能编码，分片内部再按 max_cells 分块。
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from ai_risk_batch import ProfileBatch, benchmark_columns, score_components
+from ai_risk_model import DEFAULT_BENCHMARK, AIAutomationRiskModel
+
+
+DEFAULT_PERCENTILES = (5.0, 25.0, 50.0, 75.0, 95.0)
+NO_SKILL_GROWTH = 12
+MAX_CELLS = 2_000_000
+THRESHOLD = 90
+
+
+@dataclass
+class TimelineDistribution:
+    """每个画像的替代年份分位数"""
+    分位点: Tuple[float, ...]
+    年份: np.ndarray  # (画像数, 分位点数) int64
+    样本数: int
+
+    def percentile(self, q: float) -> np.ndarray:
+        return self.年份[:, self.分位点.index(float(q))]
+
+
+@dataclass
+class CapabilitySamples:
+    """技能级样本：每行一项技能（最后一行为无技能画像的缺省项），每列一个样本"""
+    增长率: np.ndarray
+    上限余量: np.ndarray
+    基准余量: np.ndarray
+
+
+def sample_capabilities(
+    vocab: Sequence[str],
+    benchmarks: dict,
+    n_samples: int,
+    growth_sigma: float = 0.25,
+    ceiling_sd: float = 3.0,
+    seed: Optional[int] = 0,
+    default: dict = DEFAULT_BENCHMARK,
+    reference: Optional[tuple] = None,
+) -> CapabilitySamples:
+    """benchmarks / default 为评估年份的基准；reference 为 (基准表, 缺省基准)，决定上限噪声的尺度，默认同评估年份"""
+    current, growth, ceiling = benchmark_columns(vocab, benchmarks, default)
+    current = np.append(current, default["当前"])
+    growth = np.append(growth, NO_SKILL_GROWTH)
+    ceiling = np.append(ceiling, default["上限"])
+    ref_table, ref_default = reference if reference is not None else (benchmarks, default)
+    ref_current, _, ref_ceiling = benchmark_columns(vocab, ref_table, ref_default)
+    ref_current = np.append(ref_current, ref_default["当前"])
+    ref_ceiling = np.append(ref_ceiling, ref_default["上限"])
+
+    rng = np.random.default_rng(seed)
+    z = rng.standard_normal((2, len(current), n_samples))
+    sampled_growth = growth[:, None] * np.exp(growth_sigma * z[0])
+    sampled_ceiling = np.clip(ref_ceiling[:, None] + ceiling_sd * z[1], ref_current[:, None] + 1, 100)
+    ref_headroom = (ref_ceiling - ref_current)[:, None]
+    ratio = np.divide(
+        sampled_ceiling - ref_current[:, None], ref_headroom, out=np.ones_like(sampled_ceiling), where=ref_headroom > 0
+    )
+    headroom = np.maximum(ceiling - current, 0.0)
+    return CapabilitySamples(
+        增长率=sampled_growth,
+        上限余量=headroom[:, None] * ratio,
+        基准余量=headroom,
+    )
+
+
+def _mean_weights(skill_offsets: np.ndarray, codes: np.ndarray, n_codes: int) -> np.ndarray:
+    """(画像数 x (技能数 + 1)) 平均权重；无技能画像全部权重在缺省列"""
+    n_skills = np.diff(skill_offsets)
+    w = np.zeros((len(n_skills), n_codes + 1))
+    rows = np.repeat(np.arange(len(n_skills)), n_skills)
+    np.add.at(w, (rows, codes), 1.0 / n_skills[rows])
+    w[n_skills == 0, n_codes] = 1.0
+    return w
+
+
+def inverted_cdf_ranks(percentiles: Sequence[float], n: int) -> np.ndarray:
+    """各分位点在排序样本中的下标（同 np.percentile(method="inverted_cdf")）"""
+    ranks = np.ceil(np.asarray(percentiles, dtype=np.float64) / 100.0 * n).astype(np.int64) - 1
+    return np.clip(ranks, 0, n - 1)
+
+
+def _chunk_years(
+    current_year: int,
+    scores: np.ndarray,
+    skill_offsets: np.ndarray,
+    codes: np.ndarray,
+    samples: CapabilitySamples,
+    percentiles: Sequence[float],
+    max_years: int,
+) -> np.ndarray:
+    w = _mean_weights(skill_offsets - skill_offsets[0], codes, len(samples.基准余量) - 1)
+    base = (w @ samples.基准余量)[:, None]
+    headroom = np.divide(w @ samples.上限余量, base, out=np.ones((len(w), samples.上限余量.shape[1])), where=base > 0)
+    growth = (w @ samples.增长率) * headroom
+
+    remaining = THRESHOLD - scores
+    slowdown = 1 + np.log(THRESHOLD / (THRESHOLD - remaining + 1)) * 0.3
+    estimated = np.clip((remaining * slowdown)[:, None] / growth, 0, max_years)
+    # 年数为整数：逐行计数后按累计频数取分位，等价于对 ceil(年数) 排序取值。
+    n_rows, n_samples = estimated.shape
+    key = np.ceil(estimated).astype(np.int64) + (np.arange(n_rows) * (max_years + 1))[:, None]
+    cum = np.bincount(key.ravel(), minlength=n_rows * (max_years + 1)).reshape(n_rows, max_years + 1).cumsum(axis=1)
+    ranks = inverted_cdf_ranks(percentiles, n_samples)
+    years = current_year + np.stack([(cum <= r).sum(axis=1) for r in ranks], axis=1).astype(np.int64)
+    years[scores >= THRESHOLD] = current_year
+    return years
+
+
+def _rows_years(
+    current_year: int,
+    scores: np.ndarray,
+    skill_offsets: np.ndarray,
+    codes: np.ndarray,
+    samples: CapabilitySamples,
+    percentiles: Sequence[float],
+    max_years: int,
+    step: int,
+) -> np.ndarray:
+    """连续画像区间按 step 个画像分块计算（skill_offsets 为绝对偏移，codes 从 skill_offsets[0] 起）"""
+    s_off = skill_offsets - skill_offsets[0]
+    n = len(scores)
+    parts = []
+    for a in range(0, n, step):
+        b = min(a + step, n)
+        parts.append(
+            _chunk_years(current_year, scores[a:b], s_off[a : b + 1], codes[s_off[a] : s_off[b]], samples, percentiles, max_years)
+        )
+    return np.concatenate(parts) if parts else np.zeros((0, len(percentiles)), dtype=np.int64)
+
+
+# 进程池中每个进程各自持有一份样本（由 initializer 设置）。
+_WORKER_SAMPLES: Optional[CapabilitySamples] = None
+
+
+def _init_worker(samples: CapabilitySamples) -> None:
+    global _WORKER_SAMPLES
+    _WORKER_SAMPLES = samples
+
+
+def _run_shard(args: tuple) -> np.ndarray:
+    current_year, scores, skill_offsets, codes, percentiles, max_years, step = args
+    return _rows_years(current_year, scores, skill_offsets, codes, _WORKER_SAMPLES, percentiles, max_years, step)
+
+
+def simulate_timelines(
+    model: AIAutomationRiskModel,
+    batch: ProfileBatch,
+    n_samples: int = 10_000,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    growth_sigma: float = 0.25,
+    ceiling_sd: float = 3.0,
+    seed: Optional[int] = 0,
+    workers: int = 1,
+    max_cells: int = MAX_CELLS,
+    max_years: int = 100,
+    year: Optional[int] = None,
+) -> TimelineDistribution:
+    """整批画像的替代年份分布（从评估年份 year 起算；超过 max_years 年时按该值截断）"""
+    if n_samples < 1:
+        raise ValueError("n_samples 必须 >= 1")
+    c = score_components(model, batch, year)
+    benchmarks, default = model.benchmarks_for(year)
+    samples = sample_capabilities(
+        c.技能词表,
+        benchmarks,
+        n_samples,
+        growth_sigma=growth_sigma,
+        ceiling_sd=ceiling_sd,
+        seed=seed,
+        default=default,
+        reference=model.benchmarks_for(None),
+    )
+    base_year = model.current_year if year is None else year
+    percentiles = tuple(float(p) for p in percentiles)
+    s_off = np.asarray(batch.skill_offsets, dtype=np.int64)
+    n = len(batch)
+    step = max(1, max_cells // max(n_samples, 1))
+    scores, codes = c.总体风险评分, c.技能编码
+    if workers > 1 and n > step:
+        bounds = np.unique(np.linspace(0, n, min(workers, n) + 1).astype(np.int64))
+        shards = [
+            (base_year, scores[a:b], s_off[a : b + 1], codes[s_off[a] : s_off[b]], percentiles, max_years, step)
+            for a, b in zip(bounds[:-1], bounds[1:])
+        ]
+        with ProcessPoolExecutor(max_workers=len(shards), initializer=_init_worker, initargs=(samples,)) as pool:
+            parts = list(pool.map(_run_shard, shards))
+    else:
+        parts = [_rows_years(base_year, scores, s_off, codes, samples, percentiles, max_years, step)]
+    years = np.concatenate(parts) if parts else np.zeros((0, len(percentiles)), dtype=np.int64)
+    return TimelineDistribution(分位点=percentiles, 年份=years, 样本数=int(n_samples))
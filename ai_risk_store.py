@@ -0,0 +1,169 @@
+"""
+Jobless AI - 紧凑列式画像存储
+
+大规模人群画像若逐个保存为 TaskAssessment / SkillRequirement 对象，每个任务要占数百字节。
+ProfileTable 按列存放：
+
+- 任务因素（重复性等 0-100）为 int8，工时占比为 float32；
+- 任务名称、技能名称做字典编码（int32 编码 + 词表），重要程度为 int8；
+- task_offsets / skill_offsets（int64）标出每个画像的区间。
+
+``save`` 写出单个二进制文件（头部 JSON + 64 字节对齐的列），``load`` 通过内存映射读取，
+不把整张表读入内存。ProfileTable 与 ProfileBatch 接口相同，可直接交给
+``AIAutomationRiskModel.batch_assess``；结果与对同一（float32 精度的）输入逐个调用
+full_assessment 一致。
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from ai_risk_batch import TASK_FACTORS, ProfileBatch
+from ai_risk_model import SkillRequirement, TaskAssessment
+
+
+MAGIC = b"JLPROF01"
+FORMAT_VERSION = 1
+ALIGN = 64
+
+COLUMN_DTYPES: Dict[str, str] = {
+    "task_offsets": "<i8",
+    "任务编码": "<i4",
+    **{name: "i1" for name in TASK_FACTORS},
+    "工时占比": "<f4",
+    "skill_offsets": "<i8",
+    "技能编码": "<i4",
+    "重要程度": "i1",
+}
+
+
+def _encode(values: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+    vocab, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    return codes.astype(np.int32), [str(v) for v in vocab]
+
+
+def _int8(name: str, values: np.ndarray, low: int, high: int) -> np.ndarray:
+    values = np.asarray(values)
+    if len(values) and (values.min() < low or values.max() > high):
+        raise ValueError(f"{name} 超出范围 [{low}, {high}]")
+    return values.astype(np.int8)
+
+
+@dataclass
+class ProfileTable:
+    """数组化画像表（列式、可内存映射）"""
+    task_offsets: np.ndarray
+    任务编码: np.ndarray
+    重复性: np.ndarray
+    规则明确度: np.ndarray
+    创造性要求: np.ndarray
+    人际交互: np.ndarray
+    物理操作: np.ndarray
+    工时占比: np.ndarray
+    skill_offsets: np.ndarray
+    技能编码: np.ndarray
+    重要程度: np.ndarray
+    任务词表: List[str]
+    技能词表: List[str]
+
+    def __len__(self) -> int:
+        return len(self.task_offsets) - 1
+
+    def skill_codes(self) -> Tuple[np.ndarray, List[str]]:
+        return np.asarray(self.技能编码, dtype=np.int64), self.技能词表
+
+    @property
+    def nbytes(self) -> int:
+        return sum(np.asarray(getattr(self, name)).nbytes for name in COLUMN_DTYPES)
+
+    @classmethod
+    def from_batch(cls, batch: ProfileBatch, task_names: Sequence[str] = ()) -> "ProfileTable":
+        n_tasks = len(batch.工时占比)
+        task_codes, task_vocab = _encode(task_names if len(task_names) else [""] * n_tasks)
+        skill_codes, skill_vocab = _encode(batch.技能名称)
+        return cls(
+            task_offsets=np.asarray(batch.task_offsets, dtype=np.int64),
+            任务编码=task_codes,
+            **{name: _int8(name, getattr(batch, name), 0, 100) for name in TASK_FACTORS},
+            工时占比=np.asarray(batch.工时占比, dtype=np.float32),
+            skill_offsets=np.asarray(batch.skill_offsets, dtype=np.int64),
+            技能编码=skill_codes,
+            重要程度=_int8("重要程度", batch.重要程度, 1, 5),
+            任务词表=task_vocab,
+            技能词表=skill_vocab,
+        )
+
+    @classmethod
+    def from_profiles(cls, profiles: Sequence[Tuple[Sequence[TaskAssessment], Sequence[SkillRequirement]]]) -> "ProfileTable":
+        names = [t.任务名称 for ts, _ in profiles for t in ts]
+        return cls.from_batch(ProfileBatch.from_profiles(profiles), names)
+
+    def profile(self, i: int) -> Tuple[List[TaskAssessment], List[SkillRequirement]]:
+        """第 i 个画像还原为单条记录（用于 full_assessment）"""
+        t0, t1 = int(self.task_offsets[i]), int(self.task_offsets[i + 1])
+        s0, s1 = int(self.skill_offsets[i]), int(self.skill_offsets[i + 1])
+        tasks = [
+            TaskAssessment(
+                self.任务词表[int(self.任务编码[k])],
+                *(int(getattr(self, name)[k]) for name in TASK_FACTORS),
+                工时占比=float(self.工时占比[k]),
+            )
+            for k in range(t0, t1)
+        ]
+        skills = [
+            SkillRequirement(self.技能词表[int(self.技能编码[k])], 重要程度=int(self.重要程度[k]), AI能力现状=0)
+            for k in range(s0, s1)
+        ]
+        return tasks, skills
+
+    def save(self, path: Path) -> None:
+        """单文件二进制格式：MAGIC | 头部长度(u64) | 头部 JSON | 对齐后的各列"""
+        columns = {}
+        offset = 0
+        for name, dtype in COLUMN_DTYPES.items():
+            arr = np.ascontiguousarray(getattr(self, name), dtype=dtype)
+            columns[name] = {"dtype": dtype, "offset": offset, "length": int(len(arr))}
+            offset += -(-arr.nbytes // ALIGN) * ALIGN
+        header = {
+            "version": FORMAT_VERSION,
+            "columns": columns,
+            "任务词表": self.任务词表,
+            "技能词表": self.技能词表,
+        }
+        head = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        data_start = -(-(len(MAGIC) + 8 + len(head)) // ALIGN) * ALIGN
+        with open(path, "wb") as f:
+            f.write(MAGIC + struct.pack("<Q", len(head)) + head)
+            for name, dtype in COLUMN_DTYPES.items():
+                f.seek(data_start + columns[name]["offset"])
+                f.write(np.ascontiguousarray(getattr(self, name), dtype=dtype).tobytes())
+            f.truncate(data_start + offset)
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> "ProfileTable":
+        """读取 save 写出的文件；mmap=True 时各列为只读内存映射"""
+        with open(path, "rb") as f:
+            magic = f.read(len(MAGIC))
+            if magic != MAGIC:
+                raise ValueError(f"{path} 不是画像表文件")
+            (head_len,) = struct.unpack("<Q", f.read(8))
+            header = json.loads(f.read(head_len).decode("utf-8"))
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path} 版本不支持: {header.get('version')}")
+        data_start = -(-(len(MAGIC) + 8 + head_len) // ALIGN) * ALIGN
+        arrays = {}
+        for name, spec in header["columns"].items():
+            dtype, length = np.dtype(spec["dtype"]), spec["length"]
+            if length == 0:
+                arrays[name] = np.empty(0, dtype=dtype)
+            elif mmap:
+                arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=data_start + spec["offset"], shape=(length,))
+            else:
+                arrays[name] = np.fromfile(path, dtype=dtype, count=length, offset=data_start + spec["offset"])
+        return cls(**arrays, 任务词表=header["任务词表"], 技能词表=header["技能词表"])
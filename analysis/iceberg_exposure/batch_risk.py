@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Batched multi-model replacement-risk evaluation.
+
+The rigorous and task-aligned scripts used to loop over every GDPval model,
+rebuilding the anchor vector from dicts, copying the occupation frame and
+re-merging the 2024 industry detail each time. Here all models are evaluated
+together:
+
+- anchor win rates are stacked into an (n_anchor x n_models) matrix ``P``,
+- ``P_all = alpha * (W @ P) + (1 - alpha) * global`` is one sparse product,
+- the cached occupation x NAICS employment matrix (``employment_matrix``) is
+  collapsed once to (n_occ x n_sector), so sector and national aggregates for
+  every model are ``E.T @ (exposure * P_all)`` and a single weighted column sum.
+
+Cost is dominated by the one-off join; each extra model adds one column.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+import employment_matrix
+
+
+@dataclass
+class EmploymentJoin:
+    """Industry employment pre-joined to an occupation universe."""
+
+    soc_codes: List[str]
+    occ_emp: np.ndarray  # (n_occ,) employment of each occupation across industries
+    total_emp: float  # all occupations, matched or not
+    sector_matrix: sp.csr_matrix  # (n_occ, n_sector) matched employment
+    sector_total: np.ndarray  # (n_sector,) all occupations, matched or not
+    sectors: pd.DataFrame  # one row per sector column, groupby key order
+
+
+def join_employment(E: employment_matrix.EmploymentMatrix, soc_codes: Sequence[str], column_groups: pd.DataFrame) -> EmploymentJoin:
+    """Collapse E (occ x industry) onto an occupation universe and industry groups.
+
+    ``column_groups`` has one row per E column (e.g. sector_code / sector_title).
+    Occupations outside ``soc_codes`` only count towards totals, as the left
+    merge + ``fillna(0)`` exposure did.
+    """
+    soc_codes = [str(s) for s in soc_codes]
+    group_idx, groups = pd.MultiIndex.from_frame(column_groups.reset_index(drop=True)).factorize(sort=True)
+    groups = groups.to_frame(index=False)
+    groups.columns = list(column_groups.columns)
+    n_col, n_group = E.matrix.shape[1], len(groups)
+    S = sp.csr_matrix((np.ones(n_col), (np.arange(n_col), group_idx)), shape=(n_col, n_group))
+    by_group = (E.matrix @ S).tocsr()  # (n_E_occ, n_group)
+
+    occ_idx = pd.Index(soc_codes).get_indexer(E.soc_codes)
+    src = np.flatnonzero(occ_idx >= 0)
+    R = sp.csr_matrix((np.ones(len(src)), (occ_idx[src], src)), shape=(len(soc_codes), E.matrix.shape[0]))
+    return EmploymentJoin(
+        soc_codes=soc_codes,
+        occ_emp=R @ np.asarray(E.matrix.sum(axis=1)).ravel(),
+        total_emp=float(E.matrix.sum()),
+        sector_matrix=(R @ by_group).tocsr(),
+        sector_total=np.asarray(by_group.sum(axis=0)).ravel(),
+        sectors=groups,
+    )
+
+
+def anchor_win_matrix(
+    anchor_soc: Sequence[str], win: pd.DataFrame, models: Sequence[str], global_p: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """(n_anchor x n_models) win rates plus a mask of which entries are direct.
+
+    ``win`` has one row per (model, soc_code) with ``win_rate``; missing
+    anchors fall back to the model's global win rate.
+    """
+    P = np.tile(np.asarray(global_p, dtype=np.float64), (len(anchor_soc), 1))
+    direct = np.zeros(P.shape, dtype=bool)
+    rows = pd.Index([str(s) for s in anchor_soc]).get_indexer(win["soc_code"].astype(str))
+    cols = pd.Index(list(models)).get_indexer(win["model"])
+    ok = (rows >= 0) & (cols >= 0)
+    P[rows[ok], cols[ok]] = win["win_rate"].to_numpy(dtype=np.float64)[ok]
+    direct[rows[ok], cols[ok]] = True
+    return P, direct
+
+
+def transfer_probabilities(
+    W: sp.csr_matrix,
+    alpha: np.ndarray,
+    P_anchor: np.ndarray,
+    direct: np.ndarray,
+    global_p: np.ndarray,
+    anchor_rows: np.ndarray,
+) -> np.ndarray:
+    """(n_all x n_models) win probabilities; direct anchors keep their own rate.
+
+    ``anchor_rows[j]`` is anchor j's row in the full occupation list (-1 if absent).
+    """
+    a = alpha[:, None]
+    P_all = a * (W @ P_anchor) + (1.0 - a) * np.asarray(global_p, dtype=np.float64)[None, :]
+    j, m = np.nonzero(direct & (anchor_rows >= 0)[:, None])
+    P_all[anchor_rows[j], m] = P_anchor[j, m]
+    return np.clip(P_all, 0.0, 1.0)
+
+
+def national_risk(join: EmploymentJoin, exposure: np.ndarray, P_occ: np.ndarray, models: Sequence[str], global_p: np.ndarray) -> pd.DataFrame:
+    """Employment-weighted national exposure and replacement risk for every model."""
+    e = np.nan_to_num(np.asarray(exposure, dtype=np.float64))
+    exposure_emp = float(join.occ_emp @ e)
+    expected = (join.occ_emp * e) @ P_occ
+    total = max(join.total_emp, 1e-9)
+    return pd.DataFrame(
+        {
+            "model": list(models),
+            "model_global_win_rate": np.asarray(global_p, dtype=np.float64),
+            "national_total_employment": join.total_emp,
+            "national_exposure_emp_weighted": exposure_emp / total,
+            "national_replacement_risk_emp_weighted": expected / total,
+        }
+    )
+
+
+def sector_risk(join: EmploymentJoin, exposure: np.ndarray, p_occ: np.ndarray) -> pd.DataFrame:
+    """Sector table for one model's occupation win probabilities."""
+    e = np.nan_to_num(np.asarray(exposure, dtype=np.float64))
+    sec = join.sectors.copy()
+    sec["total_emp"] = join.sector_total
+    sec["expected_affected_emp"] = join.sector_matrix.T @ (e * p_occ)
+    sec["exposure_emp"] = join.sector_matrix.T @ e
+    sec["industry_emp_share"] = sec["total_emp"] / sec["total_emp"].sum()
+    sec["industry_exposure"] = sec["exposure_emp"] / sec["total_emp"]
+    sec["replacement_risk_probability"] = sec["expected_affected_emp"] / sec["total_emp"]
+    sec["weighted_risk_contribution"] = sec["industry_emp_share"] * sec["replacement_risk_probability"]
+    sec["effective_ai_win_probability"] = np.where(sec["exposure_emp"] > 0, sec["expected_affected_emp"] / sec["exposure_emp"], 0.0)
+    return sec.sort_values("weighted_risk_contribution", ascending=False).reset_index(drop=True)
+
+
+def long_by_model(occ: pd.DataFrame, models: Sequence[str], global_p: np.ndarray) -> pd.DataFrame:
+    """``occ`` repeated once per model (model-major), with model / global rate columns."""
+    n, m = len(occ), len(models)
+    out = occ.iloc[np.tile(np.arange(n), m)].reset_index(drop=True)
+    out["model"] = np.repeat(np.asarray(list(models), dtype=object), n)
+    out["model_global_win_rate"] = np.repeat(np.asarray(global_p, dtype=np.float64), n)
+    return out
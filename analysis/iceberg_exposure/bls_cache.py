@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Parquet cache for BLS OEWS Excel workbooks.
+
+Parsing the multi-hundred-MB ``nat4d_M*`` / ``national_M*`` workbooks dominates
+every run. Each workbook is converted once into a typed Parquet file:
+
+- ``tot_emp`` numeric (BLS suppression markers such as ``**`` become NaN),
+- ``o_group`` / ``naics`` / ``occ_code`` dictionary-encoded (categorical),
+- every other column kept as text, exactly as ``read_excel(dtype=str)`` returns it.
+
+Entries are invalidated when the resolved source path differs, or when the
+source size/mtime changes and its sha256 no longer matches (``source_unchanged``,
+shared with the employment matrix cache). Reads can select columns, and
+categorical columns are returned as plain text columns so downstream groupbys
+behave as before.
+
+CLI (pre-convert every workbook under data/raw/bls):
+    python bls_cache.py [--force]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+
+ROOT = Path(__file__).resolve().parent
+BLS_DIR = ROOT / "data" / "raw" / "bls"
+CACHE_DIR = ROOT / "data" / "interim" / "bls_parquet"
+
+SCHEMA_VERSION = 1
+NUMERIC_COLS = ["tot_emp"]
+CATEGORICAL_COLS = ["o_group", "naics", "occ_code"]
+
+_warned_no_parquet = False
+
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    out = df.copy()
+    out.columns = [str(c).strip().lower() for c in out.columns]
+    return out
+
+
+def to_float(series: pd.Series) -> pd.Series:
+    return pd.to_numeric(series.astype(str).str.replace(",", "", regex=False), errors="coerce")
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _cache_paths(path: Path, cache_dir: Path) -> Tuple[Path, Path]:
+    # Parent folder keeps nat4d/national files of different releases apart.
+    stem = f"{path.parent.name}__{path.stem}"
+    return cache_dir / f"{stem}.parquet", cache_dir / f"{stem}.meta.json"
+
+
+def _source_stat(path: Path) -> Dict:
+    st = path.stat()
+    return {"size": int(st.st_size), "mtime_ns": int(st.st_mtime_ns)}
+
+
+def source_meta(path: Path) -> Dict:
+    """Identity of a source file as recorded in cache metadata (resolved path, sha256, size, mtime)."""
+    return {"source": str(path.resolve()), "sha256": file_sha256(path), **_source_stat(path)}
+
+
+def source_unchanged(path: Path, meta: Dict, meta_path: Path) -> bool:
+    """Whether ``meta`` (stored at ``meta_path``) was recorded from ``path`` with the same content.
+
+    Matching size/mtime is enough; otherwise the sha256 decides, and on a match
+    the new size/mtime are written back so the next check is cheap again.
+    """
+    if meta.get("source") != str(path.resolve()):
+        return False
+    stat = _source_stat(path)
+    if meta.get("size") == stat["size"] and meta.get("mtime_ns") == stat["mtime_ns"]:
+        return True
+    # Touched but possibly identical (re-download, copy): fall back to content hash.
+    if meta.get("sha256") != file_sha256(path):
+        return False
+    meta.update(stat)
+    meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return True
+
+
+def _is_valid(path: Path, parquet_path: Path, meta_path: Path) -> bool:
+    if not parquet_path.exists() or not meta_path.exists():
+        return False
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    return meta.get("schema_version") == SCHEMA_VERSION and source_unchanged(path, meta, meta_path)
+
+
+def _read_excel(path: Path) -> pd.DataFrame:
+    df = normalize_columns(pd.read_excel(path, dtype=str))
+    for c in NUMERIC_COLS:
+        if c in df.columns:
+            df[c] = to_float(df[c])
+    return df
+
+
+def convert_workbook(path: Path, cache_dir: Path = CACHE_DIR) -> pd.DataFrame:
+    """Parse the workbook once and write the typed Parquet copy plus its metadata."""
+    t0 = time.perf_counter()
+    typed = _read_excel(path)
+    for c in CATEGORICAL_COLS:
+        if c in typed.columns:
+            typed[c] = typed[c].astype("category")
+
+    parquet_path, meta_path = _cache_paths(path, cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp = parquet_path.with_suffix(".parquet.tmp")
+    typed.to_parquet(tmp, index=False)
+    tmp.replace(parquet_path)
+    meta = {
+        "schema_version": SCHEMA_VERSION,
+        "rows": int(len(typed)),
+        "columns": list(typed.columns),
+        "converted_at": time.time(),
+        "convert_sec": round(time.perf_counter() - t0, 2),
+        **source_meta(path),
+    }
+    meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    print(f"[bls_cache] converted {path.name}: {len(typed)} rows in {meta['convert_sec']}s")
+    return typed
+
+
+def _restore_plain(df: pd.DataFrame) -> pd.DataFrame:
+    for c in df.columns:
+        if isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].astype(df[c].cat.categories.dtype)
+    return df
+
+
+def read_bls_table(
+    path: Path,
+    columns: Optional[Sequence[str]] = None,
+    cache_dir: Path = CACHE_DIR,
+    use_cache: bool = True,
+) -> pd.DataFrame:
+    """Normalized OEWS table for ``path``, served from the Parquet cache when valid.
+
+    ``columns`` selects a subset; names missing from the workbook are ignored.
+    ``tot_emp`` is numeric; all other columns are text.
+    """
+    global _warned_no_parquet
+    parquet_path, meta_path = _cache_paths(path, cache_dir)
+    if not use_cache:
+        df = _read_excel(path)
+    else:
+        try:
+            if _is_valid(path, parquet_path, meta_path):
+                cols: Optional[List[str]] = None
+                if columns is not None:
+                    available = json.loads(meta_path.read_text(encoding="utf-8"))["columns"]
+                    cols = [c for c in available if c in set(columns)]
+                return _restore_plain(pd.read_parquet(parquet_path, columns=cols))
+            df = convert_workbook(path, cache_dir)
+        except ImportError:
+            # No Parquet engine installed: keep working from Excel directly.
+            if not _warned_no_parquet:
+                print("[bls_cache] pyarrow/fastparquet not installed; reading Excel without cache")
+                _warned_no_parquet = True
+            df = _read_excel(path)
+    df = _restore_plain(df)
+    if columns is not None:
+        df = df[[c for c in df.columns if c in set(columns)]]
+    return df
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert BLS OEWS workbooks into the Parquet cache.")
+    parser.add_argument("--bls-dir", type=Path, default=BLS_DIR)
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR)
+    parser.add_argument("--force", action="store_true", help="Reconvert even if the cache is valid.")
+    args = parser.parse_args()
+
+    paths = sorted(args.bls_dir.rglob("nat4d_M*_dl.xlsx")) + sorted(args.bls_dir.rglob("national_M*_dl.xlsx"))
+    if not paths:
+        print(f"No OEWS workbooks found under {args.bls_dir}")
+        return
+    for p in paths:
+        parquet_path, meta_path = _cache_paths(p, args.cache_dir)
+        if not args.force and _is_valid(p, parquet_path, meta_path):
+            print(f"[bls_cache] up to date: {p.name}")
+            continue
+        convert_workbook(p, args.cache_dir)
+
+
+if __name__ == "__main__":
+    main()
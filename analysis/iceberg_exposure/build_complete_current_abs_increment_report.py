@@ -3,20 +3,36 @@
 
 from __future__ import annotations
 
+import argparse
 import json
 from pathlib import Path
-from typing import Dict, List
+from typing import List
 
 import numpy as np
 import pandas as pd
 
+import growth_engine
+
 
 ROOT = Path(__file__).resolve().parent
 OUT_DIR = ROOT / "output"
 REPORT_PATH = ROOT / "complete_risk_report_current_abs_increment.md"
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Complete risk report with absolute monthly increments.")
+    parser.add_argument(
+        "--levels",
+        nargs="+",
+        choices=sorted(growth_engine.ENTITY_LEVELS),
+        default=["sector"],
+        help="Entity levels for output/entity_monthly_growth.csv (sector is always used by the report).",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
+    args = parse_args()
     overall_path = OUT_DIR / "overall_ai_replacement_probability_by_model_task_aligned.csv"
     industry_path = OUT_DIR / "industry_ai_replacement_risk_top_model_task_aligned.csv"
     exposure_ts_path = OUT_DIR / "industry_exposure_by_year_sector.csv"
@@ -52,41 +68,33 @@ def main() -> None:
     prev_risk_pct = float(monthly["risk_frontier"].iloc[-2] * 100.0)
     now_risk_pct = float(monthly["risk_frontier"].iloc[-1] * 100.0)
 
-    # Industry-level absolute increment estimate.
-    rows: List[Dict] = []
-    for _, r in industry.iterrows():
-        code = str(r["sector_code"])
-        ts = exposure_ts[exposure_ts["sector_code"].astype(str) == code].sort_values("year")
-        if ts.empty:
-            continue
-
-        m = (ts["year"] - ts["year"].min()) * 12
-        log_e = np.log(ts["industry_exposure"].clip(lower=1e-9))
-        b, _ = np.polyfit(m, log_e, 1)
-        ge = float(np.exp(b) - 1.0)  # monthly exposure growth for sector
-        gr = float((1.0 + ge) * (1.0 + gw) - 1.0)  # monthly risk growth for sector
-
-        risk = float(r["replacement_risk_probability"])
-        delta_now_pp = risk * gr * 100.0
-        start_risk = risk / ((1.0 + gr) ** max(span_months, 1))
-        avg_pp = (risk - start_risk) / max(span_months, 1) * 100.0
-
-        rows.append(
-            {
-                "sector_code": code,
-                "sector_title": str(r["sector_title"]),
-                "total_emp": float(r["total_emp"]),
-                "industry_exposure_pct": float(r["industry_exposure"] * 100.0),
-                "effective_ai_win_pct": float(r["effective_ai_win_probability"] * 100.0),
-                "current_risk_pct": risk * 100.0,
-                "current_month_abs_increment_pp_est": delta_now_pp,
-                "historical_avg_abs_increment_pp_est": avg_pp,
-                "risk_growth_monthly_pct_est": gr * 100.0,
-                "weighted_risk_contribution_pct_point": float(r["weighted_risk_contribution"] * 100.0),
-            }
-        )
-
-    industry_inc = pd.DataFrame(rows).sort_values("current_risk_pct", ascending=False).reset_index(drop=True)
+    # Industry-level absolute increment estimate: exposure growth for every sector in one grouped fit.
+    levels = ["sector"] + [lv for lv in args.levels if lv != "sector"]
+    growth = growth_engine.growth_table(gw, levels, frames={"sector": exposure_ts})
+    growth.to_csv(OUT_DIR / "entity_monthly_growth.csv", index=False)
+    sector_growth = growth[growth["entity_level"] == "sector"][["entity_code", "risk_growth_monthly"]]
+
+    ind = industry.assign(sector_code=industry["sector_code"].astype(str)).merge(
+        sector_growth, left_on="sector_code", right_on="entity_code", how="inner"
+    )
+    gr = ind["risk_growth_monthly"].to_numpy(dtype=float)  # monthly risk growth for sector
+    risk = ind["replacement_risk_probability"].to_numpy(dtype=float)
+    start_risk = risk / ((1.0 + gr) ** max(span_months, 1))
+    industry_inc = pd.DataFrame(
+        {
+            "sector_code": ind["sector_code"],
+            "sector_title": ind["sector_title"].astype(str),
+            "total_emp": ind["total_emp"].astype(float),
+            "industry_exposure_pct": ind["industry_exposure"] * 100.0,
+            "effective_ai_win_pct": ind["effective_ai_win_probability"] * 100.0,
+            "current_risk_pct": risk * 100.0,
+            "current_month_abs_increment_pp_est": risk * gr * 100.0,
+            "historical_avg_abs_increment_pp_est": (risk - start_risk) / max(span_months, 1) * 100.0,
+            "risk_growth_monthly_pct_est": gr * 100.0,
+            "weighted_risk_contribution_pct_point": ind["weighted_risk_contribution"] * 100.0,
+        }
+    )
+    industry_inc = industry_inc.sort_values("current_risk_pct", ascending=False).reset_index(drop=True)
     industry_inc.to_csv(OUT_DIR / "industry_absolute_increment_estimate.csv", index=False)
 
     lines: List[str] = []
@@ -180,6 +188,7 @@ def main() -> None:
     lines.append("## 输出文件")
     lines.append("")
     lines.append("- `output/industry_absolute_increment_estimate.csv`")
+    lines.append("- `output/entity_monthly_growth.csv`")
     lines.append("- `output/risk_frontier_monthly_series.csv`")
     lines.append("- `output/monthly_risk_growth_summary.json`")
     lines.append("- `output/industry_ai_replacement_risk_top_model_task_aligned.csv`")
@@ -10,20 +10,22 @@ comes from GDPval leaderboard win_rate.
 
 from __future__ import annotations
 
+import argparse
 import json
-import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 import requests
 
+import gdpval_data
+
 
 ROOT = Path(__file__).resolve().parent
 OUT_DIR = ROOT / "output"
 REPORT_PATH = ROOT / "gdpval_replacement_risk_report.md"
-JS_CACHE = ROOT / "data" / "raw" / "gdpval" / "leaderboard_bundle.js"
+JS_CACHE = gdpval_data.JS_CACHE
 
 GDPVAL_LEADERBOARD_URL = "https://evals.openai.com/gdpval/leaderboard"
 GDPVAL_BUNDLE_URL = "https://evals.openai.com/assets/index-BeFXzkDd.js"
@@ -59,54 +61,20 @@ def fetch_bundle(force_refresh: bool = False) -> str:
     return txt
 
 
-def parse_float_js(token: str) -> float:
-    t = token.strip()
-    if t.startswith("."):
-        t = "0" + t
-    if t == "-.0":
-        t = "0"
-    return float(t)
+def parse_gdpval_data(js_text: str) -> ParsedGDPval:
+    return parsed_from_tables(gdpval_data.parse_bundle(js_text))
 
 
-def parse_gdpval_data(js_text: str) -> ParsedGDPval:
-    # totals block: GI=[{model:"...",win_rate:...,win_or_tie_rate:...},...],$I={totals:GI}
-    m = re.search(r"GI=\[(.*?)\],\$I=\{totals:GI\}", js_text, re.DOTALL)
-    if not m:
-        raise RuntimeError("Cannot locate GDPval totals block in JS bundle.")
-    totals_block = m.group(1)
-    totals_rows = re.findall(
-        r'\{model:"([^"]+)",win_rate:([^,}]+),win_or_tie_rate:([^,}]+)\}',
-        totals_block,
-    )
-    totals = pd.DataFrame(
-        [
-            {
-                "model": model,
-                "win_rate": parse_float_js(w),
-                "win_or_tie_rate": parse_float_js(wt),
-            }
-            for model, w, wt in totals_rows
-        ]
-    )
+def parsed_from_tables(tables: gdpval_data.GDPvalTables) -> ParsedGDPval:
+    return ParsedGDPval(totals=tables.totals, by_sector=tables.by_sector.drop_duplicates(["model", "gdpval_sector"]))
 
-    # by-sector rows are spread across model arrays; extract all.
-    sector_rows = re.findall(
-        r'\{model:"([^"]+)",sector:"([^"]+)",win_rate:([^,}]+),win_or_tie_rate:([^,}]+)\}',
-        js_text,
-    )
-    by_sector = pd.DataFrame(
-        [
-            {
-                "model": model,
-                "gdpval_sector": sector,
-                "win_rate": parse_float_js(w),
-                "win_or_tie_rate": parse_float_js(wt),
-            }
-            for model, sector, w, wt in sector_rows
-        ]
-    ).drop_duplicates(["model", "gdpval_sector"])
 
-    return ParsedGDPval(totals=totals, by_sector=by_sector)
+def load_gdpval(force_refresh: bool = False, source: Optional[Path] = None) -> ParsedGDPval:
+    """Parsed leaderboard from the bundle (fetched if needed) or an explicit .js/.json source."""
+    if source is None:
+        fetch_bundle(force_refresh=force_refresh)
+        source = JS_CACHE
+    return parsed_from_tables(gdpval_data.load_tables(source))
 
 
 def load_latest_exposure() -> pd.DataFrame:
@@ -234,11 +202,22 @@ def build_markdown_report(
     return "\n".join(lines)
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="GDPval replacement risk from sector exposure.")
+    parser.add_argument(
+        "--gdpval-source",
+        type=Path,
+        default=None,
+        help="Leaderboard bundle (.js) or gdpval_complete_data.json; default: fetch the live bundle.",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
+    args = parse_args()
     OUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    js = fetch_bundle(force_refresh=True)
-    parsed = parse_gdpval_data(js)
+    parsed = load_gdpval(force_refresh=True, source=args.gdpval_source)
     latest = load_latest_exposure()
     latest_year = int(latest["year"].iloc[0])
 
@@ -11,31 +11,40 @@ Core principle:
 
 from __future__ import annotations
 
+import argparse
 import json
 import re
 from dataclasses import dataclass
-from difflib import SequenceMatcher, get_close_matches
+from difflib import SequenceMatcher
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 import requests
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import linear_kernel
+import scipy.sparse as sp
 
+import batch_risk
 import compute_task_exposure_paper_method as base
+import employment_matrix
+import gdpval_data
+import name_matching
+import run_memo
+import sparse_topk
+import tfidf_cache
 
 
 ROOT = Path(__file__).resolve().parent
 OUT_DIR = ROOT / "output"
 REPORT_PATH = ROOT / "gdpval_replacement_risk_rigorous_report.md"
-JS_CACHE = ROOT / "data" / "raw" / "gdpval" / "leaderboard_bundle.js"
+JS_CACHE = gdpval_data.JS_CACHE
+ONET_TASK_PATH = ROOT / "data" / "raw" / "onet" / "Task%20Statements.txt"
 
 GDPVAL_BUNDLE_URL = "https://evals.openai.com/assets/index-BeFXzkDd.js"
 UA = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"}
 
 K_NEIGHBORS = 5
+SIMILARITY_TFIDF_PARAMS = {"stop_words": "english", "ngram_range": (1, 2), "min_df": 2, "max_features": 200000}
 NAME_MATCH_CUTOFF = 0.82
 
 
@@ -55,15 +64,6 @@ def clean_title(s: str) -> str:
     return x
 
 
-def parse_float_js(token: str) -> float:
-    t = token.strip()
-    if t.startswith("."):
-        t = "0" + t
-    if t == "-.0":
-        t = "0"
-    return float(t)
-
-
 def fetch_bundle(force_refresh: bool = False) -> str:
     JS_CACHE.parent.mkdir(parents=True, exist_ok=True)
     if JS_CACHE.exists() and not force_refresh:
@@ -74,46 +74,32 @@ def fetch_bundle(force_refresh: bool = False) -> str:
 
 
 def parse_gdpval(js_text: str) -> ParsedGDPval:
-    m = re.search(r"GI=\[(.*?)\],\$I=\{totals:GI\}", js_text, re.DOTALL)
-    if not m:
-        raise RuntimeError("Cannot locate GDPval totals block in bundle.")
-    totals_rows = re.findall(
-        r'\{model:"([^"]+)",win_rate:([^,}]+),win_or_tie_rate:([^,}]+)\}',
-        m.group(1),
-    )
-    totals = pd.DataFrame(
-        [
-            {
-                "model": model,
-                "win_rate": parse_float_js(w),
-                "win_or_tie_rate": parse_float_js(wt),
-            }
-            for model, w, wt in totals_rows
-        ]
-    )
-    totals = totals[totals["model"] != "human"].drop_duplicates("model").reset_index(drop=True)
+    return parsed_from_tables(gdpval_data.parse_bundle(js_text))
 
-    occ_rows = re.findall(
-        r'\{model:"([^"]+)",sector:"([^"]+)",occupation:"([^"]+)",win_rate:([^,}]+),win_or_tie_rate:([^,}]+)\}',
-        js_text,
-    )
-    by_occ = pd.DataFrame(
-        [
-            {
-                "model": model,
-                "gdpval_sector": sector,
-                "gdpval_occupation": occ,
-                "win_rate": parse_float_js(w),
-                "win_or_tie_rate": parse_float_js(wt),
-            }
-            for model, sector, occ, w, wt in occ_rows
-        ]
-    ).drop_duplicates(["model", "gdpval_occupation"])
+
+def parsed_from_tables(tables: gdpval_data.GDPvalTables) -> ParsedGDPval:
+    totals = tables.totals[tables.totals["model"] != "human"].drop_duplicates("model").reset_index(drop=True)
+    by_occ = tables.by_occupation.drop_duplicates(["model", "gdpval_occupation"])
     return ParsedGDPval(totals=totals, by_occ=by_occ)
 
 
+def load_gdpval(force_refresh: bool = False, source: Optional[Path] = None) -> ParsedGDPval:
+    """Parsed leaderboard from the bundle (fetched if needed) or an explicit .js/.json source."""
+    if source is None:
+        fetch_bundle(force_refresh=force_refresh)
+        source = JS_CACHE
+    return parsed_from_tables(gdpval_data.load_tables(source))
+
+
 def build_occupation_corpus(occ_exposure: pd.DataFrame) -> pd.DataFrame:
-    task_stmt = pd.read_csv(ROOT / "data" / "raw" / "onet" / "Task%20Statements.txt", sep="\t", dtype=str)
+    """Per-SOC corpus text, memoized on the titles, the O*NET task file and the builder code."""
+    titles = occ_exposure[["soc_code", "occupation_title"]].reset_index(drop=True)
+    key = run_memo.fingerprint(titles, ONET_TASK_PATH, _build_occupation_corpus, base.normalize_columns, base.clean_text)
+    return run_memo.RUN.get("onet_occupation_corpus", key, lambda: _build_occupation_corpus(titles))
+
+
+def _build_occupation_corpus(occ_exposure: pd.DataFrame) -> pd.DataFrame:
+    task_stmt = pd.read_csv(ONET_TASK_PATH, sep="\t", dtype=str)
     task_stmt = base.normalize_columns(task_stmt).rename(
         columns={
             "o*net-soc code": "onet_soc_code",
@@ -142,11 +128,19 @@ def build_occupation_corpus(occ_exposure: pd.DataFrame) -> pd.DataFrame:
 
 
 def build_name_mapping(gdpval_occ_names: List[str], occ_titles: pd.DataFrame) -> pd.DataFrame:
+    names = sorted(set(gdpval_occ_names))
+    titles = occ_titles[["soc_code", "occupation_title"]].reset_index(drop=True)
+    key = run_memo.fingerprint(names, titles, NAME_MATCH_CUTOFF, *NAME_MAPPING_CODE)
+    return run_memo.RUN.get("gdpval_name_mapping", key, lambda: _build_name_mapping(names, titles))
+
+
+def _build_name_mapping(gdpval_occ_names: List[str], occ_titles: pd.DataFrame) -> pd.DataFrame:
     occ_titles = occ_titles.copy()
     occ_titles["title_norm"] = occ_titles["occupation_title"].map(clean_title)
     title_norms = occ_titles["title_norm"].tolist()
     title_map = dict(zip(occ_titles["title_norm"], occ_titles["occupation_title"]))
     soc_map = dict(zip(occ_titles["title_norm"], occ_titles["soc_code"]))
+    index = name_matching.TitleIndex(title_norms)
 
     rows = []
     for name in sorted(set(gdpval_occ_names)):
@@ -159,9 +153,9 @@ def build_name_mapping(gdpval_occ_names: List[str], occ_titles: pd.DataFrame) ->
             sim = 1.0
             method = "exact"
         else:
-            cands = get_close_matches(n, title_norms, n=1, cutoff=NAME_MATCH_CUTOFF)
-            if cands:
-                chosen = cands[0]
+            match = index.close_match(n, cutoff=NAME_MATCH_CUTOFF)
+            if match is not None:
+                chosen = match
                 sim = SequenceMatcher(None, n, chosen).ratio()
                 method = "fuzzy"
 
@@ -188,34 +182,42 @@ def build_name_mapping(gdpval_occ_names: List[str], occ_titles: pd.DataFrame) ->
     return pd.DataFrame(rows)
 
 
-def build_similarity_transfer_matrix(corpus: pd.DataFrame, anchor_soc: List[str], k: int = K_NEIGHBORS) -> Tuple[np.ndarray, np.ndarray, Dict[str, float]]:
+# Code the name mapping depends on; part of its memo key.
+NAME_MAPPING_CODE = (_build_name_mapping, clean_title, name_matching.TitleIndex)
+
+
+def transfer_matrix_csr(top_idx: np.ndarray, w_local: np.ndarray, n_anchor: int) -> sp.csr_matrix:
+    """Row-stochastic (n_all x n_anchor) kNN transfer operator with k stored entries per row."""
+    n_all, k = top_idx.shape
+    indptr = np.arange(n_all + 1, dtype=np.int64) * k
+    W = sp.csr_matrix((w_local.ravel(), top_idx.ravel(), indptr), shape=(n_all, n_anchor))
+    W.sort_indices()
+    return W
+
+
+def build_similarity_transfer_matrix(
+    corpus: pd.DataFrame, anchor_soc: List[str], k: int = K_NEIGHBORS
+) -> Tuple[sp.csr_matrix, np.ndarray, Dict[str, float]]:
     all_text = corpus["occ_text"].fillna("").astype(str).tolist()
     anchor_mask = corpus["soc_code"].isin(anchor_soc)
     anchor_df = corpus[anchor_mask].copy()
     anchor_df = anchor_df.set_index("soc_code").loc[anchor_soc].reset_index()
 
-    vec = TfidfVectorizer(stop_words="english", ngram_range=(1, 2), min_df=2, max_features=200000)
-    vec.fit(all_text + anchor_df["occ_text"].fillna("").astype(str).tolist())
-    x_all = vec.transform(all_text)
-    x_anchor = vec.transform(anchor_df["occ_text"].fillna("").astype(str).tolist())
-    sims = linear_kernel(x_all, x_anchor)
+    anchor_text = anchor_df["occ_text"].fillna("").astype(str).tolist()
+    tfidf = tfidf_cache.fit_transform_cached(SIMILARITY_TFIDF_PARAMS, all_text + anchor_text, {"all": all_text, "anchor": anchor_text})
+    x_all = tfidf.matrices["all"]
+    x_anchor = tfidf.matrices["anchor"]
 
-    n_all, n_anchor = sims.shape
+    n_anchor = x_anchor.shape[0]
     k_eff = min(k, n_anchor)
-    top_idx = np.argpartition(sims, -k_eff, axis=1)[:, -k_eff:]
-    top_val = np.take_along_axis(sims, top_idx, axis=1)
-    order = np.argsort(top_val, axis=1)[:, ::-1]
-    top_idx = np.take_along_axis(top_idx, order, axis=1)
-    top_val = np.take_along_axis(top_val, order, axis=1)
+    top_idx, top_val = sparse_topk.topk(x_all, x_anchor, k=k_eff)
 
     top_val = np.clip(top_val, 0.0, None)
     denom = np.clip(top_val.sum(axis=1, keepdims=True), 1e-12, None)
     w_local = top_val / denom
 
-    # build dense transfer matrix W (n_all x n_anchor)
-    W = np.zeros_like(sims)
-    for i in range(n_all):
-        W[i, top_idx[i]] = w_local[i]
+    # sparse transfer matrix W (n_all x n_anchor), O(n_all * k) memory
+    W = transfer_matrix_csr(top_idx, w_local, n_anchor)
 
     strength = top_val.mean(axis=1)
     q10 = float(np.quantile(strength, 0.10))
@@ -235,20 +237,29 @@ def read_nat_occ_2024() -> pd.DataFrame:
     return d[["occ_code", "occ_title", "tot_emp"]]
 
 
-def read_industry_detail_2024() -> pd.DataFrame:
-    df = base.read_bls_excel(base.resolve_in4_file(2024))
-    d = df[df["o_group"].str.lower() == "detailed"].copy()
-    if "area" in d.columns:
-        d = d[d["area"].astype(str) == "99"]
-    d = d[d["naics"].astype(str).str.fullmatch(r"\d{6}", na=False)]
-    d["tot_emp"] = base.to_float(d["tot_emp"])
-    d = d[d["tot_emp"].notna() & (d["tot_emp"] > 0)]
-    d["sector_code"] = d["naics"].map(base.normalize_sector_code)
-    d["sector_title"] = d["sector_code"].map(base.SECTOR_TITLE).fillna("Unknown")
-    return d
+def load_employment_matrix_2024() -> employment_matrix.EmploymentMatrix:
+    return employment_matrix.load(2024, base.resolve_in4_file(2024))
+
+
+def sector_groups(E: employment_matrix.EmploymentMatrix) -> pd.DataFrame:
+    """sector_code / sector_title for every NAICS column of E."""
+    sector_code = pd.Series(E.naics).map(base.normalize_sector_code)
+    return pd.DataFrame({"sector_code": sector_code, "sector_title": sector_code.map(base.SECTOR_TITLE).fillna("Unknown")})
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rigorous GDPval replacement risk (win-only).")
+    parser.add_argument(
+        "--gdpval-source",
+        type=Path,
+        default=None,
+        help="Leaderboard bundle (.js) or gdpval_complete_data.json; default: fetch the live bundle.",
+    )
+    return parser.parse_args()
 
 
 def main() -> None:
+    args = parse_args()
     OUT_DIR.mkdir(parents=True, exist_ok=True)
 
     occ_exp_path = OUT_DIR / "occupation_task_exposure.csv"
@@ -256,8 +267,7 @@ def main() -> None:
         raise FileNotFoundError(f"Missing {occ_exp_path}. Run baseline exposure first.")
     occ_exposure = pd.read_csv(occ_exp_path, dtype={"soc_code": str})
 
-    js = fetch_bundle(force_refresh=True)
-    parsed = parse_gdpval(js)
+    parsed = load_gdpval(force_refresh=True, source=args.gdpval_source)
 
     corpus = build_occupation_corpus(occ_exposure)
     name_map = build_name_mapping(parsed.by_occ["gdpval_occupation"].tolist(), occ_exposure[["soc_code", "occupation_title"]])
@@ -269,91 +279,45 @@ def main() -> None:
     soc_to_idx = {s: i for i, s in enumerate(corpus["soc_code"].tolist())}
     anchor_idx = [soc_to_idx[s] for s in anchor_soc]
 
-    # Build per-model occupation win probability.
-    occ_probs_rows = []
-    overall_rows = []
-    ind24 = read_industry_detail_2024()
+    # All models at once: anchor win-rate matrix -> transfer -> employment aggregation.
+    E24 = load_employment_matrix_2024()
 
     base_occ = occ_exposure[["soc_code", "occupation_title", "occupation_exposure"]].copy()
     nat24 = read_nat_occ_2024()
     base_occ = base_occ.merge(nat24[["occ_code", "tot_emp"]], left_on="soc_code", right_on="occ_code", how="left")
     base_occ["tot_emp"] = base_occ["tot_emp"].fillna(0.0)
 
-    for m in parsed.totals["model"].tolist():
-        global_p = float(parsed.totals.loc[parsed.totals["model"] == m, "win_rate"].iloc[0])
-
-        occ_m = parsed.by_occ[parsed.by_occ["model"] == m][["gdpval_occupation", "win_rate"]].copy()
-        occ_m = occ_m.merge(anchors[["gdpval_occupation", "soc_code"]], on="gdpval_occupation", how="inner")
-        occ_m = occ_m.dropna(subset=["soc_code"]).drop_duplicates("soc_code")
-        p_anchor_map = dict(zip(occ_m["soc_code"].astype(str), occ_m["win_rate"].astype(float)))
-        p_anchor = np.array([p_anchor_map.get(s, global_p) for s in anchor_soc], dtype=float)
-
-        p_knn = W @ p_anchor
-        p_all = alpha * p_knn + (1.0 - alpha) * global_p
-        # For mapped anchors, use direct GDPval occupation win_rate.
-        for s, p in p_anchor_map.items():
-            p_all[soc_to_idx[s]] = p
-        p_all = np.clip(p_all, 0.0, 1.0)
-
-        occ_model = base_occ.copy()
-        occ_model["model"] = m
-        occ_model["model_global_win_rate"] = global_p
-        occ_model["ai_win_probability_occ"] = [float(p_all[soc_to_idx[s]]) for s in occ_model["soc_code"]]
-        occ_model["replacement_risk_occ"] = occ_model["occupation_exposure"] * occ_model["ai_win_probability_occ"]
-        occ_model["expected_affected_emp_occ"] = occ_model["replacement_risk_occ"] * occ_model["tot_emp"]
-        occ_model["transfer_alpha"] = [float(alpha[soc_to_idx[s]]) for s in occ_model["soc_code"]]
-        occ_model["is_anchor_direct"] = occ_model["soc_code"].isin(p_anchor_map).astype(int)
-        occ_probs_rows.append(occ_model)
-
-        # Keep national aggregation on the same IN4 employment universe as industry outputs.
-        d_model = ind24.merge(
-            occ_model[["soc_code", "occupation_exposure", "ai_win_probability_occ"]],
-            left_on="occ_code",
-            right_on="soc_code",
-            how="left",
-        )
-        d_model["occupation_exposure"] = d_model["occupation_exposure"].fillna(0.0)
-        d_model["ai_win_probability_occ"] = d_model["ai_win_probability_occ"].fillna(global_p)
-        d_model["risk_prob_occ"] = d_model["occupation_exposure"] * d_model["ai_win_probability_occ"]
-        d_model["expected_affected_emp"] = d_model["risk_prob_occ"] * d_model["tot_emp"]
-        d_model["exposure_emp"] = d_model["occupation_exposure"] * d_model["tot_emp"]
-
-        total_emp = float(d_model["tot_emp"].sum())
-        national_exposure = float(d_model["exposure_emp"].sum() / max(total_emp, 1e-9))
-        national_risk = float(d_model["expected_affected_emp"].sum() / max(total_emp, 1e-9))
-        overall_rows.append(
-            {
-                "model": m,
-                "model_global_win_rate": global_p,
-                "national_total_employment": total_emp,
-                "national_exposure_emp_weighted": national_exposure,
-                "national_replacement_risk_emp_weighted": national_risk,
-            }
-        )
-
-    occ_probs = pd.concat(occ_probs_rows, ignore_index=True)
-    overall = pd.DataFrame(overall_rows).sort_values("national_replacement_risk_emp_weighted", ascending=False).reset_index(drop=True)
+    models = parsed.totals["model"].tolist()
+    global_p = parsed.totals["win_rate"].to_numpy(dtype=float)
+    win = parsed.by_occ[["model", "gdpval_occupation", "win_rate"]].merge(
+        anchors[["gdpval_occupation", "soc_code"]], on="gdpval_occupation", how="inner"
+    )
+    win = win.dropna(subset=["soc_code"]).drop_duplicates(["model", "soc_code"])
+    P_anchor, direct = batch_risk.anchor_win_matrix(anchor_soc, win, models, global_p)
+    # For mapped anchors, use direct GDPval occupation win_rate.
+    P_all = batch_risk.transfer_probabilities(W, alpha, P_anchor, direct, global_p, np.asarray(anchor_idx))
+
+    occ_rows = np.array([soc_to_idx[s] for s in base_occ["soc_code"]], dtype=np.int64)
+    P_occ = P_all[occ_rows]
+    direct_all = np.zeros(P_all.shape, dtype=bool)
+    direct_all[anchor_idx] = direct
+
+    occ_probs = batch_risk.long_by_model(base_occ, models, global_p)
+    occ_probs["ai_win_probability_occ"] = P_occ.T.ravel()
+    occ_probs["replacement_risk_occ"] = occ_probs["occupation_exposure"] * occ_probs["ai_win_probability_occ"]
+    occ_probs["expected_affected_emp_occ"] = occ_probs["replacement_risk_occ"] * occ_probs["tot_emp"]
+    occ_probs["transfer_alpha"] = np.tile(alpha[occ_rows], len(models))
+    occ_probs["is_anchor_direct"] = direct_all[occ_rows].T.ravel().astype(int)
+
+    # Keep national aggregation on the same IN4 employment universe as industry outputs.
+    emp = batch_risk.join_employment(E24, base_occ["soc_code"], sector_groups(E24))
+    exposure = base_occ["occupation_exposure"].to_numpy(dtype=float)
+    overall = batch_risk.national_risk(emp, exposure, P_occ, models, global_p)
+    overall = overall.sort_values("national_replacement_risk_emp_weighted", ascending=False).reset_index(drop=True)
     best_model = str(overall.iloc[0]["model"])
 
     # Industry aggregation for best model (more detailed sector interpretation).
-    best_occ = occ_probs[occ_probs["model"] == best_model][["soc_code", "occupation_exposure", "ai_win_probability_occ"]].copy()
-    d = ind24.merge(best_occ, left_on="occ_code", right_on="soc_code", how="left")
-    d["occupation_exposure"] = d["occupation_exposure"].fillna(0.0)
-    d["ai_win_probability_occ"] = d["ai_win_probability_occ"].fillna(float(overall.iloc[0]["model_global_win_rate"]))
-    d["risk_prob_occ"] = d["occupation_exposure"] * d["ai_win_probability_occ"]
-    d["expected_affected_emp"] = d["tot_emp"] * d["risk_prob_occ"]
-    d["exposure_emp"] = d["tot_emp"] * d["occupation_exposure"]
-
-    sec = (
-        d.groupby(["sector_code", "sector_title"], as_index=False)
-        .agg(total_emp=("tot_emp", "sum"), expected_affected_emp=("expected_affected_emp", "sum"), exposure_emp=("exposure_emp", "sum"))
-    )
-    sec["industry_emp_share"] = sec["total_emp"] / sec["total_emp"].sum()
-    sec["industry_exposure"] = sec["exposure_emp"] / sec["total_emp"]
-    sec["replacement_risk_probability"] = sec["expected_affected_emp"] / sec["total_emp"]
-    sec["weighted_risk_contribution"] = sec["industry_emp_share"] * sec["replacement_risk_probability"]
-    sec["effective_ai_win_probability"] = np.where(sec["exposure_emp"] > 0, sec["expected_affected_emp"] / sec["exposure_emp"], 0.0)
-    sec = sec.sort_values("weighted_risk_contribution", ascending=False).reset_index(drop=True)
+    sec = batch_risk.sector_risk(emp, exposure, P_occ[:, models.index(best_model)])
 
     # Save outputs
     name_map.to_csv(OUT_DIR / "gdpval_occ_name_mapping_rigorous.csv", index=False)
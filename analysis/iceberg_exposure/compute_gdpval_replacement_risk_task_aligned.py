@@ -12,19 +12,21 @@ Pipeline:
 
 from __future__ import annotations
 
+import argparse
 import json
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import linear_kernel
 
+import batch_risk
 import compute_gdpval_replacement_risk_rigorous as rig
 import compute_task_exposure_paper_method as base
+import onet_alignment
+import run_memo
 
 
 ROOT = Path(__file__).resolve().parent
@@ -88,18 +90,28 @@ def load_task_auto_scores(force_refresh: bool = False) -> pd.DataFrame:
 
 
 def build_occ_to_socs(occ_exposure: pd.DataFrame, gdp_tasks: pd.DataFrame) -> Tuple[Dict[str, List[str]], pd.DataFrame]:
-    name_map = rig.build_name_mapping(
-        gdp_tasks["occupation"].dropna().astype(str).unique().tolist(),
-        occ_exposure[["soc_code", "occupation_title"]],
-    )
+    """GDPval occupation -> SOC list plus the mapping detail, memoized per run."""
+    occ_names = sorted(gdp_tasks["occupation"].dropna().astype(str).unique().tolist())
+    titles = occ_exposure[["soc_code", "occupation_title"]].reset_index(drop=True)
+    key = run_memo.fingerprint(occ_names, titles, MANUAL_OCC_SPLIT, rig.NAME_MATCH_CUTOFF, _build_occ_soc_mapping, *rig.NAME_MAPPING_CODE)
+    mapping_detail = run_memo.RUN.get("gdpval_occ_soc_mapping", key, lambda: _build_occ_soc_mapping(occ_names, titles))
+
+    occ_to_socs: Dict[str, List[str]] = {occ_name: [] for occ_name in occ_names}
+    if not mapping_detail.empty:
+        mapped = mapping_detail[mapping_detail["soc_code"].notna()]
+        for occ_name, soc in zip(mapped["gdpval_occupation"], mapped["soc_code"]):
+            occ_to_socs[occ_name].append(str(soc))
+    return occ_to_socs, mapping_detail
+
+
+def _build_occ_soc_mapping(occ_names: List[str], occ_exposure: pd.DataFrame) -> pd.DataFrame:
+    name_map = rig.build_name_mapping(occ_names, occ_exposure[["soc_code", "occupation_title"]])
     map_rows: List[Dict] = []
-    occ_to_socs: Dict[str, List[str]] = {}
 
-    for occ_name in sorted(gdp_tasks["occupation"].dropna().astype(str).unique().tolist()):
+    for occ_name in occ_names:
         if occ_name in MANUAL_OCC_SPLIT:
             socs = [s for s in MANUAL_OCC_SPLIT[occ_name] if s in set(occ_exposure["soc_code"].astype(str))]
-            occ_to_socs[occ_name] = sorted(set(socs))
-            for soc in occ_to_socs[occ_name]:
+            for soc in sorted(set(socs)):
                 title = occ_exposure.loc[occ_exposure["soc_code"] == soc, "occupation_title"].iloc[0]
                 map_rows.append(
                     {
@@ -114,7 +126,6 @@ def build_occ_to_socs(occ_exposure: pd.DataFrame, gdp_tasks: pd.DataFrame) -> Tu
 
         row = name_map[name_map["gdpval_occupation"] == occ_name]
         if row.empty or row["soc_code"].isna().all():
-            occ_to_socs[occ_name] = []
             map_rows.append(
                 {
                     "gdpval_occupation": occ_name,
@@ -126,7 +137,6 @@ def build_occ_to_socs(occ_exposure: pd.DataFrame, gdp_tasks: pd.DataFrame) -> Tu
             )
         else:
             soc = str(row.iloc[0]["soc_code"])
-            occ_to_socs[occ_name] = [soc]
             map_rows.append(
                 {
                     "gdpval_occupation": occ_name,
@@ -136,114 +146,90 @@ def build_occ_to_socs(occ_exposure: pd.DataFrame, gdp_tasks: pd.DataFrame) -> Tu
                     "name_similarity": float(row.iloc[0]["name_similarity"]),
                 }
             )
-    mapping_detail = pd.DataFrame(map_rows)
-    return occ_to_socs, mapping_detail
+    return pd.DataFrame(map_rows)
 
 
 def align_gdpval_tasks_to_onet(
     gdp_tasks: pd.DataFrame,
     task_auto: pd.DataFrame,
     occ_to_socs: Dict[str, List[str]],
+    idf_mode: str = "shared",
+    index: Optional[onet_alignment.TaskAlignmentIndex] = None,
 ) -> pd.DataFrame:
-    gdp = gdp_tasks.copy()
-    gdp["prompt_clean"] = gdp["prompt"].fillna("").map(clean_text)
+    """Top-k O*NET tasks per GDPval prompt within its mapped SOC(s).
 
-    rows: List[Dict] = []
+    The task space is fitted once (see ``onet_alignment``); ``idf_mode="per_group"``
+    reproduces the former per-occupation TF-IDF refits exactly.
+    """
+    gdp = gdp_tasks.copy().reset_index(drop=True)
+    gdp["prompt_clean"] = gdp["prompt"].fillna("").map(clean_text)
+    if index is None:
+        index = onet_alignment.TaskAlignmentIndex(task_auto, idf_mode=idf_mode)
+    x_prompt_all = index.transform_prompts(gdp["prompt_clean"].tolist())
+    weight = index.task_auto["task_weight"].fillna(0.01).to_numpy(dtype=float)
+    score = index.task_auto["task_auto_score"].fillna(0.0).to_numpy(dtype=float)
+
+    # Per group: (occupation, prompt rows, mapped socs, k_eff, top-1 task rows, top-1 sim, exposure).
+    parts: List[Tuple] = []
     for occ_name, grp in gdp.groupby("occupation", sort=True):
+        pos = grp.index.to_numpy()
         socs = occ_to_socs.get(occ_name, [])
-        if not socs:
-            for _, r in grp.iterrows():
-                rows.append(
-                    {
-                        "task_id": r["task_id"],
-                        "sector": r["sector"],
-                        "occupation": occ_name,
-                        "mapped_socs": "",
-                        "alignment_topk": 0,
-                        "top_onet_soc_code": None,
-                        "top_onet_task_id": None,
-                        "top_onet_task_text": None,
-                        "top_similarity": 0.0,
-                        "aligned_task_exposure": np.nan,
-                    }
-                )
-            continue
-
-        cand = task_auto[task_auto["soc_code"].isin(socs)].copy()
-        if cand.empty:
-            for _, r in grp.iterrows():
-                rows.append(
-                    {
-                        "task_id": r["task_id"],
-                        "sector": r["sector"],
-                        "occupation": occ_name,
-                        "mapped_socs": "|".join(socs),
-                        "alignment_topk": 0,
-                        "top_onet_soc_code": None,
-                        "top_onet_task_id": None,
-                        "top_onet_task_text": None,
-                        "top_similarity": 0.0,
-                        "aligned_task_exposure": np.nan,
-                    }
-                )
-            continue
-
-        cand = cand.reset_index(drop=True)
-        vec = TfidfVectorizer(stop_words="english", ngram_range=(1, 2), min_df=1, max_features=200000)
-        # Fit on O*NET task space only; prompts are projected into this fixed task space.
-        vec.fit(cand["task_text_clean"].tolist())
-        x_task = vec.transform(cand["task_text_clean"].tolist())
-        x_prompt = vec.transform(grp["prompt_clean"].tolist())
-        sims = linear_kernel(x_prompt, x_task)
-
-        k_eff = min(ALIGN_TOPK, len(cand))
-        top_idx = np.argpartition(sims, -k_eff, axis=1)[:, -k_eff:]
-        top_val = np.take_along_axis(sims, top_idx, axis=1)
-        order = np.argsort(top_val, axis=1)[:, ::-1]
-        top_idx = np.take_along_axis(top_idx, order, axis=1)
-        top_val = np.take_along_axis(top_val, order, axis=1)
-
-        for i, (_, r) in enumerate(grp.iterrows()):
-            idxs = top_idx[i]
-            vals = np.clip(top_val[i], 0.0, None)
-            pri = cand.iloc[idxs]["task_weight"].fillna(0.01).to_numpy(dtype=float)
-            raw = vals * np.clip(pri, 1e-9, None)
-            if not np.isfinite(raw.sum()) or raw.sum() <= 0:
-                raw = np.clip(pri, 1e-9, None)
-            if raw.sum() <= 0:
-                raw = np.ones_like(raw)
-            w = raw / raw.sum()
-
-            task_scores = cand.iloc[idxs]["task_auto_score"].fillna(0.0).to_numpy(dtype=float)
-            aligned_e = float(np.sum(w * task_scores))
-
-            best = idxs[0]
-            best_row = cand.iloc[best]
-            rows.append(
-                {
-                    "task_id": r["task_id"],
-                    "sector": r["sector"],
-                    "occupation": occ_name,
-                    "mapped_socs": "|".join(socs),
-                    "alignment_topk": int(k_eff),
-                    "top_onet_soc_code": best_row["soc_code"],
-                    "top_onet_task_id": best_row["task_id"],
-                    "top_onet_task_text": best_row["task_text"],
-                    "top_similarity": float(vals[0]),
-                    "aligned_task_exposure": aligned_e,
-                }
+        cand_pos = np.zeros(0, dtype=np.int64)
+        if socs:
+            cand_pos, top_idx, top_val = onet_alignment.align_topk(
+                index, socs, grp["prompt_clean"].tolist(), ALIGN_TOPK, x_prompt=x_prompt_all[pos]
             )
-
-    return pd.DataFrame(rows)
+        if len(cand_pos) == 0:
+            parts.append((occ_name, pos, "|".join(socs), 0, None, np.zeros(len(pos)), np.full(len(pos), np.nan)))
+            continue
+        task_pos = cand_pos[top_idx]
+        top_sim, aligned = onet_alignment.weighted_exposure(top_val, weight[task_pos], score[task_pos])
+        parts.append((occ_name, pos, "|".join(socs), top_idx.shape[1], task_pos[:, 0], top_sim, aligned))
+
+    return _alignment_frame(gdp, index.task_auto, parts)
+
+
+def _alignment_frame(gdp: pd.DataFrame, task_auto: pd.DataFrame, parts: List[Tuple]) -> pd.DataFrame:
+    cols: Dict[str, List] = {
+        c: []
+        for c in [
+            "task_id",
+            "sector",
+            "occupation",
+            "mapped_socs",
+            "alignment_topk",
+            "top_onet_soc_code",
+            "top_onet_task_id",
+            "top_onet_task_text",
+            "top_similarity",
+            "aligned_task_exposure",
+        ]
+    }
+    gdp_id = gdp["task_id"].to_numpy(dtype=object)
+    gdp_sector = gdp["sector"].to_numpy(dtype=object)
+    onet = {c: task_auto[c].to_numpy(dtype=object) for c in ["soc_code", "task_id", "task_text"]}
+    for occ_name, pos, socs, k_eff, best, top_sim, aligned in parts:
+        n = len(pos)
+        cols["task_id"] += gdp_id[pos].tolist()
+        cols["sector"] += gdp_sector[pos].tolist()
+        cols["occupation"] += [occ_name] * n
+        cols["mapped_socs"] += [socs] * n
+        cols["alignment_topk"] += [int(k_eff)] * n
+        for out_col, src in [("top_onet_soc_code", "soc_code"), ("top_onet_task_id", "task_id"), ("top_onet_task_text", "task_text")]:
+            cols[out_col] += [None] * n if best is None else onet[src][best].tolist()
+        cols["top_similarity"] += top_sim.tolist()
+        cols["aligned_task_exposure"] += aligned.tolist()
+    return pd.DataFrame(cols)
 
 
 def build_task_alignment_outputs(
     gdp_tasks: pd.DataFrame,
     task_auto: pd.DataFrame,
     occ_exposure: pd.DataFrame,
+    idf_mode: str = "shared",
 ) -> TaskAlignmentOutputs:
     occ_to_socs, mapping_detail = build_occ_to_socs(occ_exposure, gdp_tasks)
-    task_alignment = align_gdpval_tasks_to_onet(gdp_tasks, task_auto, occ_to_socs)
+    task_alignment = align_gdpval_tasks_to_onet(gdp_tasks, task_auto, occ_to_socs, idf_mode=idf_mode)
 
     occ_aligned = (
         task_alignment.groupby("occupation", as_index=False)
@@ -259,7 +245,6 @@ def build_task_alignment_outputs(
     occ_aligned["aligned_task_exposure_std"] = occ_aligned["aligned_task_exposure_std"].fillna(0.0)
 
     # Expand to SOC-level aligned exposure; if one occupation maps to multiple SOCs, copy value.
-    occ_to_socs, _ = build_occ_to_socs(occ_exposure, gdp_tasks)
     soc_rows: List[Dict] = []
     for _, r in occ_aligned.iterrows():
         occ_name = r["occupation"]
@@ -301,26 +286,17 @@ def build_occ_win_table_with_split(
     mapping_detail: pd.DataFrame,
 ) -> pd.DataFrame:
     mapped = mapping_detail[mapping_detail["soc_code"].notna()][["gdpval_occupation", "soc_code"]].copy()
-    rows: List[Dict] = []
-    for _, r in parsed.by_occ.iterrows():
-        occ = str(r["gdpval_occupation"])
-        m = mapped[mapped["gdpval_occupation"] == occ]
-        if m.empty:
-            continue
-        for _, mr in m.iterrows():
-            rows.append(
-                {
-                    "model": r["model"],
-                    "gdpval_occupation": occ,
-                    "soc_code": str(mr["soc_code"]),
-                    "win_rate": float(r["win_rate"]),
-                    "win_or_tie_rate": float(r["win_or_tie_rate"]),
-                }
-            )
-    if not rows:
-        return pd.DataFrame(columns=["model", "gdpval_occupation", "soc_code", "win_rate", "win_or_tie_rate"])
-    out = pd.DataFrame(rows).drop_duplicates(["model", "soc_code"]).reset_index(drop=True)
-    return out
+    mapped["soc_code"] = mapped["soc_code"].astype(str)
+    cols = ["model", "gdpval_occupation", "soc_code", "win_rate", "win_or_tie_rate"]
+    by_occ = parsed.by_occ[["model", "gdpval_occupation", "win_rate", "win_or_tie_rate"]].copy()
+    by_occ["gdpval_occupation"] = by_occ["gdpval_occupation"].astype(str)
+    # Inner merge keeps by_occ row order, then mapping order within an occupation.
+    out = by_occ.merge(mapped, on="gdpval_occupation", how="inner")[cols]
+    if out.empty:
+        return pd.DataFrame(columns=cols)
+    out["win_rate"] = out["win_rate"].astype(float)
+    out["win_or_tie_rate"] = out["win_or_tie_rate"].astype(float)
+    return out.drop_duplicates(["model", "soc_code"]).reset_index(drop=True)
 
 
 def compute_risk_with_task_aligned_exposure(
@@ -346,79 +322,32 @@ def compute_risk_with_task_aligned_exposure(
     W, alpha, transfer_meta = rig.build_similarity_transfer_matrix(corpus, anchor_soc, k=SIM_K_NEIGHBORS)
     soc_to_idx = {s: i for i, s in enumerate(corpus["soc_code"].tolist())}
 
-    ind24 = rig.read_industry_detail_2024()
-    occ_probs_rows: List[pd.DataFrame] = []
-    overall_rows: List[Dict] = []
-
-    for model in parsed.totals["model"].tolist():
-        global_p = float(parsed.totals.loc[parsed.totals["model"] == model, "win_rate"].iloc[0])
-        d_m = occ_win[occ_win["model"] == model].copy()
-        p_anchor_map = dict(zip(d_m["soc_code"].astype(str), d_m["win_rate"].astype(float)))
-        p_anchor = np.array([p_anchor_map.get(s, global_p) for s in anchor_soc], dtype=float)
-
-        p_knn = W @ p_anchor
-        p_all = alpha * p_knn + (1.0 - alpha) * global_p
-        for s, p in p_anchor_map.items():
-            if s in soc_to_idx:
-                p_all[soc_to_idx[s]] = p
-        p_all = np.clip(p_all, 0.0, 1.0)
-
-        occ_model = occ_exp.copy()
-        occ_model["model"] = model
-        occ_model["model_global_win_rate"] = global_p
-        occ_model["ai_win_probability_occ"] = [float(p_all[soc_to_idx[s]]) for s in occ_model["soc_code"]]
-        occ_model["replacement_risk_occ"] = occ_model["occupation_exposure"] * occ_model["ai_win_probability_occ"]
-        occ_model["transfer_alpha"] = [float(alpha[soc_to_idx[s]]) for s in occ_model["soc_code"]]
-        occ_model["is_anchor_direct"] = occ_model["soc_code"].isin(p_anchor_map).astype(int)
-        occ_probs_rows.append(occ_model)
-
-        d_ind = ind24.merge(
-            occ_model[["soc_code", "occupation_exposure", "ai_win_probability_occ"]],
-            left_on="occ_code",
-            right_on="soc_code",
-            how="left",
-        )
-        d_ind["occupation_exposure"] = d_ind["occupation_exposure"].fillna(0.0)
-        d_ind["ai_win_probability_occ"] = d_ind["ai_win_probability_occ"].fillna(global_p)
-        d_ind["risk_prob_occ"] = d_ind["occupation_exposure"] * d_ind["ai_win_probability_occ"]
-        d_ind["expected_affected_emp"] = d_ind["risk_prob_occ"] * d_ind["tot_emp"]
-        d_ind["exposure_emp"] = d_ind["occupation_exposure"] * d_ind["tot_emp"]
-
-        total_emp = float(d_ind["tot_emp"].sum())
-        national_exposure = float(d_ind["exposure_emp"].sum() / max(total_emp, 1e-9))
-        national_risk = float(d_ind["expected_affected_emp"].sum() / max(total_emp, 1e-9))
-        overall_rows.append(
-            {
-                "model": model,
-                "model_global_win_rate": global_p,
-                "national_total_employment": total_emp,
-                "national_exposure_emp_weighted": national_exposure,
-                "national_replacement_risk_emp_weighted": national_risk,
-            }
-        )
-
-    occ_probs = pd.concat(occ_probs_rows, ignore_index=True)
-    overall = pd.DataFrame(overall_rows).sort_values("national_replacement_risk_emp_weighted", ascending=False).reset_index(drop=True)
+    # All models at once: anchor win-rate matrix -> transfer -> employment aggregation.
+    models = parsed.totals["model"].tolist()
+    global_p = parsed.totals["win_rate"].to_numpy(dtype=float)
+    P_anchor, direct = batch_risk.anchor_win_matrix(anchor_soc, occ_win, models, global_p)
+    anchor_rows = np.array([soc_to_idx.get(s, -1) for s in anchor_soc], dtype=np.int64)
+    P_all = batch_risk.transfer_probabilities(W, alpha, P_anchor, direct, global_p, anchor_rows)
+
+    occ_rows = np.array([soc_to_idx[s] for s in occ_exp["soc_code"]], dtype=np.int64)
+    P_occ = P_all[occ_rows]
+    direct_occ = np.zeros(P_occ.shape, dtype=bool)
+    exp_pos = pd.Index(occ_exp["soc_code"].astype(str)).get_indexer(anchor_soc)
+    direct_occ[exp_pos[exp_pos >= 0]] = direct[exp_pos >= 0]
+
+    occ_probs = batch_risk.long_by_model(occ_exp, models, global_p)
+    occ_probs["ai_win_probability_occ"] = P_occ.T.ravel()
+    occ_probs["replacement_risk_occ"] = occ_probs["occupation_exposure"] * occ_probs["ai_win_probability_occ"]
+    occ_probs["transfer_alpha"] = np.tile(alpha[occ_rows], len(models))
+    occ_probs["is_anchor_direct"] = direct_occ.T.ravel().astype(int)
+
+    E24 = rig.load_employment_matrix_2024()
+    emp = batch_risk.join_employment(E24, occ_exp["soc_code"], rig.sector_groups(E24))
+    exposure = occ_exp["occupation_exposure"].to_numpy(dtype=float)
+    overall = batch_risk.national_risk(emp, exposure, P_occ, models, global_p)
+    overall = overall.sort_values("national_replacement_risk_emp_weighted", ascending=False).reset_index(drop=True)
     best_model = str(overall.iloc[0]["model"])
-
-    best_occ = occ_probs[occ_probs["model"] == best_model][["soc_code", "occupation_exposure", "ai_win_probability_occ"]].copy()
-    d = ind24.merge(best_occ, left_on="occ_code", right_on="soc_code", how="left")
-    d["occupation_exposure"] = d["occupation_exposure"].fillna(0.0)
-    d["ai_win_probability_occ"] = d["ai_win_probability_occ"].fillna(float(overall.iloc[0]["model_global_win_rate"]))
-    d["risk_prob_occ"] = d["occupation_exposure"] * d["ai_win_probability_occ"]
-    d["expected_affected_emp"] = d["tot_emp"] * d["risk_prob_occ"]
-    d["exposure_emp"] = d["tot_emp"] * d["occupation_exposure"]
-
-    sec = (
-        d.groupby(["sector_code", "sector_title"], as_index=False)
-        .agg(total_emp=("tot_emp", "sum"), expected_affected_emp=("expected_affected_emp", "sum"), exposure_emp=("exposure_emp", "sum"))
-    )
-    sec["industry_emp_share"] = sec["total_emp"] / sec["total_emp"].sum()
-    sec["industry_exposure"] = sec["exposure_emp"] / sec["total_emp"]
-    sec["replacement_risk_probability"] = sec["expected_affected_emp"] / sec["total_emp"]
-    sec["weighted_risk_contribution"] = sec["industry_emp_share"] * sec["replacement_risk_probability"]
-    sec["effective_ai_win_probability"] = np.where(sec["exposure_emp"] > 0, sec["expected_affected_emp"] / sec["exposure_emp"], 0.0)
-    sec = sec.sort_values("weighted_risk_contribution", ascending=False).reset_index(drop=True)
+    sec = batch_risk.sector_risk(emp, exposure, P_occ[:, models.index(best_model)])
 
     summary = {
         "best_model": best_model,
@@ -504,7 +433,25 @@ def build_report(
     return "\n".join(lines)
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Task-aligned GDPval replacement risk.")
+    parser.add_argument(
+        "--idf-mode",
+        choices=onet_alignment.IDF_MODES,
+        default="shared",
+        help="TF-IDF weighting for prompt->task alignment; per_group reproduces per-occupation refits.",
+    )
+    parser.add_argument(
+        "--gdpval-source",
+        type=Path,
+        default=None,
+        help="Leaderboard bundle (.js) or gdpval_complete_data.json; default: fetch the live bundle.",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
+    args = parse_args()
     OUT_DIR.mkdir(parents=True, exist_ok=True)
     if not GDPVAL_GOLD_PATH.exists():
         raise FileNotFoundError(f"Missing GDPval gold file: {GDPVAL_GOLD_PATH}")
@@ -521,10 +468,10 @@ def main() -> None:
         gdp_tasks=gdp_tasks,
         task_auto=task_auto,
         occ_exposure=occ_exposure,
+        idf_mode=args.idf_mode,
     )
 
-    js = rig.fetch_bundle(force_refresh=True)
-    parsed = rig.parse_gdpval(js)
+    parsed = rig.load_gdpval(force_refresh=True, source=args.gdpval_source)
     parsed.totals = parsed.totals[parsed.totals["model"] != "human"].reset_index(drop=True)
     parsed.by_occ = parsed.by_occ[parsed.by_occ["model"] != "human"].reset_index(drop=True)
 
@@ -17,6 +17,8 @@ from typing import Dict, List
 import numpy as np
 import pandas as pd
 
+import robust_trend
+
 
 ROOT = Path(__file__).resolve().parent
 OUT_DIR = ROOT / "output"
@@ -40,6 +42,8 @@ class AbsGrowthEst:
     median_pp_per_month: float
     ols_pp_per_month: float
     theilsen_pp_per_month: float
+    theilsen_pp_ci_low: float
+    theilsen_pp_ci_high: float
 
 
 def month_diff(d0: pd.Timestamp, d1: pd.Timestamp) -> int:
@@ -206,19 +210,14 @@ def estimate_abs_growth_pp(series: pd.Series, x_months: pd.Series) -> AbsGrowthE
     b1, _ = np.polyfit(x, y, 1)
     ols_pp = float(b1 * 100.0)
 
-    slopes = []
-    n = len(y)
-    for i in range(n):
-        for j in range(i + 1, n):
-            dx = x[j] - x[i]
-            if dx > 0:
-                slopes.append((y[j] - y[i]) / dx)
-    theilsen_pp = float(np.median(slopes) * 100.0)
+    ts = robust_trend.theil_sen(x, y)
     return AbsGrowthEst(
         mean_pp_per_month=mean_pp,
         median_pp_per_month=median_pp,
         ols_pp_per_month=ols_pp,
-        theilsen_pp_per_month=theilsen_pp,
+        theilsen_pp_per_month=ts.slope * 100.0,
+        theilsen_pp_ci_low=ts.low_slope * 100.0,
+        theilsen_pp_ci_high=ts.high_slope * 100.0,
     )
 
 
@@ -377,6 +376,7 @@ def main() -> None:
     lines.append(
         f"- 绝对月增量（百分点）：均值 `{risk_abs_growth.mean_pp_per_month:.3f}`，中位数 `{risk_abs_growth.median_pp_per_month:.3f}`，"
         f"OLS斜率 `{risk_abs_growth.ols_pp_per_month:.3f}`，Theil-Sen `{risk_abs_growth.theilsen_pp_per_month:.3f}`"
+        f"（95%区间 `{risk_abs_growth.theilsen_pp_ci_low:.3f}` ~ `{risk_abs_growth.theilsen_pp_ci_high:.3f}`）"
     )
     lines.append(
         f"- 水平解读：起点 `{start_risk_pct:.2f}%`，上月 `{prev_risk_pct:.2f}%`，当前 `{current_risk_pct:.2f}%`，"
@@ -9,16 +9,23 @@ Method summary (adapted from Iceberg paper):
 
 from __future__ import annotations
 
+import argparse
 import json
 import math
 import re
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import numpy as np
 import pandas as pd
 
+import bls_cache
+import employment_matrix
+import growth_metrics
+import keyword_scoring
+import year_aggregation
+
 
 ROOT = Path(__file__).resolve().parent
 ONET_DIR = ROOT / "data" / "raw" / "onet"
@@ -29,6 +36,8 @@ YEARS = [2019, 2020, 2021, 2022, 2023, 2024]
 
 
 def to_float(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float)
     return pd.to_numeric(series.astype(str).str.replace(",", "", regex=False), errors="coerce")
 
 
@@ -54,126 +63,8 @@ def cagr(start: float, end: float, periods: int) -> float:
 
 def score_task_automatability(task_text: str) -> float:
     """Heuristic task-level AI automatability score in [0, 1]."""
-    if not isinstance(task_text, str) or not task_text.strip():
-        return 0.35
-
-    t = task_text.lower()
-    score = 0.35
-
-    positive_strong = [
-        "analyz",
-        "analysis",
-        "data",
-        "report",
-        "document",
-        "record",
-        "prepare",
-        "schedule",
-        "coordinat",
-        "email",
-        "correspondence",
-        "budget",
-        "financial",
-        "accounting",
-        "audit",
-        "invoice",
-        "billing",
-        "code",
-        "software",
-        "program",
-        "develop",
-        "draft",
-        "write",
-        "edit",
-        "research",
-        "forecast",
-        "estimate",
-        "translat",
-        "classify",
-        "summar",
-        "review documents",
-    ]
-
-    positive_medium = [
-        "advise",
-        "evaluate",
-        "assess",
-        "monitor",
-        "track",
-        "plan",
-        "quality control",
-        "customer service",
-        "troubleshoot",
-        "calculate",
-        "verify",
-        "process",
-        "clerical",
-        "administrative",
-        "compliance",
-    ]
-
-    negative_strong = [
-        "lift",
-        "carry",
-        "drive",
-        "truck",
-        "forklift",
-        "operate machinery",
-        "operate equipment",
-        "repair",
-        "install",
-        "weld",
-        "solder",
-        "drill",
-        "saw",
-        "assemble",
-        "cook",
-        "clean",
-        "harvest",
-        "farm",
-        "landscap",
-        "construction",
-        "roof",
-        "pave",
-        "firefighting",
-        "arrest",
-        "patrol",
-        "surgery",
-        "medication",
-        "patient care",
-        "physical",
-        "hands-on",
-        "manual",
-    ]
-
-    negative_medium = [
-        "inspect equipment",
-        "maintenance",
-        "operate vehicle",
-        "on-site",
-        "field work",
-        "climb",
-        "kneel",
-        "crawl",
-        "stand for",
-    ]
-
-    pos_hits = sum(1 for k in positive_strong if k in t)
-    pos_med_hits = sum(1 for k in positive_medium if k in t)
-    neg_hits = sum(1 for k in negative_strong if k in t)
-    neg_med_hits = sum(1 for k in negative_medium if k in t)
-
-    score += min(pos_hits, 5) * 0.10
-    score += min(pos_med_hits, 4) * 0.05
-    score -= min(neg_hits, 5) * 0.12
-    score -= min(neg_med_hits, 4) * 0.05
-
-    if any(k in t for k in ["type", "enter", "compile", "summarize", "draft", "respond to emails"]):
-        score += 0.08
-    if any(k in t for k in ["operate heavy", "wiring", "plumbing", "mechanical", "construction site"]):
-        score -= 0.10
-
-    return float(np.clip(score, 0.02, 0.98))
+    # Keyword classes and the compiled one-pass matcher live in keyword_scoring.py.
+    return keyword_scoring.score_task_automatability(task_text)
 
 
 def read_onet() -> pd.DataFrame:
@@ -250,7 +141,7 @@ def read_onet() -> pd.DataFrame:
     task["importance_norm"] = task["importance_norm"].fillna(task["importance_norm"].median())
     task["task_weight"] = (task["importance_norm"] * task["prevalence"]).clip(lower=0.01)
 
-    task["task_auto_score"] = task["task_text"].map(score_task_automatability)
+    task["task_auto_score"] = keyword_scoring.score_series(task["task_text"])
     task["soc_code"] = task["onet_soc_code"].str.extract(r"(\d{2}-\d{4})")
     task = task[task["soc_code"].notna()].copy()
 
@@ -281,9 +172,11 @@ def read_onet() -> pd.DataFrame:
     return occ[["soc_code", "occupation_title", "occupation_exposure", "task_count", "weight_den"]]
 
 
-def read_bls_excel(path: Path) -> pd.DataFrame:
-    df = pd.read_excel(path, dtype=str)
-    return normalize_columns(df)
+def read_bls_excel(path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    return bls_cache.read_bls_table(path, columns=columns)
+
+
+NAT_COLUMNS = ["o_group", "occ_code", "occ_title", "tot_emp"]
 
 
 def resolve_in4_file(year: int) -> Path:
@@ -341,43 +234,24 @@ SECTOR_TITLE = {
 }
 
 
-def read_year_industry_exposure(year: int, occ_exposure: pd.DataFrame) -> pd.DataFrame:
-    df = read_bls_excel(resolve_in4_file(year))
-    # Harmonize fields across years.
-    required = {"naics", "naics_title", "occ_code", "o_group", "tot_emp"}
-    missing = required - set(df.columns)
-    if missing:
-        raise ValueError(f"{year} missing columns: {missing}")
-
-    if "area" in df.columns:
-        df = df[df["area"].astype(str) == "99"]
-
-    d = df[df["o_group"].str.lower() == "detailed"].copy()
-    d = d[d["naics"].astype(str).str.fullmatch(r"\d{6}", na=False)]
-    d["tot_emp"] = to_float(d["tot_emp"])
-    d = d[d["tot_emp"].notna() & (d["tot_emp"] > 0)]
-
-    d = d.merge(occ_exposure[["soc_code", "occupation_exposure"]], left_on="occ_code", right_on="soc_code", how="left")
-    d["occupation_exposure"] = d["occupation_exposure"].fillna(0.0)
-    d["matched_emp"] = np.where(d["occupation_exposure"] > 0, d["tot_emp"], 0.0)
-    d["exposed_emp"] = d["tot_emp"] * d["occupation_exposure"]
-
-    out = (
-        d.groupby(["naics", "naics_title"], as_index=False)
-        .agg(total_emp=("tot_emp", "sum"), matched_emp=("matched_emp", "sum"), exposed_emp=("exposed_emp", "sum"))
-        .assign(
-            year=year,
-            industry_exposure=lambda x: x["exposed_emp"] / x["total_emp"],
-            match_rate=lambda x: x["matched_emp"] / x["total_emp"],
-        )
-    )
+def read_year_industry_exposure(
+    year: int, occ_exposure: pd.DataFrame, timer: Optional[year_aggregation.PhaseTimer] = None
+) -> pd.DataFrame:
+    E = employment_matrix.load(year, resolve_in4_file(year))
+    year_aggregation.lap(timer, "read")
+    out = employment_matrix.industry_exposure(E, occ_exposure)
+    year_aggregation.lap(timer, "matvec")
     out["sector_code"] = out["naics"].map(normalize_sector_code)
     out["sector_title"] = out["sector_code"].map(SECTOR_TITLE).fillna("Unknown")
+    year_aggregation.lap(timer, "sector_map")
     return out
 
 
-def read_year_national_occupation(year: int, occ_exposure: pd.DataFrame) -> pd.DataFrame:
-    df = read_bls_excel(resolve_nat_file(year))
+def read_year_national_occupation(
+    year: int, occ_exposure: pd.DataFrame, timer: Optional[year_aggregation.PhaseTimer] = None
+) -> pd.DataFrame:
+    df = read_bls_excel(resolve_nat_file(year), columns=NAT_COLUMNS)
+    year_aggregation.lap(timer, "read")
     required = {"occ_code", "occ_title", "o_group", "tot_emp"}
     missing = required - set(df.columns)
     if missing:
@@ -386,25 +260,19 @@ def read_year_national_occupation(year: int, occ_exposure: pd.DataFrame) -> pd.D
     d = df[df["o_group"].str.lower() == "detailed"].copy()
     d["tot_emp"] = to_float(d["tot_emp"])
     d = d[d["tot_emp"].notna() & (d["tot_emp"] > 0)]
+    year_aggregation.lap(timer, "filter")
     d = d.merge(occ_exposure[["soc_code", "occupation_exposure", "occupation_title"]], left_on="occ_code", right_on="soc_code", how="left")
     d["occupation_exposure"] = d["occupation_exposure"].fillna(0.0)
     d["occupation_title"] = d["occupation_title"].fillna(d["occ_title"])
     d["exposed_emp"] = d["tot_emp"] * d["occupation_exposure"]
     d["year"] = year
+    year_aggregation.lap(timer, "merge")
     return d[["year", "occ_code", "occupation_title", "tot_emp", "occupation_exposure", "exposed_emp"]]
 
 
-def add_growth(df: pd.DataFrame, id_cols: List[str], value_col: str, years: List[int]) -> pd.DataFrame:
-    wide = df.pivot_table(index=id_cols, columns="year", values=value_col, aggfunc="first").reset_index()
-    y0, y1 = years[0], years[-1]
-    if y0 in wide.columns and y1 in wide.columns:
-        wide[f"{value_col}_chg_{y0}_{y1}"] = wide[y1] - wide[y0]
-        wide[f"{value_col}_pct_{y0}_{y1}"] = (wide[y1] / wide[y0]) - 1.0
-        wide[f"{value_col}_cagr_{y0}_{y1}"] = wide.apply(lambda r: cagr(r[y0], r[y1], y1 - y0), axis=1)
-    prev = years[-2]
-    if prev in wide.columns and y1 in wide.columns:
-        wide[f"{value_col}_yoy_{prev}_{y1}"] = (wide[y1] / wide[prev]) - 1.0
-    return wide
+def add_growth(df: pd.DataFrame, id_cols: List[str], value_col: str, years: List[int], pairwise: bool = False) -> pd.DataFrame:
+    # Whole-column chg/pct/cagr/yoy (and optional all-pairs CAGR); see growth_metrics.py.
+    return growth_metrics.add_growth(df, id_cols, value_col, years, pairwise=pairwise)
 
 
 def format_pct(x: float) -> str:
@@ -542,20 +410,29 @@ def build_report(
     return "\n".join(lines)
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Task-based AI exposure by occupation and industry.")
+    parser.add_argument(
+        "--year-workers",
+        type=int,
+        default=1,
+        help="Processes for the per-year industry/occupation aggregation (1 = sequential, 0 = one per year).",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
+    args = parse_args()
     OUT_DIR.mkdir(parents=True, exist_ok=True)
 
     occ_exposure = read_onet()
     occ_exposure.to_csv(OUT_DIR / "occupation_task_exposure.csv", index=False)
 
-    industry_year = []
-    occ_year = []
-    for year in YEARS:
-        industry_year.append(read_year_industry_exposure(year, occ_exposure))
-        occ_year.append(read_year_national_occupation(year, occ_exposure))
-
-    industry_ts = pd.concat(industry_year, ignore_index=True)
-    occ_ts = pd.concat(occ_year, ignore_index=True)
+    industry_ts, occ_ts, timings = year_aggregation.aggregate_years(
+        YEARS, occ_exposure, read_year_industry_exposure, read_year_national_occupation, workers=args.year_workers
+    )
+    timings.to_csv(OUT_DIR / "aggregation_timings.csv", index=False)
+    print(year_aggregation.format_timings(timings))
 
     sector_ts = (
         industry_ts.groupby(["year", "sector_code", "sector_title"], as_index=False)
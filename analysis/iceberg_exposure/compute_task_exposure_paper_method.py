@@ -13,21 +13,26 @@ text-similarity mapping.
 
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
 import math
 import re
-import string
-import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import shutil
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional
 
 import numpy as np
 import pandas as pd
-import requests
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import linear_kernel
+
+import bls_cache
+import employment_matrix
+import growth_metrics
+import sparse_topk
+import tfidf_cache
+import tool_crawler
+import year_aggregation
 
 
 ROOT = Path(__file__).resolve().parent
@@ -35,11 +40,11 @@ ONET_DIR = ROOT / "data" / "raw" / "onet"
 BLS_DIR = ROOT / "data" / "raw" / "bls"
 OUT_DIR = ROOT / "output"
 INTERIM_DIR = ROOT / "data" / "interim"
+CRAWL_CHECKPOINT_DIR = INTERIM_DIR / "crawl_checkpoints"
+ZAPIER_DETAIL_CACHE = INTERIM_DIR / "zapier_detail_cache.jsonl"
 
 YEARS = [2019, 2020, 2021, 2022, 2023, 2024]
 
-UA = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"}
-
 
 def ensure_dirs() -> None:
     OUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -47,6 +52,8 @@ def ensure_dirs() -> None:
 
 
 def to_float(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float)
     return pd.to_numeric(series.astype(str).str.replace(",", "", regex=False), errors="coerce")
 
 
@@ -64,18 +71,6 @@ def cagr(start: float, end: float, periods: int) -> float:
     return (end / start) ** (1.0 / periods) - 1.0
 
 
-def fetch_json(url: str, params: Optional[Dict] = None, retries: int = 3, sleep_sec: float = 0.5) -> Dict:
-    for i in range(retries):
-        try:
-            r = requests.get(url, params=params, headers=UA, timeout=30)
-            if r.status_code == 200:
-                return r.json()
-        except Exception:
-            pass
-        time.sleep(sleep_sec * (i + 1))
-    raise RuntimeError(f"Failed to fetch JSON after retries: {url}")
-
-
 def clean_text(text: str) -> str:
     if not isinstance(text, str):
         return ""
@@ -87,107 +82,27 @@ def clean_text(text: str) -> str:
     return t
 
 
-def build_zapier_tool_corpus(force_refresh: bool = False, detail_limit: int = 1200) -> pd.DataFrame:
+def build_zapier_tool_corpus(
+    force_refresh: bool = False,
+    detail_limit: Optional[int] = None,
+    detail_max_age_days: float = 30.0,
+    time_budget_sec: Optional[float] = None,
+) -> pd.DataFrame:
     cache = INTERIM_DIR / "tool_corpus_zapier.csv"
     if cache.exists() and not force_refresh:
         return pd.read_csv(cache)
 
-    # 1) Build id from the app directory page.
-    html = requests.get("https://zapier.com/apps", headers=UA, timeout=30).text
-    m = re.search(r"_next/static/([^/]+)/_buildManifest\.js", html)
-    if not m:
-        raise RuntimeError("Cannot parse Zapier build id from /apps page.")
-    build_id = m.group(1)
-    base = f"https://nextplore.vercel.zapier-deployment.com/_next/data/{build_id}/find-apps"
-
-    # 2) Crawl index pages (a-z + 0-9) to get slugs.
-    index_entries: List[Tuple[str, str, str]] = []
-    letters = list(string.ascii_lowercase) + ["0-9"]
-    for s in letters:
-        data = fetch_json(f"{base}/{s}.json")
-        items = data.get("pageProps", {}).get("linkColumnItems", [])
-        for it in items:
-            href = str(it.get("href", ""))
-            parts = href.strip("/").split("/")
-            if len(parts) >= 3 and parts[0] == "find-apps":
-                starts_with, slug = parts[1], parts[2]
-                label = str(it.get("label", "")).strip()
-                if slug:
-                    index_entries.append((starts_with, slug, label))
-
-    idx_df = pd.DataFrame(index_entries, columns=["starts_with", "slug", "label"]).drop_duplicates("slug")
-    if idx_df.empty:
-        raise RuntimeError("Zapier index crawl produced no tools.")
-
-    # 3) Fetch detail JSON for a subset of slugs (for speed), keep all names.
-    # We still keep the full Zapier app universe via index labels.
-    results: List[Dict] = []
-
-    def fetch_one(row: Tuple[str, str, str]) -> Optional[Dict]:
-        starts_with, slug, label = row
-        url = f"{base}/{starts_with}/{slug}.json"
-        for i in range(3):
-            try:
-                obj = fetch_json(url, retries=1)
-                app = obj.get("pageProps", {}).get("app", {})
-                name = str(app.get("name", label)).strip() or label
-                desc = str(app.get("description", "")).strip()
-                return {
-                    "source": "zapier",
-                    "tool_id": str(app.get("id", slug)),
-                    "tool_name": name,
-                    "slug": slug,
-                    "headline": "",
-                    "description": desc,
-                    "tags": "",
-                    "tool_url": f"https://zapier.com/apps/{slug}/integrations",
-                }
-            except Exception:
-                time.sleep(0.2 * (i + 1))
-        # fallback to index label only
-        return {
-            "source": "zapier",
-            "tool_id": slug,
-            "tool_name": label,
-            "slug": slug,
-            "headline": "",
-            "description": "",
-            "tags": "",
-            "tool_url": f"https://zapier.com/apps/{slug}/integrations",
-        }
-
-    rows = list(idx_df[["starts_with", "slug", "label"]].itertuples(index=False, name=None))
-    detail_rows = rows[: min(detail_limit, len(rows))]
-    with ThreadPoolExecutor(max_workers=20) as pool:
-        futs = [pool.submit(fetch_one, r) for r in detail_rows]
-        for i, fut in enumerate(as_completed(futs), 1):
-            res = fut.result()
-            if res is not None:
-                results.append(res)
-            if i % 500 == 0:
-                print(f"[zapier] fetched detail {i}/{len(detail_rows)}")
-
-    out = pd.DataFrame(results).drop_duplicates(["source", "slug"])
-    existing_slugs = set(out["slug"].tolist())
-    fallback_rows: List[Dict] = []
-    for starts_with, slug, label in rows:
-        if slug in existing_slugs:
-            continue
-        fallback_rows.append(
-            {
-                "source": "zapier",
-                "tool_id": slug,
-                "tool_name": label,
-                "slug": slug,
-                "headline": "",
-                "description": "",
-                "tags": "",
-                "tool_url": f"https://zapier.com/apps/{slug}/integrations",
-            }
-        )
-    if fallback_rows:
-        out = pd.concat([out, pd.DataFrame(fallback_rows)], ignore_index=True)
-
+    # Full app universe with details; per-app records live in an append-only cache
+    # so re-crawls only fetch apps that are new or older than detail_max_age_days.
+    rows = tool_crawler.run(
+        tool_crawler.crawl_zapier,
+        CRAWL_CHECKPOINT_DIR,
+        detail_cache_path=ZAPIER_DETAIL_CACHE,
+        detail_limit=detail_limit,
+        max_age_days=detail_max_age_days,
+        time_budget_sec=time_budget_sec,
+    )
+    out = pd.DataFrame(rows).drop_duplicates(["source", "slug"])
     out.to_csv(cache, index=False)
     return out
 
@@ -197,37 +112,7 @@ def build_opentools_corpus(force_refresh: bool = False) -> pd.DataFrame:
     if cache.exists() and not force_refresh:
         return pd.read_csv(cache)
 
-    rows: List[Dict] = []
-    limit = 1000
-    offset = 0
-    total = None
-    while True:
-        obj = fetch_json("https://opentools.ai/api/tools", params={"offset": offset, "limit": limit})
-        data = obj.get("data", [])
-        total = obj.get("total", total)
-        for it in data:
-            tags = it.get("tags", [])
-            if isinstance(tags, list):
-                tags_s = ", ".join(str(x) for x in tags if isinstance(x, str))
-            else:
-                tags_s = str(tags)
-            rows.append(
-                {
-                    "source": "opentools",
-                    "tool_id": str(it.get("id", "")),
-                    "tool_name": str(it.get("tool_name", "")).strip(),
-                    "slug": str(it.get("slug", "")).strip(),
-                    "headline": str(it.get("headline", "")).strip(),
-                    "description": str(it.get("summary", "") or it.get("description", "")).strip(),
-                    "tags": tags_s,
-                    "tool_url": str(it.get("tool_url", "")),
-                }
-            )
-        offset = obj.get("nextOffset")
-        print(f"[opentools] collected {len(rows)} / {total if total is not None else '?'}")
-        if not obj.get("hasNextPage") or offset is None:
-            break
-
+    rows = tool_crawler.run(tool_crawler.crawl_opentools, CRAWL_CHECKPOINT_DIR)
     out = pd.DataFrame(rows).drop_duplicates(["source", "tool_id"])
     out.to_csv(cache, index=False)
     return out
@@ -245,8 +130,7 @@ def build_mcp_corpus(force_refresh: bool = False) -> pd.DataFrame:
             print("[mcp] cached corpus file is empty, refreshing from source...")
 
     # Public MCP server list from official repo README.
-    url = "https://raw.githubusercontent.com/modelcontextprotocol/servers/main/README.md"
-    txt = requests.get(url, headers=UA, timeout=30).text
+    txt = tool_crawler.run(tool_crawler.fetch_mcp_readme)
     rows: List[Dict] = []
     for line in txt.splitlines():
         s = line.strip()
@@ -295,8 +179,8 @@ def build_mcp_corpus(force_refresh: bool = False) -> pd.DataFrame:
     return out
 
 
-def build_tool_corpus(force_refresh: bool = False) -> pd.DataFrame:
-    z = build_zapier_tool_corpus(force_refresh=force_refresh)
+def build_tool_corpus(force_refresh: bool = False, crawl_budget_sec: Optional[float] = None) -> pd.DataFrame:
+    z = build_zapier_tool_corpus(force_refresh=force_refresh, time_budget_sec=crawl_budget_sec)
     o = build_opentools_corpus(force_refresh=force_refresh)
     m = build_mcp_corpus(force_refresh=force_refresh)
 
@@ -402,34 +286,35 @@ def read_onet_task_data() -> pd.DataFrame:
     return task, occ_title
 
 
-def map_tools_to_tasks(task_df: pd.DataFrame, tools_df: pd.DataFrame) -> pd.DataFrame:
-    # Vectorize on combined corpus.
-    tool_texts = tools_df["tool_text"].fillna("").astype(str).tolist()
-    task_texts = task_df["task_text_clean"].fillna("").astype(str).tolist()
+TOOL_TFIDF_PARAMS = {
+    "stop_words": "english",
+    "ngram_range": (1, 2),
+    "min_df": 2,
+    "max_features": 200000,
+}
 
-    vectorizer = TfidfVectorizer(
-        stop_words="english",
-        ngram_range=(1, 2),
-        min_df=2,
-        max_features=200000,
-    )
-    vectorizer.fit(tool_texts + task_texts)
-    X_tools = vectorizer.transform(tool_texts)
-    X_tasks = vectorizer.transform(task_texts)
-
-    max_sim = np.zeros(X_tasks.shape[0], dtype=np.float32)
-    top_idx = np.zeros(X_tasks.shape[0], dtype=np.int32)
-    batch_size = 400
-    for start in range(0, X_tasks.shape[0], batch_size):
-        end = min(start + batch_size, X_tasks.shape[0])
-        sims = linear_kernel(X_tasks[start:end], X_tools)  # dense ndarray
-        idx = sims.argmax(axis=1)
-        vals = sims[np.arange(sims.shape[0]), idx]
-        max_sim[start:end] = vals.astype(np.float32)
-        top_idx[start:end] = idx.astype(np.int32)
-        if start % 4000 == 0:
-            print(f"[mapping] processed tasks {start}/{X_tasks.shape[0]}")
+# Frozen vectorizer + last tool snapshot + per-task top-1 scores for incremental refreshes.
+MAPPING_STATE_DIR = INTERIM_DIR / "tool_mapping_state"
+
+
+def tool_keys(tools_df: pd.DataFrame) -> pd.Series:
+    """Stable identity of a tool across crawls: source + name.
 
+    A repeated (source, name) pair is told apart by a hash of its text rather than
+    its row order, so a reordered crawl does not look like modified tools; rows
+    that repeat the text as well are numbered.
+    """
+    base_key = tools_df["source"].fillna("").astype(str) + "|" + tools_df["tool_name"].fillna("").astype(str)
+    repeated = base_key.duplicated(keep=False)
+    text = tools_df["tool_text"].fillna("").astype(str)
+    text_hash = text[repeated].map(lambda t: hashlib.sha1(t.encode("utf-8")).hexdigest()[:12])
+    key = base_key.copy()
+    key[repeated] = base_key[repeated] + "#" + text_hash
+    dup = key.groupby(key).cumcount()
+    return key.where(dup == 0, key + "#" + dup.astype(str))
+
+
+def similarity_to_auto_score(max_sim: np.ndarray) -> np.ndarray:
     # Convert similarity to capability score (distribution-calibrated).
     p10 = np.nanpercentile(max_sim, 10)
     p90 = np.nanpercentile(max_sim, 90)
@@ -437,18 +322,177 @@ def map_tools_to_tasks(task_df: pd.DataFrame, tools_df: pd.DataFrame) -> pd.Data
     auto = (max_sim - p10) / denom
     auto = np.clip(auto, 0.0, 1.0)
     auto = np.maximum(auto, 0.02)
+    return auto
 
+
+def assemble_task_mapping(task_df: pd.DataFrame, tools_df: pd.DataFrame, max_sim: np.ndarray, top_idx: np.ndarray) -> pd.DataFrame:
     out = task_df.copy()
     out["tool_similarity"] = max_sim
-    out["task_auto_score"] = auto
+    out["task_auto_score"] = similarity_to_auto_score(max_sim)
     out["top_tool_idx"] = top_idx
     out["top_tool_name"] = tools_df.iloc[top_idx]["tool_name"].values
     out["top_tool_source"] = tools_df.iloc[top_idx]["source"].values
     return out
 
 
-def read_bls_excel(path: Path) -> pd.DataFrame:
-    return normalize_columns(pd.read_excel(path, dtype=str))
+def task_texts_fingerprint(task_df: pd.DataFrame) -> str:
+    keys = (task_df["onet_soc_code"].astype(str) + "|" + task_df["task_id"].astype(str)).tolist()
+    texts = task_df["task_text_clean"].fillna("").astype(str).tolist()
+    return tfidf_cache.corpus_fingerprint({}, keys, {"tasks": texts})
+
+
+def save_mapping_state(
+    task_df: pd.DataFrame,
+    tools_df: pd.DataFrame,
+    vectorizer,
+    max_sim: np.ndarray,
+    top_idx: np.ndarray,
+    state_dir: Path = MAPPING_STATE_DIR,
+) -> None:
+    tmp = state_dir.parent / f".{state_dir.name}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tfidf_cache.save_vectorizer(tmp, vectorizer)
+    keys = tool_keys(tools_df)
+    pd.DataFrame({"tool_key": keys.values, "tool_text": tools_df["tool_text"].fillna("").astype(str).values}).to_csv(
+        tmp / "tools_snapshot.csv", index=False
+    )
+    pd.DataFrame(
+        {
+            "onet_soc_code": task_df["onet_soc_code"].values,
+            "task_id": task_df["task_id"].values,
+            "tool_similarity": max_sim,
+            "top_tool_key": keys.values[top_idx],
+        }
+    ).to_csv(tmp / "task_scores.csv", index=False)
+    meta = {
+        "params": json.loads(json.dumps(TOOL_TFIDF_PARAMS, default=list)),
+        "task_fingerprint": task_texts_fingerprint(task_df),
+        "n_tools": int(len(tools_df)),
+        "n_tasks": int(len(task_df)),
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    }
+    (tmp / "meta.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    shutil.rmtree(state_dir, ignore_errors=True)
+    tmp.rename(state_dir)
+
+
+def map_tools_to_tasks(
+    task_df: pd.DataFrame,
+    tools_df: pd.DataFrame,
+    workers: int = 1,
+    save_state: bool = False,
+    state_dir: Path = MAPPING_STATE_DIR,
+) -> pd.DataFrame:
+    # Vectorize on combined corpus.
+    tool_texts = tools_df["tool_text"].fillna("").astype(str).tolist()
+    task_texts = task_df["task_text_clean"].fillna("").astype(str).tolist()
+
+    tfidf = tfidf_cache.fit_transform_cached(TOOL_TFIDF_PARAMS, tool_texts + task_texts, {"tools": tool_texts, "tasks": task_texts})
+    X_tools = tfidf.matrices["tools"]
+    X_tasks = tfidf.matrices["tasks"]
+
+    # Sparse top-1 retrieval; identical to argmax over dense linear_kernel batches.
+    # workers=1 keeps the sequential reference path; otherwise task rows are sharded
+    # across a process pool (0 = all cores) with identical results.
+    if workers == 1:
+        idx, vals = sparse_topk.topk(X_tasks, X_tools, k=1, progress_label="[mapping] processed tasks")
+    else:
+        idx, vals = sparse_topk.parallel_topk(X_tasks, X_tools, k=1, workers=workers, progress_label="[mapping] processed tasks")
+    max_sim = vals[:, 0].astype(np.float32)
+    top_idx = idx[:, 0].astype(np.int32)
+
+    if save_state:
+        save_mapping_state(task_df, tools_df, tfidf.vectorizer, max_sim, top_idx, state_dir=state_dir)
+    return assemble_task_mapping(task_df, tools_df, max_sim, top_idx)
+
+
+def map_tools_to_tasks_incremental(
+    task_df: pd.DataFrame, tools_df: pd.DataFrame, workers: int = 1, state_dir: Path = MAPPING_STATE_DIR
+) -> pd.DataFrame:
+    """Update the previous task mapping with only the tools that changed since the last run.
+
+    The vectorizer (vocabulary + IDF) is frozen at the last full run, so unchanged
+    tools keep their vectors and their scores stay valid. Only added/modified tools
+    are scored against all tasks; tasks whose current top tool was removed or
+    modified are re-scored against the full corpus. New vocabulary in changed tools
+    is ignored until the next full run, which refits the space.
+    Falls back to a full ``map_tools_to_tasks`` when no usable state exists or the
+    task set changed.
+    """
+    meta_path = state_dir / "meta.json"
+    if not meta_path.exists():
+        print("[incremental] no previous mapping state; running full mapping")
+        return map_tools_to_tasks(task_df, tools_df, workers=workers, save_state=True, state_dir=state_dir)
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    if meta.get("task_fingerprint") != task_texts_fingerprint(task_df):
+        print("[incremental] task set changed since last mapping; running full mapping")
+        return map_tools_to_tasks(task_df, tools_df, workers=workers, save_state=True, state_dir=state_dir)
+
+    prev_tools = pd.read_csv(state_dir / "tools_snapshot.csv", dtype=str, keep_default_na=False)
+    prev_scores = pd.read_csv(state_dir / "task_scores.csv", dtype={"onet_soc_code": str, "task_id": str, "top_tool_key": str}, keep_default_na=False)
+    vec = tfidf_cache.load_vectorizer(state_dir, TOOL_TFIDF_PARAMS)
+
+    keys = tool_keys(tools_df)
+    tool_texts = tools_df["tool_text"].fillna("").astype(str)
+    prev_text = dict(zip(prev_tools["tool_key"], prev_tools["tool_text"]))
+    cur_text = dict(zip(keys, tool_texts))
+    is_new = ~keys.isin(prev_text.keys())
+    is_modified = ~is_new & (tool_texts.values != keys.map(prev_text).values)
+    changed_pos = np.flatnonzero((is_new | is_modified).values)
+    invalid_keys = {k for k in prev_text if k not in cur_text} | set(keys[is_modified.values])
+
+    # Align previous per-task scores to the current task order.
+    prev_scores = task_df[["onet_soc_code", "task_id"]].merge(prev_scores, on=["onet_soc_code", "task_id"], how="left")
+    max_sim = prev_scores["tool_similarity"].to_numpy(dtype=np.float32, copy=True)
+    key_to_pos = pd.Series(np.arange(len(keys)), index=keys.values)
+    stale = prev_scores["top_tool_key"].isin(invalid_keys).to_numpy() | prev_scores["top_tool_key"].isna().to_numpy()
+    top_idx = np.zeros(len(task_df), dtype=np.int32)
+    top_idx[~stale] = key_to_pos.reindex(prev_scores.loc[~stale, "top_tool_key"]).to_numpy()
+
+    n_removed = len(set(prev_text) - set(cur_text))
+    print(
+        f"[incremental] tools: {int(is_new.sum())} added, {int(is_modified.sum())} modified, {n_removed} removed; "
+        f"{int(stale.sum())} tasks lost their top tool"
+    )
+
+    task_texts = task_df["task_text_clean"].fillna("").astype(str).tolist()
+    X_tasks = vec.transform(task_texts).tocsr()
+
+    # Tasks whose top tool disappeared or changed: re-score against the full current corpus.
+    stale_rows = np.flatnonzero(stale)
+    if len(stale_rows):
+        X_tools = vec.transform(tool_texts.tolist()).tocsr()
+        idx, vals = sparse_topk.topk(X_tasks[stale_rows], X_tools, k=1)
+        max_sim[stale_rows] = vals[:, 0].astype(np.float32)
+        top_idx[stale_rows] = idx[:, 0].astype(np.int32)
+
+    # Remaining tasks: only the added/modified tools can beat the current top tool.
+    fresh_rows = np.flatnonzero(~stale)
+    if len(changed_pos) and len(fresh_rows):
+        X_changed = vec.transform(tool_texts.iloc[changed_pos].tolist()).tocsr()
+        if workers == 1:
+            idx, vals = sparse_topk.topk(X_tasks[fresh_rows], X_changed, k=1, progress_label="[incremental] processed tasks")
+        else:
+            idx, vals = sparse_topk.parallel_topk(X_tasks[fresh_rows], X_changed, k=1, workers=workers, progress_label="[incremental] processed tasks")
+        cand_sim = vals[:, 0].astype(np.float32)
+        cand_idx = changed_pos[idx[:, 0]]
+        # Ties go to the lower tool position, as argmax over the full corpus would.
+        cur_sim = max_sim[fresh_rows]
+        better = (cand_sim > cur_sim) | ((cand_sim == cur_sim) & (cand_idx < top_idx[fresh_rows]))
+        max_sim[fresh_rows[better]] = cand_sim[better]
+        top_idx[fresh_rows[better]] = cand_idx[better]
+        print(f"[incremental] {int(better.sum())} tasks picked up a new top tool")
+
+    save_mapping_state(task_df, tools_df, vec, max_sim, top_idx, state_dir=state_dir)
+    return assemble_task_mapping(task_df, tools_df, max_sim, top_idx)
+
+
+def read_bls_excel(path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    # Served from the typed Parquet copy after the first parse (see bls_cache.py).
+    return bls_cache.read_bls_table(path, columns=columns)
+
+
+NAT_COLUMNS = ["o_group", "occ_code", "occ_title", "tot_emp"]
 
 
 def resolve_in4_file(year: int) -> Path:
@@ -517,58 +561,40 @@ def build_occupation_exposure(task_with_auto: pd.DataFrame, occ_title: pd.DataFr
     return occ[["soc_code", "occupation_title", "occupation_exposure", "task_count", "weight_den"]]
 
 
-def read_year_industry_exposure(year: int, occ_exposure: pd.DataFrame) -> pd.DataFrame:
-    df = read_bls_excel(resolve_in4_file(year))
-    d = df[df["o_group"].str.lower() == "detailed"].copy()
-    if "area" in d.columns:
-        d = d[d["area"].astype(str) == "99"]
-    d = d[d["naics"].astype(str).str.fullmatch(r"\d{6}", na=False)]
-    d["tot_emp"] = to_float(d["tot_emp"])
-    d = d[d["tot_emp"].notna() & (d["tot_emp"] > 0)]
-
-    d = d.merge(occ_exposure[["soc_code", "occupation_exposure"]], left_on="occ_code", right_on="soc_code", how="left")
-    d["occupation_exposure"] = d["occupation_exposure"].fillna(0.0)
-    d["exposed_emp"] = d["tot_emp"] * d["occupation_exposure"]
-    d["matched_emp"] = np.where(d["occupation_exposure"] > 0, d["tot_emp"], 0.0)
-
-    out = (
-        d.groupby(["naics", "naics_title"], as_index=False)
-        .agg(total_emp=("tot_emp", "sum"), matched_emp=("matched_emp", "sum"), exposed_emp=("exposed_emp", "sum"))
-        .assign(
-            year=year,
-            industry_exposure=lambda x: x["exposed_emp"] / x["total_emp"],
-            match_rate=lambda x: x["matched_emp"] / x["total_emp"],
-        )
-    )
+def read_year_industry_exposure(
+    year: int, occ_exposure: pd.DataFrame, timer: Optional[year_aggregation.PhaseTimer] = None
+) -> pd.DataFrame:
+    E = employment_matrix.load(year, resolve_in4_file(year))
+    year_aggregation.lap(timer, "read")
+    out = employment_matrix.industry_exposure(E, occ_exposure)
+    year_aggregation.lap(timer, "matvec")
     out["sector_code"] = out["naics"].map(normalize_sector_code)
     out["sector_title"] = out["sector_code"].map(SECTOR_TITLE).fillna("Unknown")
+    year_aggregation.lap(timer, "sector_map")
     return out
 
 
-def read_year_national_occupation(year: int, occ_exposure: pd.DataFrame) -> pd.DataFrame:
-    df = read_bls_excel(resolve_nat_file(year))
+def read_year_national_occupation(
+    year: int, occ_exposure: pd.DataFrame, timer: Optional[year_aggregation.PhaseTimer] = None
+) -> pd.DataFrame:
+    df = read_bls_excel(resolve_nat_file(year), columns=NAT_COLUMNS)
+    year_aggregation.lap(timer, "read")
     d = df[df["o_group"].str.lower() == "detailed"].copy()
     d["tot_emp"] = to_float(d["tot_emp"])
     d = d[d["tot_emp"].notna() & (d["tot_emp"] > 0)]
+    year_aggregation.lap(timer, "filter")
     d = d.merge(occ_exposure[["soc_code", "occupation_exposure", "occupation_title"]], left_on="occ_code", right_on="soc_code", how="left")
     d["occupation_exposure"] = d["occupation_exposure"].fillna(0.0)
     d["occupation_title"] = d["occupation_title"].fillna(d["occ_title"])
     d["exposed_emp"] = d["tot_emp"] * d["occupation_exposure"]
     d["year"] = year
+    year_aggregation.lap(timer, "merge")
     return d[["year", "occ_code", "occupation_title", "tot_emp", "occupation_exposure", "exposed_emp"]]
 
 
-def add_growth(df: pd.DataFrame, id_cols: List[str], value_col: str, years: List[int]) -> pd.DataFrame:
-    wide = df.pivot_table(index=id_cols, columns="year", values=value_col, aggfunc="first").reset_index()
-    y0, y1 = years[0], years[-1]
-    if y0 in wide.columns and y1 in wide.columns:
-        wide[f"{value_col}_chg_{y0}_{y1}"] = wide[y1] - wide[y0]
-        wide[f"{value_col}_pct_{y0}_{y1}"] = (wide[y1] / wide[y0]) - 1.0
-        wide[f"{value_col}_cagr_{y0}_{y1}"] = wide.apply(lambda r: cagr(r[y0], r[y1], y1 - y0), axis=1)
-    prev = years[-2]
-    if prev in wide.columns and y1 in wide.columns:
-        wide[f"{value_col}_yoy_{prev}_{y1}"] = (wide[y1] / wide[prev]) - 1.0
-    return wide
+def add_growth(df: pd.DataFrame, id_cols: List[str], value_col: str, years: List[int], pairwise: bool = False) -> pd.DataFrame:
+    # Whole-column chg/pct/cagr/yoy (and optional all-pairs CAGR); see growth_metrics.py.
+    return growth_metrics.add_growth(df, id_cols, value_col, years, pairwise=pairwise)
 
 
 def format_pct(x: float) -> str:
@@ -743,18 +769,56 @@ def build_report(
     return "\n".join(lines)
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Paper-style task exposure computation.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes for task-tool similarity scoring (1 = sequential, 0 = all cores).",
+    )
+    parser.add_argument(
+        "--year-workers",
+        type=int,
+        default=1,
+        help="Processes for the per-year industry/occupation aggregation (1 = sequential, 0 = one per year).",
+    )
+    parser.add_argument(
+        "--refresh-tools",
+        action="store_true",
+        help="Re-crawl the tool catalogs instead of using the cached corpus.",
+    )
+    parser.add_argument(
+        "--crawl-budget-min",
+        type=float,
+        default=None,
+        help="Wall-clock budget for the Zapier detail crawl; unfetched apps keep cached/label-only records.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only score tools added/changed since the last run (frozen TF-IDF space); a full run refits it.",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
+    args = parse_args()
     ensure_dirs()
 
     print("[1/6] Build tool corpus...")
-    tools = build_tool_corpus(force_refresh=False)
+    crawl_budget_sec = None if args.crawl_budget_min is None else args.crawl_budget_min * 60.0
+    tools = build_tool_corpus(force_refresh=args.refresh_tools, crawl_budget_sec=crawl_budget_sec)
     tools.to_csv(OUT_DIR / "tool_corpus_all.csv", index=False)
 
     print("[2/6] Read O*NET tasks and weights...")
     task_df, occ_title = read_onet_task_data()
 
     print("[3/6] Map tools to tasks (similarity)...")
-    task_auto = map_tools_to_tasks(task_df, tools)
+    if args.incremental:
+        task_auto = map_tools_to_tasks_incremental(task_df, tools, workers=args.workers)
+    else:
+        task_auto = map_tools_to_tasks(task_df, tools, workers=args.workers, save_state=True)
     task_auto[["soc_code", "task_id", "task_text", "task_auto_score", "tool_similarity", "top_tool_name", "top_tool_source"]].head(5000).to_csv(
         OUT_DIR / "task_tool_mapping_sample.csv", index=False
     )
@@ -764,14 +828,11 @@ def main() -> None:
     occ_exposure.to_csv(OUT_DIR / "occupation_task_exposure.csv", index=False)
 
     print("[5/6] Build industry and occupation time series...")
-    industry_year = []
-    occ_year = []
-    for y in YEARS:
-        industry_year.append(read_year_industry_exposure(y, occ_exposure))
-        occ_year.append(read_year_national_occupation(y, occ_exposure))
-
-    industry_ts = pd.concat(industry_year, ignore_index=True)
-    occ_ts = pd.concat(occ_year, ignore_index=True)
+    industry_ts, occ_ts, timings = year_aggregation.aggregate_years(
+        YEARS, occ_exposure, read_year_industry_exposure, read_year_national_occupation, workers=args.year_workers
+    )
+    timings.to_csv(OUT_DIR / "aggregation_timings.csv", index=False)
+    print(year_aggregation.format_timings(timings))
 
     sector_ts = (
         industry_ts.groupby(["year", "sector_code", "sector_title"], as_index=False)
@@ -19,10 +19,10 @@ from typing import Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import linear_kernel
 
 import compute_task_exposure_paper_method as base
+import sparse_topk
+import tfidf_cache
 
 
 ROOT = Path(__file__).resolve().parent
@@ -34,35 +34,15 @@ def map_tools_to_tasks_strict(task_df: pd.DataFrame, tools_df: pd.DataFrame) ->
     tool_texts = tools_df["tool_text"].fillna("").astype(str).tolist()
     task_texts = task_df["task_text_clean"].fillna("").astype(str).tolist()
 
-    vec = TfidfVectorizer(stop_words="english", ngram_range=(1, 2), min_df=2, max_features=200000)
-    vec.fit(tool_texts + task_texts)
-    x_tools = vec.transform(tool_texts)
-    x_tasks = vec.transform(task_texts)
-
-    n = x_tasks.shape[0]
-    s1 = np.zeros(n, dtype=np.float32)
-    s2 = np.zeros(n, dtype=np.float32)
-    s3 = np.zeros(n, dtype=np.float32)
-    top_idx = np.zeros((n, 3), dtype=np.int32)
-
-    batch = 400
-    k = 3
-    for start in range(0, n, batch):
-        end = min(start + batch, n)
-        sims = linear_kernel(x_tasks[start:end], x_tools)
-        idx_part = np.argpartition(sims, -k, axis=1)[:, -k:]
-        vals_part = np.take_along_axis(sims, idx_part, axis=1)
-        order = np.argsort(vals_part, axis=1)[:, ::-1]
-        idx = np.take_along_axis(idx_part, order, axis=1)
-        vals = np.take_along_axis(vals_part, order, axis=1)
-
-        s1[start:end] = vals[:, 0].astype(np.float32)
-        s2[start:end] = vals[:, 1].astype(np.float32)
-        s3[start:end] = vals[:, 2].astype(np.float32)
-        top_idx[start:end] = idx.astype(np.int32)
-
-        if start % 4000 == 0:
-            print(f"[strict mapping] processed tasks {start}/{n}")
+    tfidf = tfidf_cache.fit_transform_cached(base.TOOL_TFIDF_PARAMS, tool_texts + task_texts, {"tools": tool_texts, "tasks": task_texts})
+    x_tools = tfidf.matrices["tools"]
+    x_tasks = tfidf.matrices["tasks"]
+
+    idx, vals = sparse_topk.topk(x_tasks, x_tools, k=3, progress_label="[strict mapping] processed tasks")
+    s1 = vals[:, 0].astype(np.float32)
+    s2 = vals[:, 1].astype(np.float32)
+    s3 = vals[:, 2].astype(np.float32)
+    top_idx = idx.astype(np.int32)
 
     p80 = float(np.nanpercentile(s1, 80))
     p95 = float(np.nanpercentile(s1, 95))
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Occupation x industry employment matrices from OEWS nat4d workbooks.
+
+Every risk script used to re-filter the nat4d detail and merge it with an
+occupation vector on ``occ_code`` for each year (and each model). Here the
+filtered detail (detailed occupations, national area, 6-digit NAICS, positive
+employment) is pivoted once per year into a sparse matrix
+
+    E[year]: (n_occ x n_industry) employment, rows = SOC codes, columns = (NAICS, title)
+
+and persisted as ``E_<year>.npz`` plus an index file with the aligned SOC and
+NAICS vectors. Industry totals, exposure and risk then become ``E.T @ v``.
+Entries are validated against the source workbook with the same policy as the
+Parquet cache (``bls_cache.source_unchanged``: resolved path, size/mtime, then sha256).
+
+CLI (build every year found under data/raw/bls):
+    python employment_matrix.py [--years 2019 2024] [--force]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+import bls_cache
+
+
+ROOT = Path(__file__).resolve().parent
+CACHE_DIR = ROOT / "data" / "interim" / "employment_matrix"
+
+SCHEMA_VERSION = 1
+IN4_COLUMNS = ["o_group", "area", "naics", "naics_title", "occ_code", "tot_emp"]
+REQUIRED_COLUMNS = {"naics", "naics_title", "occ_code", "o_group", "tot_emp"}
+
+
+@dataclass
+class EmploymentMatrix:
+    year: int
+    matrix: sp.csr_matrix  # (n_occ, n_industry)
+    soc_codes: np.ndarray  # (n_occ,) sorted
+    naics: np.ndarray  # (n_industry,) sorted by (naics, naics_title)
+    naics_titles: np.ndarray  # (n_industry,) "" when the workbook has no title
+
+    def align(self, values: pd.Series, fill: float = 0.0) -> np.ndarray:
+        """Per-row vector from a Series indexed by SOC code (missing -> ``fill``)."""
+        pos = pd.Index(values.index.astype(str)).get_indexer(self.soc_codes)
+        v = values.to_numpy(dtype=np.float64)
+        out = np.full(len(self.soc_codes), fill, dtype=np.float64)
+        out[pos >= 0] = v[pos[pos >= 0]]
+        return np.where(np.isnan(out), fill, out)
+
+    def industry_totals(self, occ_vector: Optional[np.ndarray] = None) -> np.ndarray:
+        """``E.T @ occ_vector`` (``E.T @ 1`` when omitted)."""
+        if occ_vector is None:
+            return np.asarray(self.matrix.sum(axis=0)).ravel()
+        return self.matrix.T @ occ_vector
+
+    def columns(self) -> pd.DataFrame:
+        return pd.DataFrame({"naics": self.naics, "naics_title": self.naics_titles})
+
+
+def _paths(year: int, cache_dir: Path) -> Tuple[Path, Path, Path]:
+    return cache_dir / f"E_{year}.npz", cache_dir / f"E_{year}.index.npz", cache_dir / f"E_{year}.meta.json"
+
+
+def filter_detail(df: pd.DataFrame, year: int) -> pd.DataFrame:
+    """Detailed occupations x 6-digit NAICS, national area, positive employment."""
+    missing = REQUIRED_COLUMNS - set(df.columns)
+    if missing:
+        raise ValueError(f"{year} missing columns: {missing}")
+    if "area" in df.columns:
+        df = df[df["area"].astype(str) == "99"]
+    d = df[df["o_group"].str.lower() == "detailed"].copy()
+    d = d[d["naics"].astype(str).str.fullmatch(r"\d{6}", na=False)]
+    d["tot_emp"] = pd.to_numeric(d["tot_emp"], errors="coerce")
+    return d[d["tot_emp"].notna() & (d["tot_emp"] > 0)]
+
+
+def build(year: int, in4_path: Path) -> EmploymentMatrix:
+    d = filter_detail(bls_cache.read_bls_table(in4_path, columns=IN4_COLUMNS), year)
+    occ_idx, soc_codes = pd.factorize(d["occ_code"].astype(str), sort=True)
+    cols = pd.MultiIndex.from_arrays([d["naics"].astype(str), d["naics_title"].fillna("").astype(str)])
+    col_idx, col_keys = cols.factorize(sort=True)
+    matrix = sp.csr_matrix(
+        (d["tot_emp"].to_numpy(dtype=np.float64), (occ_idx, col_idx)), shape=(len(soc_codes), len(col_keys))
+    )
+    matrix.sum_duplicates()
+    return EmploymentMatrix(
+        year=int(year),
+        matrix=matrix,
+        soc_codes=np.asarray(soc_codes, dtype=str),
+        naics=np.asarray(col_keys.get_level_values(0), dtype=str),
+        naics_titles=np.asarray(col_keys.get_level_values(1), dtype=str),
+    )
+
+
+def save(E: EmploymentMatrix, in4_path: Path, cache_dir: Path = CACHE_DIR) -> None:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    m_path, idx_path, meta_path = _paths(E.year, cache_dir)
+    sp.save_npz(m_path, E.matrix, compressed=True)
+    np.savez(idx_path, soc_codes=E.soc_codes, naics=E.naics, naics_titles=E.naics_titles)
+    meta = {"schema_version": SCHEMA_VERSION, "year": E.year, "shape": list(E.matrix.shape), **bls_cache.source_meta(in4_path)}
+    meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+
+def _is_valid(year: int, in4_path: Path, cache_dir: Path) -> bool:
+    m_path, idx_path, meta_path = _paths(year, cache_dir)
+    if not (m_path.exists() and idx_path.exists() and meta_path.exists()):
+        return False
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    return meta.get("schema_version") == SCHEMA_VERSION and bls_cache.source_unchanged(in4_path, meta, meta_path)
+
+
+def load(year: int, in4_path: Path, cache_dir: Path = CACHE_DIR, use_cache: bool = True) -> EmploymentMatrix:
+    """E[year] from the npz cache, building (and caching) it from ``in4_path`` when stale."""
+    if use_cache and _is_valid(year, in4_path, cache_dir):
+        m_path, idx_path, _ = _paths(year, cache_dir)
+        idx = np.load(idx_path, allow_pickle=False)
+        return EmploymentMatrix(
+            year=int(year),
+            matrix=sp.load_npz(m_path).tocsr(),
+            soc_codes=idx["soc_codes"],
+            naics=idx["naics"],
+            naics_titles=idx["naics_titles"],
+        )
+    E = build(year, in4_path)
+    if use_cache:
+        save(E, in4_path, cache_dir)
+    return E
+
+
+def industry_exposure(E: EmploymentMatrix, occ_exposure: pd.DataFrame) -> pd.DataFrame:
+    """Per-(naics, naics_title) total / matched / exposed employment for an exposure table.
+
+    Same columns and row order as the former merge + groupby; industries
+    without a title are dropped, as the groupby did.
+    """
+    e = E.align(occ_exposure.set_index("soc_code")["occupation_exposure"])
+    out = E.columns()
+    out["total_emp"] = E.industry_totals()
+    out["matched_emp"] = E.industry_totals((e > 0).astype(np.float64))
+    out["exposed_emp"] = E.industry_totals(e)
+    out = out[out["naics_title"] != ""].reset_index(drop=True)
+    out["year"] = E.year
+    out["industry_exposure"] = out["exposed_emp"] / out["total_emp"]
+    out["match_rate"] = out["matched_emp"] / out["total_emp"]
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build cached occupation x industry employment matrices.")
+    parser.add_argument("--bls-dir", type=Path, default=bls_cache.BLS_DIR)
+    parser.add_argument("--years", type=int, nargs="*", default=None, help="Default: every nat4d workbook found.")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR)
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the cache is valid.")
+    args = parser.parse_args()
+
+    paths: Dict[int, Path] = {}
+    for p in sorted(args.bls_dir.rglob("nat4d_M*_dl.xlsx")):
+        m = re.fullmatch(r"nat4d_M(\d{4})_dl", p.stem)
+        if m:
+            paths.setdefault(int(m.group(1)), p)
+    years: Sequence[int] = args.years or sorted(paths)
+    if not years:
+        print(f"No nat4d workbooks found under {args.bls_dir}")
+        return
+    for year in years:
+        if year not in paths:
+            print(f"[employment_matrix] skip {year}: no nat4d_M{year}_dl.xlsx")
+            continue
+        path = paths[year]
+        if not args.force and _is_valid(year, path, args.cache_dir):
+            print(f"[employment_matrix] up to date: {year}")
+            continue
+        t0 = time.perf_counter()
+        E = build(year, path)
+        save(E, path, args.cache_dir)
+        print(
+            f"[employment_matrix] {year}: {E.matrix.shape[0]} occupations x {E.matrix.shape[1]} industries, "
+            f"nnz={E.matrix.nnz} in {time.perf_counter() - t0:.1f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""GDPval leaderboard ingestion: parse once into normalized tables, then load.
+
+Sources:
+- the minified leaderboard JS bundle (``data/raw/gdpval/leaderboard_bundle.js``),
+- ``gdpval_complete_data.json`` ({overall, by_sector, by_occupation, model_labels}).
+
+Both are normalized into three tables, in source order and unfiltered:
+
+- ``totals``: model, win_rate, win_or_tie_rate
+- ``by_sector``: model, gdpval_sector, win_rate, win_or_tie_rate
+- ``by_occupation``: model, gdpval_sector, gdpval_occupation, win_rate, win_or_tie_rate
+
+and stored under ``data/raw/gdpval/parsed/<source stem>/`` (Parquet + meta.json).
+``load_tables`` re-parses only when the source's sha256 changes.
+
+CLI:
+    python gdpval_data.py [--source path/to/bundle.js|gdpval_complete_data.json] [--force]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+
+ROOT = Path(__file__).resolve().parent
+GDPVAL_DIR = ROOT / "data" / "raw" / "gdpval"
+JS_CACHE = GDPVAL_DIR / "leaderboard_bundle.js"
+ARTIFACT_DIR = GDPVAL_DIR / "parsed"
+
+SCHEMA_VERSION = 1
+TABLES = ("totals", "by_sector", "by_occupation")
+
+TOTALS_BLOCK = re.compile(r"GI=\[(.*?)\],\$I=\{totals:GI\}", re.DOTALL)
+TOTALS_ROW = re.compile(r'\{model:"([^"]+)",win_rate:([^,}]+),win_or_tie_rate:([^,}]+)\}')
+# Sector and occupation rows share a shape; one pass picks up both.
+BREAKDOWN_ROW = re.compile(
+    r'\{model:"([^"]+)",sector:"([^"]+)",(?:occupation:"([^"]+)",)?win_rate:([^,}]+),win_or_tie_rate:([^,}]+)\}'
+)
+
+
+@dataclass
+class GDPvalTables:
+    totals: pd.DataFrame
+    by_sector: pd.DataFrame
+    by_occupation: pd.DataFrame
+
+
+def parse_float_js(token: str) -> float:
+    t = token.strip()
+    if t.startswith("."):
+        t = "0" + t
+    if t == "-.0":
+        t = "0"
+    return float(t)
+
+
+def parse_bundle(js_text: str) -> GDPvalTables:
+    m = TOTALS_BLOCK.search(js_text)
+    if not m:
+        raise RuntimeError("Cannot locate GDPval totals block in bundle.")
+    t_model, t_win, t_tie = [], [], []
+    for model, w, wt in TOTALS_ROW.findall(m.group(1)):
+        t_model.append(model)
+        t_win.append(parse_float_js(w))
+        t_tie.append(parse_float_js(wt))
+
+    sec: Dict[str, List] = {"model": [], "gdpval_sector": [], "win_rate": [], "win_or_tie_rate": []}
+    occ: Dict[str, List] = {"model": [], "gdpval_sector": [], "gdpval_occupation": [], "win_rate": [], "win_or_tie_rate": []}
+    for model, sector, occupation, w, wt in BREAKDOWN_ROW.findall(js_text):
+        out = occ if occupation else sec
+        out["model"].append(model)
+        out["gdpval_sector"].append(sector)
+        if occupation:
+            out["gdpval_occupation"].append(occupation)
+        out["win_rate"].append(parse_float_js(w))
+        out["win_or_tie_rate"].append(parse_float_js(wt))
+    return GDPvalTables(
+        totals=pd.DataFrame({"model": t_model, "win_rate": t_win, "win_or_tie_rate": t_tie}),
+        by_sector=pd.DataFrame(sec),
+        by_occupation=pd.DataFrame(occ),
+    )
+
+
+def parse_complete_json(data: Dict) -> GDPvalTables:
+    """Tables from gdpval_complete_data.json (breakdowns are grouped by model label)."""
+    totals = pd.DataFrame(data.get("overall", []), columns=["model", "win_rate", "win_or_tie_rate"])
+    sector_rows = [r for rows in data.get("by_sector", {}).values() for r in rows]
+    occ_rows = [r for rows in data.get("by_occupation", {}).values() for r in rows]
+    by_sector = pd.DataFrame(sector_rows, columns=["model", "sector", "win_rate", "win_or_tie_rate"])
+    by_occupation = pd.DataFrame(occ_rows, columns=["model", "sector", "occupation", "win_rate", "win_or_tie_rate"])
+    return GDPvalTables(
+        totals=totals.astype({"win_rate": float, "win_or_tie_rate": float}),
+        by_sector=by_sector.rename(columns={"sector": "gdpval_sector"}).astype({"win_rate": float, "win_or_tie_rate": float}),
+        by_occupation=by_occupation.rename(columns={"sector": "gdpval_sector", "occupation": "gdpval_occupation"}).astype(
+            {"win_rate": float, "win_or_tie_rate": float}
+        ),
+    )
+
+
+def parse_source(path: Path) -> GDPvalTables:
+    if path.suffix.lower() == ".json":
+        return parse_complete_json(json.loads(path.read_text(encoding="utf-8")))
+    return parse_bundle(path.read_text(encoding="utf-8"))
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _artifact_dir(source: Path, artifact_dir: Path) -> Path:
+    return artifact_dir / source.stem
+
+
+def _read_artifact(folder: Path, digest: str) -> Optional[GDPvalTables]:
+    meta_path = folder / "meta.json"
+    if not meta_path.exists():
+        return None
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    if meta.get("schema_version") != SCHEMA_VERSION or meta.get("sha256") != digest:
+        return None
+    try:
+        return GDPvalTables(**{name: pd.read_parquet(folder / f"{name}.parquet") for name in TABLES})
+    except (ImportError, OSError, ValueError):
+        return None
+
+
+def _write_artifact(folder: Path, source: Path, digest: str, tables: GDPvalTables) -> None:
+    folder.mkdir(parents=True, exist_ok=True)
+    try:
+        for name in TABLES:
+            getattr(tables, name).to_parquet(folder / f"{name}.parquet", index=False)
+    except ImportError:
+        return
+    meta = {
+        "schema_version": SCHEMA_VERSION,
+        "source": str(source),
+        "sha256": digest,
+        "rows": {name: int(len(getattr(tables, name))) for name in TABLES},
+        "parsed_at": time.time(),
+    }
+    (folder / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+
+def load_tables(source: Path = JS_CACHE, artifact_dir: Path = ARTIFACT_DIR, force: bool = False) -> GDPvalTables:
+    """Normalized tables for ``source`` (bundle .js or complete-data .json), parsed at most once per content hash."""
+    digest = _sha256(source)
+    folder = _artifact_dir(source, artifact_dir)
+    if not force:
+        cached = _read_artifact(folder, digest)
+        if cached is not None:
+            return cached
+    tables = parse_source(source)
+    _write_artifact(folder, source, digest, tables)
+    return tables
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Parse a GDPval source into normalized tables.")
+    parser.add_argument("--source", type=Path, default=JS_CACHE)
+    parser.add_argument("--artifact-dir", type=Path, default=ARTIFACT_DIR)
+    parser.add_argument("--force", action="store_true", help="Re-parse even if the artifact is up to date.")
+    args = parser.parse_args()
+
+    tables = load_tables(args.source, args.artifact_dir, force=args.force)
+    print(
+        f"[gdpval_data] {args.source.name}: totals={len(tables.totals)} by_sector={len(tables.by_sector)} "
+        f"by_occupation={len(tables.by_occupation)} -> {_artifact_dir(args.source, args.artifact_dir)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Grouped log-linear growth for sectors, NAICS industries and occupations.
+
+The report used to re-filter the exposure time series for every sector and run
+``np.polyfit(months, log(exposure), 1)`` on each slice. Here the fit for every
+entity comes from closed-form least squares on grouped sums:
+
+    b_g = sum_g (m - mean_g(m)) * (log e - mean_g(log e)) / sum_g (m - mean_g(m))^2
+
+computed with ``np.bincount`` over integer group codes in one pass. Months are
+``(year - first year of the entity) * 12`` as before; an entity whose months do
+not vary gets a flat trend (the minimum-norm polyfit answer). The slopes match
+the per-entity polyfit to rounding.
+
+Monthly growth is ``exp(b) - 1``; risk growth combines it with the frontier
+win-rate growth ``gW`` as ``(1 + gE) * (1 + gW) - 1``.
+
+Sectors and industries fit their employment-weighted exposure share. An
+occupation's exposure score is the same every year (task exposure is static,
+only employment moves), so the occupation level fits exposed employment
+``tot_emp * occupation_exposure`` instead; ``growth_metric`` records which
+column each row was fitted on.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+ROOT = Path(__file__).resolve().parent
+OUT_DIR = ROOT / "output"
+
+LOG_FLOOR = 1e-9
+MONTHS_PER_YEAR = 12
+
+
+@dataclass(frozen=True)
+class EntityLevel:
+    path: Path
+    code_col: str
+    title_col: str
+    value_col: str
+
+
+ENTITY_LEVELS: Dict[str, EntityLevel] = {
+    "sector": EntityLevel(OUT_DIR / "industry_exposure_by_year_sector.csv", "sector_code", "sector_title", "industry_exposure"),
+    "naics4": EntityLevel(OUT_DIR / "industry_exposure_by_year_naics4.csv", "naics", "naics_title", "industry_exposure"),
+    "occupation": EntityLevel(OUT_DIR / "occupation_exposure_timeseries.csv", "occ_code", "occupation_title", "exposed_emp"),
+}
+
+
+def grouped_slopes(codes: np.ndarray, x: np.ndarray, y: np.ndarray, n_groups: int) -> np.ndarray:
+    """OLS slope of y on x within each group code (0 where x does not vary)."""
+    n = np.bincount(codes, minlength=n_groups).astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dx = x - (np.bincount(codes, weights=x, minlength=n_groups) / n)[codes]
+        dy = y - (np.bincount(codes, weights=y, minlength=n_groups) / n)[codes]
+    sxx = np.bincount(codes, weights=dx * dx, minlength=n_groups)
+    sxy = np.bincount(codes, weights=dx * dy, minlength=n_groups)
+    out = np.zeros(n_groups)
+    np.divide(sxy, sxx, out=out, where=sxx > 0)
+    return out
+
+
+def loglinear_growth(
+    ts: pd.DataFrame, keys: Sequence[str], value_col: str, year_col: str = "year", floor: float = LOG_FLOOR
+) -> pd.DataFrame:
+    """One row per ``keys`` group (sorted): n_years, log slope per month and monthly growth of ``value_col``."""
+    keys = list(keys)
+    d = ts[keys + [year_col, value_col]].dropna(subset=[year_col, value_col])
+    codes, groups = pd.MultiIndex.from_frame(d[keys]).factorize(sort=True)
+    years = d[year_col].to_numpy(dtype=np.float64)
+    first = np.full(len(groups), np.inf)
+    np.minimum.at(first, codes, years)
+    months = (years - first[codes]) * MONTHS_PER_YEAR
+    log_v = np.log(np.clip(d[value_col].to_numpy(dtype=np.float64), floor, None))
+    slope = grouped_slopes(codes, months, log_v, len(groups))
+
+    out = groups.to_frame(index=False)
+    out.columns = keys
+    out["n_years"] = np.bincount(codes, minlength=len(groups))
+    out["log_slope_per_month"] = slope
+    out["monthly_growth"] = np.exp(slope) - 1.0
+    return out
+
+
+def entity_growth(level: str, ts: pd.DataFrame, win_growth_monthly: float) -> pd.DataFrame:
+    """Tidy monthly exposure / risk growth table for one entity level."""
+    spec = ENTITY_LEVELS[level]
+    d = ts.assign(**{spec.code_col: ts[spec.code_col].astype(str)})
+    titles = d.drop_duplicates(spec.code_col).set_index(spec.code_col)[spec.title_col]
+    g = loglinear_growth(d, [spec.code_col], spec.value_col)
+    ge = g["monthly_growth"].to_numpy()
+    return pd.DataFrame(
+        {
+            "entity_level": level,
+            "entity_code": g[spec.code_col],
+            "entity_title": g[spec.code_col].map(titles).astype(str),
+            "n_years": g["n_years"],
+            "growth_metric": spec.value_col,
+            "exposure_growth_monthly": ge,
+            "risk_growth_monthly": (1.0 + ge) * (1.0 + win_growth_monthly) - 1.0,
+        }
+    )
+
+
+def growth_table(win_growth_monthly: float, levels: Sequence[str] = ("sector",), frames: Optional[Dict[str, pd.DataFrame]] = None) -> pd.DataFrame:
+    """``entity_growth`` for each level, reading ``ENTITY_LEVELS[level].path`` unless a frame is given."""
+    frames = frames or {}
+    parts: List[pd.DataFrame] = []
+    for level in levels:
+        if level not in ENTITY_LEVELS:
+            raise ValueError(f"Unknown entity level {level!r}; expected one of {sorted(ENTITY_LEVELS)}")
+        ts = frames[level] if level in frames else pd.read_csv(ENTITY_LEVELS[level].path)
+        parts.append(entity_growth(level, ts, win_growth_monthly))
+    return pd.concat(parts, ignore_index=True)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Vectorized growth metrics for year-indexed exposure tables.
+
+``add_growth`` pivots a long (entity, year, value) table to wide form and adds
+change / percent / CAGR / YoY columns. The CAGR used to be a row-wise
+``apply(cagr)``; here every metric is a whole-column NumPy expression with the
+same semantics as the scalar ``cagr()``: NaN when periods <= 0 or when either
+endpoint is missing or non-positive. Finite values agree with the scalar
+version to within an ulp (NumPy's pow vs libm's).
+
+Run the module directly for a microbenchmark against the row-wise version:
+    python growth_metrics.py [--entities 20000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+
+def cagr(start: float, end: float, periods: int) -> float:
+    if periods <= 0:
+        return float("nan")
+    if start is None or end is None or start <= 0 or end <= 0:
+        return float("nan")
+    return (end / start) ** (1.0 / periods) - 1.0
+
+
+def cagr_array(start: np.ndarray, end: np.ndarray, periods: int) -> np.ndarray:
+    """Element-wise ``cagr``; NaN where either endpoint is missing or <= 0."""
+    start = np.asarray(start, dtype=np.float64)
+    end = np.asarray(end, dtype=np.float64)
+    out = np.full(np.broadcast(start, end).shape, np.nan)
+    if periods <= 0:
+        return out
+    ok = (start > 0) & (end > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[ok] = np.power(end[ok] / start[ok], 1.0 / periods) - 1.0
+    return out
+
+
+def pairwise_cagr(wide: pd.DataFrame, value_col: str, years: List[int]) -> pd.DataFrame:
+    """CAGR for every (earlier, later) pair of year columns present in ``wide``."""
+    present = [y for y in years if y in wide.columns]
+    cols = {}
+    for i, a in enumerate(present):
+        va = wide[a].to_numpy(dtype=np.float64)
+        for b in present[i + 1 :]:
+            cols[f"{value_col}_cagr_{a}_{b}"] = cagr_array(va, wide[b].to_numpy(dtype=np.float64), b - a)
+    return pd.DataFrame(cols, index=wide.index)
+
+
+def add_growth(
+    df: pd.DataFrame, id_cols: List[str], value_col: str, years: List[int], pairwise: bool = False
+) -> pd.DataFrame:
+    wide = df.pivot_table(index=id_cols, columns="year", values=value_col, aggfunc="first").reset_index()
+    y0, y1 = years[0], years[-1]
+    if y0 in wide.columns and y1 in wide.columns:
+        wide[f"{value_col}_chg_{y0}_{y1}"] = wide[y1] - wide[y0]
+        wide[f"{value_col}_pct_{y0}_{y1}"] = (wide[y1] / wide[y0]) - 1.0
+        wide[f"{value_col}_cagr_{y0}_{y1}"] = cagr_array(wide[y0].to_numpy(dtype=np.float64), wide[y1].to_numpy(dtype=np.float64), y1 - y0)
+    prev = years[-2]
+    if prev in wide.columns and y1 in wide.columns:
+        wide[f"{value_col}_yoy_{prev}_{y1}"] = (wide[y1] / wide[prev]) - 1.0
+    if pairwise:
+        extra = pairwise_cagr(wide, value_col, years)
+        extra = extra.drop(columns=[c for c in extra.columns if c in wide.columns])
+        wide = pd.concat([wide, extra], axis=1)
+    return wide
+
+
+def _add_growth_rowwise(df: pd.DataFrame, id_cols: List[str], value_col: str, years: List[int]) -> pd.DataFrame:
+    """Previous implementation (row-wise apply), kept for the benchmark."""
+    wide = df.pivot_table(index=id_cols, columns="year", values=value_col, aggfunc="first").reset_index()
+    y0, y1 = years[0], years[-1]
+    if y0 in wide.columns and y1 in wide.columns:
+        wide[f"{value_col}_chg_{y0}_{y1}"] = wide[y1] - wide[y0]
+        wide[f"{value_col}_pct_{y0}_{y1}"] = (wide[y1] / wide[y0]) - 1.0
+        wide[f"{value_col}_cagr_{y0}_{y1}"] = wide.apply(lambda r: cagr(r[y0], r[y1], y1 - y0), axis=1)
+    prev = years[-2]
+    if prev in wide.columns and y1 in wide.columns:
+        wide[f"{value_col}_yoy_{prev}_{y1}"] = (wide[y1] / wide[prev]) - 1.0
+    return wide
+
+
+def _synthetic_panel(n_entities: int, years: List[int], seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    ids = np.repeat([f"{i:06d}" for i in range(n_entities)], len(years))
+    vals = rng.lognormal(mean=8.0, sigma=1.5, size=len(ids))
+    # Zeros, negatives and gaps exercise the NaN rules.
+    vals[rng.random(len(ids)) < 0.03] = 0.0
+    vals[rng.random(len(ids)) < 0.01] = -1.0
+    df = pd.DataFrame({"code": ids, "title": "t" + ids, "year": np.tile(years, n_entities), "value": vals})
+    return df[rng.random(len(df)) > 0.02]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark vectorized add_growth against the row-wise version.")
+    parser.add_argument("--entities", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    years = [2019, 2020, 2021, 2022, 2023, 2024]
+    panel = _synthetic_panel(args.entities, years)
+
+    def best_of(fn) -> float:
+        best = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+        return best
+
+    ref = _add_growth_rowwise(panel, ["code", "title"], "value", years)
+    new = add_growth(panel, ["code", "title"], "value", years)
+    # NaN pattern must match exactly; values may differ in the last ulp because
+    # NumPy's vectorized pow is not libm's scalar pow.
+    pd.testing.assert_frame_equal(ref, new, check_exact=False, rtol=1e-12, atol=0.0)
+    cagr_col = f"value_cagr_{years[0]}_{years[-1]}"
+    max_diff = float(np.nanmax(np.abs(ref[cagr_col].to_numpy(float) - new[cagr_col].to_numpy(float))))
+
+    t_ref = best_of(lambda: _add_growth_rowwise(panel, ["code", "title"], "value", years))
+    t_new = best_of(lambda: add_growth(panel, ["code", "title"], "value", years))
+    t_pair = best_of(lambda: add_growth(panel, ["code", "title"], "value", years, pairwise=True))
+    print(f"entities={args.entities} years={len(years)} (NaN pattern identical, max |CAGR diff| = {max_diff:.1e})")
+    print(f"row-wise apply : {t_ref * 1000:8.1f} ms")
+    print(f"vectorized     : {t_new * 1000:8.1f} ms  ({t_ref / t_new:.1f}x)")
+    print(f"+ pairwise CAGR: {t_pair * 1000:8.1f} ms  ({len(years) * (len(years) - 1) // 2} year pairs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Fast fuzzy title matching with ``difflib.get_close_matches`` semantics.
+
+``get_close_matches(word, titles, n=1, cutoff)`` runs a pure-Python
+``SequenceMatcher`` over every title. It only keeps titles that pass two cheap
+upper bounds on ``ratio()`` -- ``real_quick_ratio`` (lengths) and
+``quick_ratio`` (shared character multiset) -- before computing the real ratio.
+
+``TitleIndex`` evaluates both bounds for all titles at once from a precomputed
+(n_titles x alphabet) character-count matrix, then computes the real ratio for
+survivors in decreasing ``quick_ratio`` order and stops once that bound falls
+below the best ratio found. The bounds are exactly difflib's own filters, so the
+chosen match (highest ratio, ties to the larger string) is identical to
+``get_close_matches``.
+"""
+
+from __future__ import annotations
+
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class TitleIndex:
+    def __init__(self, titles: Sequence[str]):
+        self.titles: List[str] = [str(t) for t in titles]
+        alphabet = sorted({ch for t in self.titles for ch in t})
+        self.char_pos: Dict[str, int] = {ch: i for i, ch in enumerate(alphabet)}
+        counts = np.zeros((len(self.titles), len(alphabet)), dtype=np.int32)
+        for row, t in enumerate(self.titles):
+            for ch in t:
+                counts[row, self.char_pos[ch]] += 1
+        self.counts = counts
+        self.lengths = np.array([len(t) for t in self.titles], dtype=np.int64)
+
+    def _query_counts(self, word: str) -> np.ndarray:
+        q = np.zeros(len(self.char_pos), dtype=np.int32)
+        for ch in word:
+            i = self.char_pos.get(ch)
+            if i is not None:
+                q[i] += 1
+        return q
+
+    def candidates(self, word: str, cutoff: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Title positions passing difflib's real_quick_ratio and quick_ratio filters, with their quick_ratio."""
+        total = self.lengths + len(word)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            real_quick = np.where(total > 0, 2.0 * np.minimum(self.lengths, len(word)) / total, 1.0)
+            keep = np.flatnonzero(real_quick >= cutoff)
+            if len(keep) == 0:
+                return keep, np.zeros(0)
+            matches = np.minimum(self.counts[keep], self._query_counts(word)[None, :]).sum(axis=1)
+            quick = np.where(total[keep] > 0, 2.0 * matches / total[keep], 1.0)
+        ok = quick >= cutoff
+        return keep[ok], quick[ok]
+
+    def close_match(self, word: str, cutoff: float = 0.6) -> Optional[str]:
+        """Same result as ``get_close_matches(word, titles, n=1, cutoff=cutoff)[0]`` (or None)."""
+        s = SequenceMatcher()
+        s.set_seq2(word)
+        best: Optional[Tuple[float, str]] = None
+        pos, bound = self.candidates(word, cutoff)
+        # Best bound first; once the bound drops below the best ratio nothing can beat it.
+        for j in np.argsort(-bound, kind="stable"):
+            if best is not None and bound[j] < best[0]:
+                break
+            x = self.titles[pos[j]]
+            s.set_seq1(x)
+            score = s.ratio()
+            if score >= cutoff and (best is None or (score, x) > best):
+                best = (score, x)
+        return None if best is None else best[1]
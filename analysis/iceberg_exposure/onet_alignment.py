@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Shared TF-IDF alignment engine: GDPval prompts -> O*NET tasks within mapped SOCs.
+
+The original alignment refit a ``TfidfVectorizer`` on every GDPval occupation's
+candidate tasks. ``TaskAlignmentIndex`` instead vectorizes all of ``task_auto``
+once, keeps a SOC -> row-range index over a stable sort by ``soc_code`` and
+scores each prompt only against the rows of its SOC partition. Candidates are
+visited in ``task_auto`` order, so tie-breaking matches the per-group code.
+
+Two IDF modes:
+
+- ``shared``: one IDF over the whole O*NET task space (default; prompts are
+  transformed once, adding prompts costs one sparse product per partition),
+- ``per_group``: the IDF each occupation's own refit would have produced,
+  computed from a global count matrix restricted to the group's rows and
+  vocabulary. Reproduces the previous outputs exactly, for validation.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.metrics.pairwise import linear_kernel
+
+import tfidf_cache
+
+
+ALIGN_TFIDF_PARAMS = {"stop_words": "english", "ngram_range": (1, 2), "min_df": 1, "max_features": 200000}
+IDF_MODES = ("shared", "per_group")
+
+
+def select_topk(sims: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Row-wise top-k (descending) with the argpartition tie-breaking the alignment always used."""
+    top_idx = np.argpartition(sims, -k, axis=1)[:, -k:]
+    top_val = np.take_along_axis(sims, top_idx, axis=1)
+    order = np.argsort(top_val, axis=1)[:, ::-1]
+    return np.take_along_axis(top_idx, order, axis=1), np.take_along_axis(top_val, order, axis=1)
+
+
+class TaskAlignmentIndex:
+    """O*NET task space fitted once, partitioned by SOC code."""
+
+    def __init__(self, task_auto: pd.DataFrame, idf_mode: str = "shared", params: Dict = ALIGN_TFIDF_PARAMS):
+        if idf_mode not in IDF_MODES:
+            raise ValueError(f"idf_mode must be one of {IDF_MODES}, got {idf_mode!r}")
+        self.task_auto = task_auto.reset_index(drop=True)
+        self.idf_mode = idf_mode
+        self.params = dict(params)
+        self.task_text = self.task_auto["task_text_clean"].fillna("").astype(str).tolist()
+
+        soc = self.task_auto["soc_code"].astype(str).to_numpy()
+        self._order = np.argsort(soc, kind="stable")
+        codes, starts, counts = np.unique(soc[self._order], return_index=True, return_counts=True)
+        self.soc_ranges: Dict[str, Tuple[int, int]] = {
+            str(c): (int(s), int(s + n)) for c, s, n in zip(codes, starts, counts)
+        }
+
+        if idf_mode == "shared":
+            art = tfidf_cache.fit_transform_cached(self.params, self.task_text, {"task": self.task_text})
+            self.vectorizer = art.vectorizer
+            self.x_task = art.matrices["task"]
+        else:
+            # Same analyzer as the per-group vectorizers; no feature cap so every
+            # group's vocabulary is a column subset (kept in the same sorted order).
+            count_params = {k: v for k, v in self.params.items() if k not in ("max_features", "min_df")}
+            self.vectorizer = CountVectorizer(**count_params)
+            self.x_task = self.vectorizer.fit_transform(self.task_text).tocsr()
+
+    def candidates(self, socs: Sequence[str]) -> np.ndarray:
+        """Row positions of tasks whose SOC is in ``socs``, in ``task_auto`` order."""
+        parts = [self._order[slice(*self.soc_ranges[s])] for s in set(map(str, socs)) if s in self.soc_ranges]
+        if not parts:
+            return np.zeros(0, dtype=np.int64)
+        return np.sort(np.concatenate(parts)).astype(np.int64)
+
+    def transform_prompts(self, prompts_clean: Sequence[str]) -> sp.csr_matrix:
+        return self.vectorizer.transform(list(prompts_clean)).tocsr()
+
+    def similarities(self, cand: np.ndarray, x_prompt: sp.csr_matrix, prompts_clean: Sequence[str]) -> np.ndarray:
+        """Dense (n_prompts, n_cand) cosine similarities inside one SOC partition."""
+        if self.idf_mode == "shared":
+            return linear_kernel(x_prompt, self.x_task[cand])
+        counts = self.x_task[cand]
+        cols = np.flatnonzero(np.asarray((counts > 0).sum(axis=0)).ravel())
+        if len(cols) > self.params.get("max_features", len(cols)):
+            # The group refit would have truncated its vocabulary; let it do so.
+            texts = [self.task_text[i] for i in cand]
+            vec = TfidfVectorizer(**self.params).fit(texts)
+            return linear_kernel(vec.transform(list(prompts_clean)), vec.transform(texts))
+        counts = counts[:, cols]
+        transformer = TfidfTransformer().fit(counts)
+        return linear_kernel(transformer.transform(x_prompt[:, cols]), transformer.transform(counts))
+
+
+def align_topk(
+    index: TaskAlignmentIndex,
+    socs: Sequence[str],
+    prompts_clean: Sequence[str],
+    k: int,
+    x_prompt: Optional[sp.csr_matrix] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Top-k candidates per prompt within ``socs``: (cand positions, top_idx into cand, top_val).
+
+    Returns empty arrays when the partition has no tasks.
+    """
+    cand = index.candidates(socs)
+    if len(cand) == 0:
+        empty = np.zeros((len(prompts_clean), 0))
+        return cand, empty.astype(np.int64), empty
+    if x_prompt is None:
+        x_prompt = index.transform_prompts(prompts_clean)
+    sims = index.similarities(cand, x_prompt, prompts_clean)
+    top_idx, top_val = select_topk(sims, min(k, len(cand)))
+    return cand, top_idx, top_val
+
+
+def weighted_exposure(top_val: np.ndarray, weight: np.ndarray, score: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Similarity x priority weighted mean of task scores for a (n_prompts, k) batch.
+
+    ``weight`` / ``score`` are the candidates' task_weight (NaN already set to
+    0.01) and task_auto_score (NaN set to 0). Rows whose weighted similarities
+    do not sum to a positive finite value fall back to priority weights, then
+    to uniform weights. Returns (clipped top-1 similarity, aligned exposure).
+    """
+    vals = np.clip(top_val, 0.0, None)
+    pri = np.clip(weight, 1e-9, None)
+    raw = vals * pri
+    total = raw.sum(axis=1)
+    fallback = ~np.isfinite(total) | (total <= 0)
+    raw[fallback] = pri[fallback]
+    raw[raw.sum(axis=1) <= 0] = 1.0
+    w = raw / raw.sum(axis=1, keepdims=True)
+    return vals[:, 0], np.sum(w * score, axis=1)
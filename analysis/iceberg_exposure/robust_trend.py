@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Theil-Sen trend estimation for short and long series.
+
+The slope is the median of all pairwise slopes ``(y[j] - y[i]) / (x[j] - x[i])``
+over pairs with distinct x (for a time axis, every pair with ``x[j] > x[i]``).
+Three evaluation strategies share that definition:
+
+- exact: all pairs at once from upper-triangular index arrays (N <= ``max_pairs``),
+- blocked: exact, but pairs are generated in row blocks of at most ``max_pairs``;
+  a random sample of slopes brackets the needed order statistics, and one
+  blocked pass counts slopes below the bracket and keeps only those inside it,
+- sampled: median of ``sample_pairs`` random pairs (approximate, for very long series).
+
+Confidence bounds follow Sen (1968) / ``scipy.stats.theilslopes``: the order
+statistics of the sorted slopes at ranks ``(N -/+ z * sigma) / 2``, with sigma
+from Kendall's tau variance corrected for ties in x and y. The sampled
+estimator takes the same ranks as quantiles of its sample.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.special import ndtri
+
+
+DEFAULT_MAX_PAIRS = 4_000_000
+DEFAULT_SAMPLE_PAIRS = 200_000
+METHODS = ("auto", "exact", "blocked", "sampled")
+
+
+@dataclass
+class TheilSenEst:
+    slope: float
+    intercept: float
+    low_slope: float
+    high_slope: float
+    n_pairs: int
+    method: str
+
+
+def _as_arrays(x: Sequence[float], y: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+    x = np.asarray(x, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64).ravel()
+    if x.shape != y.shape:
+        raise ValueError(f"x and y differ in length: {len(x)} vs {len(y)}")
+    return x, y
+
+
+def _tie_pairs(v: np.ndarray) -> int:
+    _, counts = np.unique(v, return_counts=True)
+    return int((counts * (counts - 1) // 2).sum())
+
+
+def _tie_weight(v: np.ndarray) -> int:
+    _, t = np.unique(v, return_counts=True)
+    return int((t * (t - 1) * (2 * t + 5)).sum())
+
+
+def pairwise_slopes(x: Sequence[float], y: Sequence[float]) -> np.ndarray:
+    """All pairwise slopes over pairs with distinct x, in (i, j) row-major order."""
+    x, y = _as_arrays(x, y)
+    i, j = np.triu_indices(len(x), k=1)
+    dx = x[j] - x[i]
+    ok = dx != 0
+    return (y[j][ok] - y[i][ok]) / dx[ok]
+
+
+def _slope_blocks(x: np.ndarray, y: np.ndarray, max_pairs: int) -> Iterator[np.ndarray]:
+    """``pairwise_slopes`` in row blocks of at most ~``max_pairs`` candidate pairs."""
+    n = len(x)
+    rows = max(1, int(max_pairs) // max(n, 1))
+    for a in range(0, n - 1, rows):
+        b = min(a + rows, n - 1)
+        dx = x[None, a + 1 :] - x[a:b, None]
+        dy = y[None, a + 1 :] - y[a:b, None]
+        # Column c is j = a + 1 + c; keep j > i (upper triangle) with distinct x.
+        ok = (np.arange(a + 1, n)[None, :] > np.arange(a, b)[:, None]) & (dx != 0)
+        yield dy[ok] / dx[ok]
+
+
+def _sample_slopes(x: np.ndarray, y: np.ndarray, size: int, rng: np.random.Generator) -> np.ndarray:
+    """Slopes of ``size`` pairs drawn uniformly (with replacement) from pairs with distinct x."""
+    n = len(x)
+    out = np.empty(0)
+    while len(out) < size:
+        i = rng.integers(0, n, size=2 * size)
+        j = rng.integers(0, n, size=2 * size)
+        dx = x[j] - x[i]
+        ok = dx != 0
+        out = np.concatenate([out, (y[j][ok] - y[i][ok]) / dx[ok]])
+    return out[:size]
+
+
+def _order_stats_blocked(
+    x: np.ndarray, y: np.ndarray, ranks: np.ndarray, n_pairs: int, max_pairs: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Exact sorted-slope values at ``ranks`` without materializing all N slopes."""
+    sample = np.sort(_sample_slopes(x, y, min(DEFAULT_SAMPLE_PAIRS, n_pairs), rng))
+    q = ranks / max(n_pairs - 1, 1)
+    margin = 4.0 / np.sqrt(len(sample))
+    while True:
+        lo = -np.inf if q.min() - margin <= 0 else np.quantile(sample, q.min() - margin)
+        hi = np.inf if q.max() + margin >= 1 else np.quantile(sample, q.max() + margin)
+        below = 0
+        inside = []
+        for s in _slope_blocks(x, y, max_pairs):
+            below += int((s < lo).sum())
+            inside.append(s[(s >= lo) & (s <= hi)])
+        kept = np.concatenate(inside)
+        local = ranks - below
+        if local.min() >= 0 and local.max() < len(kept):
+            return np.partition(kept, np.unique(local))[local]
+        margin *= 2.0
+
+
+def _ci_ranks(x: np.ndarray, y: np.ndarray, n_pairs: int, confidence: float) -> Tuple[int, int]:
+    n = len(x)
+    sigsq = (n * (n - 1) * (2 * n + 5) - _tie_weight(x) - _tie_weight(y)) / 18.0
+    z = ndtri(0.5 + confidence / 2.0)
+    sigma = np.sqrt(max(sigsq, 0.0))
+    hi = min(int(np.round((n_pairs + z * sigma) / 2.0)), n_pairs - 1)
+    lo = max(int(np.round((n_pairs - z * sigma) / 2.0)) - 1, 0)
+    return lo, hi
+
+
+def theil_sen(
+    x: Sequence[float],
+    y: Sequence[float],
+    confidence: float = 0.95,
+    method: str = "auto",
+    max_pairs: int = DEFAULT_MAX_PAIRS,
+    sample_pairs: int = DEFAULT_SAMPLE_PAIRS,
+    seed: Optional[int] = 0,
+) -> TheilSenEst:
+    """Theil-Sen slope, intercept and confidence bounds.
+
+    ``method="auto"`` is exact in one shot when the pair count fits in
+    ``max_pairs`` and blocked-exact otherwise; ``"sampled"`` trades exactness
+    for O(``sample_pairs``) work.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+    x, y = _as_arrays(x, y)
+    n = len(x)
+    n_pairs = n * (n - 1) // 2 - _tie_pairs(x)
+    if n_pairs <= 0:
+        raise ValueError("Need at least 2 distinct x values for a Theil-Sen slope")
+    if method == "auto":
+        method = "exact" if n_pairs <= max_pairs else "blocked"
+
+    lo_rank, hi_rank = _ci_ranks(x, y, n_pairs, confidence)
+    ranks = np.array([(n_pairs - 1) // 2, n_pairs // 2, lo_rank, hi_rank])
+    rng = np.random.default_rng(seed)
+    if method == "exact":
+        s = pairwise_slopes(x, y)
+        vals = np.partition(s, np.unique(ranks))[ranks]
+    elif method == "blocked":
+        vals = _order_stats_blocked(x, y, ranks, n_pairs, max_pairs, rng)
+    else:
+        s = np.sort(_sample_slopes(x, y, sample_pairs, rng))
+        vals = np.quantile(s, ranks / max(n_pairs - 1, 1))
+
+    slope = float((vals[0] + vals[1]) / 2.0)
+    return TheilSenEst(
+        slope=slope,
+        intercept=float(np.median(y) - slope * np.median(x)),
+        low_slope=float(vals[2]),
+        high_slope=float(vals[3]),
+        n_pairs=int(n_pairs),
+        method=method,
+    )
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Run-scoped memo for intermediate artifacts shared across pipeline scripts.
+
+The O*NET occupation corpus, the GDPval -> SOC name mapping and the
+occupation -> SOC map are rebuilt by several scripts (and more than once per
+run). ``RunMemo.get`` keys each artifact on a fingerprint of its inputs and of
+the source code of its builder (callers pass the builder and the helpers it
+relies on, so editing them invalidates old entries) and keeps it:
+
+- in memory for the rest of the process,
+- on disk under data/interim/run_memo (DataFrames as Parquet, everything else
+  as JSON), so the next script or run with the same inputs skips the work.
+
+Only the newest entry per artifact name is kept on disk. Without a Parquet
+engine, DataFrames are memoized in memory only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+import pandas as pd
+
+
+ROOT = Path(__file__).resolve().parent
+CACHE_DIR = ROOT / "data" / "interim" / "run_memo"
+
+
+def source_text(obj: Callable) -> str:
+    """Source of a function or class; its qualified name when the source is unavailable."""
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        return f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', repr(obj))}"
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable hash of DataFrames, paths (size/mtime), functions/classes (source) and JSON-able values."""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, pd.DataFrame):
+            h.update(json.dumps([str(c) for c in part.columns]).encode("utf-8"))
+            h.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+        elif isinstance(part, Path):
+            st = part.stat()
+            h.update(f"{part}|{st.st_size}|{st.st_mtime_ns}".encode("utf-8"))
+        elif inspect.isfunction(part) or inspect.isclass(part):
+            h.update(source_text(part).encode("utf-8"))
+        else:
+            h.update(json.dumps(part, sort_keys=True, default=str).encode("utf-8"))
+        h.update(b"\x1e")
+    return h.hexdigest()[:24]
+
+
+class RunMemo:
+    def __init__(self, cache_dir: Path = CACHE_DIR, use_disk: bool = True):
+        self.cache_dir = cache_dir
+        self.use_disk = use_disk
+        self._mem: Dict[Tuple[str, str], Any] = {}
+
+    def _paths(self, name: str, key: str) -> Tuple[Path, Path]:
+        stem = self.cache_dir / f"{name}__{key}"
+        return stem.with_suffix(".parquet"), stem.with_suffix(".json")
+
+    def _load(self, name: str, key: str) -> Tuple[bool, Any]:
+        pq_path, js_path = self._paths(name, key)
+        try:
+            if pq_path.exists():
+                return True, pd.read_parquet(pq_path)
+            if js_path.exists():
+                return True, json.loads(js_path.read_text(encoding="utf-8"))
+        except (ImportError, OSError, ValueError):
+            pass
+        return False, None
+
+    def _save(self, name: str, key: str, value: Any) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        pq_path, js_path = self._paths(name, key)
+        try:
+            if isinstance(value, pd.DataFrame):
+                tmp = pq_path.with_suffix(".parquet.tmp")
+                value.to_parquet(tmp, index=False)
+                tmp.replace(pq_path)
+            else:
+                js_path.write_text(json.dumps(value, ensure_ascii=False), encoding="utf-8")
+        except ImportError:
+            return
+        for old in self.cache_dir.glob(f"{name}__*"):
+            if old not in (pq_path, js_path):
+                old.unlink(missing_ok=True)
+
+    def get(self, name: str, key: str, compute: Callable[[], Any]) -> Any:
+        """Value for (name, key): memory, then disk, then ``compute()``. DataFrames are returned as copies."""
+        if (name, key) not in self._mem:
+            self._mem[(name, key)] = self._fetch(name, key, compute)
+        value = self._mem[(name, key)]
+        return value.copy() if isinstance(value, pd.DataFrame) else value
+
+    def _fetch(self, name: str, key: str, compute: Callable[[], Any]) -> Any:
+        found, value = self._load(name, key) if self.use_disk else (False, None)
+        if not found:
+            value = compute()
+            if self.use_disk:
+                self._save(name, key, value)
+        return value
+
+    def clear(self) -> None:
+        self._mem.clear()
+
+
+RUN = RunMemo()
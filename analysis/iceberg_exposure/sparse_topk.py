@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""Sparse top-k retrieval over TF-IDF matrices.
+
+The mapping scripts used to materialize a dense ``linear_kernel`` block
+(rows x all candidates) per batch and then keep only the argmax / top-k.
+This module computes the same similarities as chunked sparse-sparse products
+and selects the best-k candidates per row directly from the CSR result:
+
+1) Rows are grouped into chunks whose estimated product size (sum of posting
+   lengths of the row terms) stays under a fixed nnz budget.
+2) Per chunk, entries are ordered by (row, score desc, column asc) and the
+   first k per row are kept.
+3) Rows whose top-k is not unique (ties at or inside the cut, or fewer than k
+   positive scores) are re-scored densely with the original selection rule,
+   so indices and scores are bit-identical to the dense implementation.
+
+``parallel_topk`` shards query row ranges across a process pool. The CSR arrays
+are written once to a scratch directory and memory-mapped by every worker
+instead of being pickled per task; shard results are gathered in row order.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+
+DEFAULT_MAX_CHUNK_NNZ = 4_000_000
+DENSE_FALLBACK_BATCH = 400
+SHARDS_PER_WORKER = 4
+
+
+def prepare_index(x_index: sp.spmatrix) -> sp.csr_matrix:
+    """Transpose candidate matrix once (terms x candidates) for repeated products."""
+    return sp.csr_matrix(x_index).T.tocsr()
+
+
+def dense_topk(sims: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Reference top-k selection used by the dense mapping batches."""
+    if k == 1:
+        idx = sims.argmax(axis=1)[:, None]
+        return idx, np.take_along_axis(sims, idx, axis=1)
+    idx_part = np.argpartition(sims, -k, axis=1)[:, -k:]
+    vals_part = np.take_along_axis(sims, idx_part, axis=1)
+    order = np.argsort(vals_part, axis=1)[:, ::-1]
+    return np.take_along_axis(idx_part, order, axis=1), np.take_along_axis(vals_part, order, axis=1)
+
+
+def estimate_row_cost(x_query: sp.csr_matrix, index_t: sp.csr_matrix) -> np.ndarray:
+    """Upper bound of product nnz per query row (sum of posting lengths, capped at n candidates)."""
+    postings = np.diff(index_t.indptr).astype(np.int64)
+    present = sp.csr_matrix((np.ones_like(x_query.data, dtype=np.int64), x_query.indices, x_query.indptr), shape=x_query.shape)
+    cost = np.asarray(present @ postings).ravel()
+    return np.minimum(cost, index_t.shape[1])
+
+
+def plan_chunks(cost: np.ndarray, max_chunk_nnz: int) -> np.ndarray:
+    """Row boundaries [b0=0, b1, ..., n] so that each chunk stays within the nnz budget."""
+    n = len(cost)
+    bounds = [0]
+    csum = np.concatenate([[0], np.cumsum(cost)])
+    start = 0
+    while start < n:
+        end = int(np.searchsorted(csum, csum[start] + max_chunk_nnz, side="right")) - 1
+        end = min(max(end, start + 1), n)
+        bounds.append(end)
+        start = end
+    return np.asarray(bounds, dtype=np.int64)
+
+
+def _select_sparse_rows(
+    prod: sp.csr_matrix, k: int, n_cols: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Top-k per CSR row. Returns (idx, vals, resolved_mask)."""
+    n_rows = prod.shape[0]
+    row_nnz = np.diff(prod.indptr)
+    row_ids = np.repeat(np.arange(n_rows), row_nnz)
+    order = np.lexsort((prod.indices, -prod.data, row_ids))
+    rank = np.arange(len(order)) - prod.indptr[row_ids]
+
+    keep = rank <= k
+    sel = order[keep]
+    sel_rows = row_ids[keep]
+    sel_rank = rank[keep]
+
+    cand_val = np.full((n_rows, k + 1), -np.inf)
+    cand_idx = np.zeros((n_rows, k + 1), dtype=np.int64)
+    cand_val[sel_rows, sel_rank] = prod.data[sel]
+    cand_idx[sel_rows, sel_rank] = prod.indices[sel]
+
+    # Implicit zeros compete with stored scores whenever the row is not full.
+    nxt = cand_val[:, k].copy()
+    has_zero = row_nnz < n_cols
+    nxt[has_zero] = np.maximum(nxt[has_zero], 0.0)
+
+    top = cand_val[:, :k]
+    strictly_desc = np.all(top[:, :-1] > top[:, 1:], axis=1) if k > 1 else np.ones(n_rows, dtype=bool)
+    resolved = (row_nnz >= k) & strictly_desc & (top[:, -1] > nxt)
+    return cand_idx[:, :k], top, resolved
+
+
+def topk(
+    x_query: sp.spmatrix,
+    x_index: sp.spmatrix,
+    k: int = 1,
+    max_chunk_nnz: int = DEFAULT_MAX_CHUNK_NNZ,
+    index_t: Optional[sp.csr_matrix] = None,
+    progress_label: Optional[str] = None,
+    progress_every: int = 4000,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Best-k candidate indices and dot-product scores per query row.
+
+    Equivalent to ``dense_topk(linear_kernel(x_query, x_index), k)`` (argmax for
+    k=1), including tie handling, without allocating the dense similarity block.
+    Returns (indices[n, k] int64, scores[n, k] float64), best first.
+    """
+    x_query = sp.csr_matrix(x_query)
+    if index_t is None:
+        index_t = prepare_index(x_index)
+    n, n_cols = x_query.shape[0], index_t.shape[1]
+    if not 1 <= k <= n_cols:
+        raise ValueError(f"k must be in [1, {n_cols}], got {k}")
+
+    out_idx = np.zeros((n, k), dtype=np.int64)
+    out_val = np.zeros((n, k), dtype=np.float64)
+    fallback_rows = []
+
+    bounds = plan_chunks(estimate_row_cost(x_query, index_t), max_chunk_nnz)
+    next_log = 0
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        prod = (x_query[start:end] @ index_t).tocsr()
+        idx, vals, resolved = _select_sparse_rows(prod, k, n_cols)
+        out_idx[start:end] = idx
+        out_val[start:end] = vals
+        fallback_rows.append(start + np.flatnonzero(~resolved))
+        if progress_label and start >= next_log:
+            print(f"{progress_label} {start}/{n}")
+            next_log = (start // progress_every + 1) * progress_every
+
+    pending = np.concatenate(fallback_rows) if fallback_rows else np.zeros(0, dtype=np.int64)
+    for s in range(0, len(pending), DENSE_FALLBACK_BATCH):
+        rows = pending[s : s + DENSE_FALLBACK_BATCH]
+        sims = (x_query[rows] @ index_t).toarray()
+        idx, vals = dense_topk(sims, k)
+        out_idx[rows] = idx
+        out_val[rows] = vals
+    return out_idx, out_val
+
+
+def resolve_workers(workers: int) -> int:
+    """``workers <= 0`` means all available cores."""
+    if workers <= 0:
+        return max(os.cpu_count() or 1, 1)
+    return workers
+
+
+def _save_csr(m: sp.csr_matrix, folder: Path, name: str) -> None:
+    for part in ("data", "indices", "indptr"):
+        np.save(folder / f"{name}_{part}.npy", getattr(m, part))
+    np.save(folder / f"{name}_shape.npy", np.asarray(m.shape, dtype=np.int64))
+
+
+def _load_csr(folder: Path, name: str) -> sp.csr_matrix:
+    parts = [np.load(folder / f"{name}_{p}.npy", mmap_mode="r") for p in ("data", "indices", "indptr")]
+    shape = tuple(int(x) for x in np.load(folder / f"{name}_shape.npy"))
+    return sp.csr_matrix(tuple(parts), shape=shape, copy=False)
+
+
+# Per-process cache of memory-mapped matrices, keyed by scratch directory.
+_WORKER_MATS: Dict[str, Tuple[sp.csr_matrix, sp.csr_matrix]] = {}
+
+
+def _topk_shard(args: Tuple[str, int, int, int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    folder, start, end, k, max_chunk_nnz = args
+    if folder not in _WORKER_MATS:
+        _WORKER_MATS.clear()
+        _WORKER_MATS[folder] = (_load_csr(Path(folder), "query"), _load_csr(Path(folder), "index_t"))
+    x_query, index_t = _WORKER_MATS[folder]
+    return topk(x_query[start:end], None, k=k, max_chunk_nnz=max_chunk_nnz, index_t=index_t)
+
+
+def parallel_topk(
+    x_query: sp.spmatrix,
+    x_index: sp.spmatrix,
+    k: int = 1,
+    workers: int = 0,
+    max_chunk_nnz: int = DEFAULT_MAX_CHUNK_NNZ,
+    progress_label: Optional[str] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Process-pool variant of ``topk``; results are identical and in row order."""
+    workers = resolve_workers(workers)
+    x_query = sp.csr_matrix(x_query)
+    index_t = prepare_index(x_index)
+    n = x_query.shape[0]
+    if workers == 1 or n == 0:
+        return topk(x_query, None, k=k, max_chunk_nnz=max_chunk_nnz, index_t=index_t, progress_label=progress_label)
+
+    # Balance shards by estimated product size rather than by row count.
+    cost = estimate_row_cost(x_query, index_t)
+    n_shards = min(n, workers * SHARDS_PER_WORKER)
+    targets = np.linspace(0, cost.sum(), n_shards + 1)[1:-1]
+    cuts = np.searchsorted(np.cumsum(cost), targets, side="right")
+    bounds = np.unique(np.concatenate([[0], cuts, [n]]))
+
+    idx_parts: List[np.ndarray] = []
+    val_parts: List[np.ndarray] = []
+    with tempfile.TemporaryDirectory(prefix="sparse_topk_") as tmp:
+        folder = Path(tmp)
+        _save_csr(x_query, folder, "query")
+        _save_csr(index_t, folder, "index_t")
+        tasks = [(tmp, int(a), int(b), k, max_chunk_nnz) for a, b in zip(bounds[:-1], bounds[1:])]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for i, (idx, vals) in enumerate(pool.map(_topk_shard, tasks), 1):
+                idx_parts.append(idx)
+                val_parts.append(vals)
+                if progress_label:
+                    print(f"{progress_label} {tasks[i - 1][2]}/{n} (shard {i}/{len(tasks)}, {workers} workers)")
+    return np.concatenate(idx_parts), np.concatenate(val_parts)
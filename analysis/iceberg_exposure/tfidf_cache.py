@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Content-addressed cache for fitted TF-IDF vectorizers and their matrices.
+
+Every mapping script refits the same bigram ``TfidfVectorizer`` on the same
+tool/task corpus. This cache keys each fit on a hash of the scikit-learn
+version, the vectorizer params, the fit texts and the named texts to transform
+(so an upgrade never reuses another version's vocabulary or IDF), and stores
+per entry:
+
+- ``vocabulary.json`` + ``idf.npy``: enough to rebuild the fitted vectorizer,
+- ``<name>.npz``: the transformed CSR matrices (uncompressed, fast to load),
+- ``meta.json``: params, sizes and last-access time for eviction.
+
+Eviction is LRU by last access, bounded by total size and maximum age.
+
+CLI:
+    python tfidf_cache.py list
+    python tfidf_cache.py prune [--max-gb 2] [--max-age-days 30]
+    python tfidf_cache.py clear
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+import sklearn
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+ROOT = Path(__file__).resolve().parent
+CACHE_DIR = ROOT / "data" / "interim" / "tfidf_cache"
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+DEFAULT_MAX_AGE_DAYS = 30.0
+
+
+@dataclass
+class TfidfArtifacts:
+    vectorizer: TfidfVectorizer
+    matrices: Dict[str, sp.csr_matrix]
+    key: str
+    from_cache: bool
+
+
+def _params_json(params: Dict) -> str:
+    return json.dumps(params, sort_keys=True, default=list)
+
+
+def corpus_fingerprint(params: Dict, fit_texts: Sequence[str], transform_texts: Dict[str, Sequence[str]]) -> str:
+    h = hashlib.sha256()
+    h.update(f"sklearn={sklearn.__version__}\x1e".encode("utf-8"))
+    h.update(_params_json(params).encode("utf-8"))
+    for group_name, texts in [("__fit__", fit_texts)] + sorted(transform_texts.items()):
+        h.update(f"\x1e{group_name}\x1e{len(texts)}\x1e".encode("utf-8"))
+        for t in texts:
+            h.update(str(t).encode("utf-8"))
+            h.update(b"\x00")
+    return h.hexdigest()[:32]
+
+
+def save_vectorizer(folder: Path, vec: TfidfVectorizer) -> None:
+    folder.mkdir(parents=True, exist_ok=True)
+    vocab = {term: int(i) for term, i in vec.vocabulary_.items()}
+    (folder / "vocabulary.json").write_text(json.dumps(vocab, ensure_ascii=False), encoding="utf-8")
+    np.save(folder / "idf.npy", np.asarray(vec.idf_, dtype=np.float64))
+
+
+def load_vectorizer(folder: Path, params: Dict) -> TfidfVectorizer:
+    vec = TfidfVectorizer(**params)
+    vec.vocabulary_ = json.loads((folder / "vocabulary.json").read_text(encoding="utf-8"))
+    vec.idf_ = np.load(folder / "idf.npy")
+    return vec
+
+
+def _entry_bytes(folder: Path) -> int:
+    return int(sum(p.stat().st_size for p in folder.iterdir() if p.is_file()))
+
+
+def _touch(folder: Path) -> None:
+    meta_path = folder / "meta.json"
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    meta["last_access"] = time.time()
+    meta["hits"] = int(meta.get("hits", 0)) + 1
+    meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def _load_entry(folder: Path, params: Dict, names: List[str]) -> Optional[TfidfArtifacts]:
+    try:
+        vec = load_vectorizer(folder, params)
+        mats = {n: sp.load_npz(folder / f"{n}.npz").tocsr() for n in names}
+        _touch(folder)
+    except (OSError, ValueError, KeyError):
+        return None
+    return TfidfArtifacts(vectorizer=vec, matrices=mats, key=folder.name, from_cache=True)
+
+
+def fit_transform_cached(
+    params: Dict,
+    fit_texts: Sequence[str],
+    transform_texts: Dict[str, Sequence[str]],
+    cache_dir: Path = CACHE_DIR,
+    use_cache: bool = True,
+) -> TfidfArtifacts:
+    """Fit ``TfidfVectorizer(**params)`` on fit_texts and transform each named group, with caching."""
+    fit_texts = list(fit_texts)
+    key = corpus_fingerprint(params, fit_texts, transform_texts)
+    folder = cache_dir / key
+    if use_cache and (folder / "meta.json").exists():
+        hit = _load_entry(folder, params, list(transform_texts))
+        if hit is not None:
+            return hit
+
+    vec = TfidfVectorizer(**params)
+    vec.fit(fit_texts)
+    mats = {name: vec.transform(list(texts)).tocsr() for name, texts in transform_texts.items()}
+    if not use_cache:
+        return TfidfArtifacts(vectorizer=vec, matrices=mats, key=key, from_cache=False)
+
+    # Write into a temp dir first so readers never see a partial entry.
+    tmp = cache_dir / f".{key}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    save_vectorizer(tmp, vec)
+    for name, m in mats.items():
+        sp.save_npz(tmp / f"{name}.npz", m, compressed=False)
+    now = time.time()
+    meta = {
+        "key": key,
+        "params": json.loads(_params_json(params)),
+        "sklearn_version": sklearn.__version__,
+        "n_fit_texts": len(fit_texts),
+        "matrices": {name: list(m.shape) for name, m in mats.items()},
+        "vocabulary_size": len(vec.vocabulary_),
+        "created": now,
+        "last_access": now,
+        "hits": 0,
+    }
+    (tmp / "meta.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    shutil.rmtree(folder, ignore_errors=True)
+    tmp.rename(folder)
+    prune(cache_dir=cache_dir)
+    return TfidfArtifacts(vectorizer=vec, matrices=mats, key=key, from_cache=False)
+
+
+def list_entries(cache_dir: Path = CACHE_DIR) -> pd.DataFrame:
+    rows: List[Dict] = []
+    if cache_dir.exists():
+        for folder in sorted(cache_dir.iterdir()):
+            meta_path = folder / "meta.json"
+            if not folder.is_dir() or folder.name.startswith(".") or not meta_path.exists():
+                continue
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            rows.append(
+                {
+                    "key": folder.name,
+                    "size_mb": _entry_bytes(folder) / 1024**2,
+                    "vocabulary_size": meta.get("vocabulary_size"),
+                    "matrices": ", ".join(f"{k}={v[0]}x{v[1]}" for k, v in meta.get("matrices", {}).items()),
+                    "ngram_range": str(meta.get("params", {}).get("ngram_range")),
+                    "min_df": meta.get("params", {}).get("min_df"),
+                    "hits": int(meta.get("hits", 0)),
+                    "created": pd.to_datetime(meta.get("created"), unit="s"),
+                    "last_access": pd.to_datetime(meta.get("last_access"), unit="s"),
+                }
+            )
+    cols = ["key", "size_mb", "vocabulary_size", "matrices", "ngram_range", "min_df", "hits", "created", "last_access"]
+    return pd.DataFrame(rows, columns=cols).sort_values("last_access", ascending=False).reset_index(drop=True)
+
+
+def prune(
+    cache_dir: Path = CACHE_DIR,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+) -> List[str]:
+    """Drop entries unused for max_age_days, then least-recently used ones until under max_bytes."""
+    entries = list_entries(cache_dir)
+    removed: List[str] = []
+    if entries.empty:
+        return removed
+    cutoff = pd.Timestamp(time.time() - max_age_days * 86400.0, unit="s")
+    entries = entries.sort_values("last_access", ascending=True).reset_index(drop=True)
+    total = float(entries["size_mb"].sum()) * 1024**2
+    for _, r in entries.iterrows():
+        if r["last_access"] >= cutoff and total <= max_bytes:
+            continue
+        shutil.rmtree(cache_dir / r["key"], ignore_errors=True)
+        total -= float(r["size_mb"]) * 1024**2
+        removed.append(str(r["key"]))
+    return removed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect and prune the TF-IDF artifact cache.")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("list", help="List cache entries (most recently used first).")
+    p_prune = sub.add_parser("prune", help="Evict stale / least-recently used entries.")
+    p_prune.add_argument("--max-gb", type=float, default=DEFAULT_MAX_BYTES / 1024**3)
+    p_prune.add_argument("--max-age-days", type=float, default=DEFAULT_MAX_AGE_DAYS)
+    sub.add_parser("clear", help="Remove every cache entry.")
+    args = parser.parse_args()
+
+    if args.cmd == "list":
+        entries = list_entries(args.cache_dir)
+        if entries.empty:
+            print(f"No cache entries in {args.cache_dir}")
+            return
+        with pd.option_context("display.width", 200, "display.max_columns", None):
+            print(entries.to_string(index=False))
+        print(f"Total: {len(entries)} entries, {entries['size_mb'].sum():.1f} MB")
+    elif args.cmd == "prune":
+        removed = prune(args.cache_dir, max_bytes=int(args.max_gb * 1024**3), max_age_days=args.max_age_days)
+        print(f"Removed {len(removed)} entries: {', '.join(removed) if removed else '-'}")
+    elif args.cmd == "clear":
+        shutil.rmtree(args.cache_dir, ignore_errors=True)
+        print(f"Cleared {args.cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
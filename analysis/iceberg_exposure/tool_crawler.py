@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""Async crawler for the public tool catalogs (Zapier, OpenTools, MCP servers).
+
+The catalog builders in ``compute_task_exposure_paper_method.py`` used to fan
+``requests.get`` calls out over a thread pool with a fresh connection per call,
+fixed-sleep retries and no way to resume. This module provides:
+
+- ``AsyncCrawler``: asyncio front-end over pooled keep-alive ``requests``
+  sessions (one per I/O thread), with per-host concurrency limits, token-bucket
+  rate limits and exponential backoff with jitter (honouring ``Retry-After``).
+- ``Checkpoint``: append-only JSONL of finished work items, so an interrupted
+  crawl resumes from the last completed item instead of starting over. The
+  Zapier detail cache uses the same format and persists across runs, with a
+  freshness TTL per app.
+- Source drivers: ``crawl_zapier``, ``crawl_opentools`` (``nextOffset``
+  pagination) and ``fetch_mcp_readme``, returning the same row dicts as before.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import re
+import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+UA = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"}
+
+ZAPIER_APPS_URL = "https://zapier.com/apps"
+ZAPIER_DATA_HOST = "https://nextplore.vercel.zapier-deployment.com"
+OPENTOOLS_API_URL = "https://opentools.ai/api/tools"
+MCP_README_URL = "https://raw.githubusercontent.com/modelcontextprotocol/servers/main/README.md"
+
+RETRY_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+class CrawlError(RuntimeError):
+    pass
+
+
+@dataclass
+class HostPolicy:
+    max_concurrency: int = 8
+    rate_per_sec: float = 10.0
+    burst: int = 10
+
+
+DEFAULT_POLICIES: Dict[str, HostPolicy] = {
+    "zapier.com": HostPolicy(max_concurrency=2, rate_per_sec=2.0, burst=2),
+    urlparse(ZAPIER_DATA_HOST).netloc: HostPolicy(max_concurrency=20, rate_per_sec=25.0, burst=20),
+    "opentools.ai": HostPolicy(max_concurrency=2, rate_per_sec=2.0, burst=2),
+    "raw.githubusercontent.com": HostPolicy(max_concurrency=2, rate_per_sec=5.0, burst=5),
+}
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens/second, at most ``burst`` stored."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.capacity = float(max(burst, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+
+@dataclass
+class CrawlStats:
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    bytes: int = 0
+    by_host: Dict[str, int] = field(default_factory=dict)
+
+
+class AsyncCrawler:
+    """Rate-limited, retrying HTTP GETs driven from asyncio.
+
+    Requests run on a small thread pool; each thread keeps its own
+    ``requests.Session`` so TCP/TLS connections are reused across calls.
+    """
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, HostPolicy]] = None,
+        default_policy: Optional[HostPolicy] = None,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        timeout: float = 30.0,
+        io_threads: int = 32,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.policies = dict(DEFAULT_POLICIES if policies is None else policies)
+        self.default_policy = default_policy or HostPolicy()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.io_threads = io_threads
+        self.headers = dict(UA if headers is None else headers)
+        self.stats = CrawlStats()
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._sessions_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    async def __aenter__(self) -> "AsyncCrawler":
+        self._executor = ThreadPoolExecutor(max_workers=self.io_threads, thread_name_prefix="crawler")
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._sessions_lock:
+            for s in self._sessions:
+                s.close()
+            self._sessions.clear()
+
+    def _session(self) -> requests.Session:
+        s = getattr(self._local, "session", None)
+        if s is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+            s.mount("http://", adapter)
+            s.mount("https://", adapter)
+            s.headers.update(self.headers)
+            self._local.session = s
+            with self._sessions_lock:
+                self._sessions.append(s)
+        return s
+
+    def _host_limits(self, host: str) -> Tuple[asyncio.Semaphore, TokenBucket]:
+        if host not in self._semaphores:
+            p = self.policies.get(host, self.default_policy)
+            self._semaphores[host] = asyncio.Semaphore(p.max_concurrency)
+            self._buckets[host] = TokenBucket(p.rate_per_sec, p.burst)
+        return self._semaphores[host], self._buckets[host]
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        delay = min(self.backoff_max, self.backoff_base * (2**attempt))
+        return delay * (0.5 + random.random())
+
+    def _blocking_get(self, url: str, params: Optional[Dict]) -> requests.Response:
+        return self._session().get(url, params=params, timeout=self.timeout)
+
+    async def get(self, url: str, params: Optional[Dict] = None) -> requests.Response:
+        if self._executor is None:
+            raise CrawlError("AsyncCrawler must be used as 'async with AsyncCrawler() as crawler'.")
+        host = urlparse(url).netloc
+        sem, bucket = self._host_limits(host)
+        loop = asyncio.get_running_loop()
+        last_error = ""
+        async with sem:
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    self.stats.retries += 1
+                await bucket.acquire()
+                retry_after = None
+                try:
+                    r = await loop.run_in_executor(self._executor, self._blocking_get, url, params)
+                except requests.RequestException as e:
+                    last_error = f"{type(e).__name__}: {e}"
+                else:
+                    self.stats.requests += 1
+                    self.stats.bytes += len(r.content)
+                    self.stats.by_host[host] = self.stats.by_host.get(host, 0) + 1
+                    if r.status_code == 200:
+                        return r
+                    if r.status_code not in RETRY_STATUS:
+                        self.stats.failures += 1
+                        raise CrawlError(f"HTTP {r.status_code} for {url}")
+                    last_error = f"HTTP {r.status_code}"
+                    retry_after = r.headers.get("Retry-After")
+                if attempt < self.max_retries:
+                    await asyncio.sleep(self._backoff(attempt, retry_after))
+        self.stats.failures += 1
+        raise CrawlError(f"Failed after {self.max_retries + 1} attempts ({last_error}): {url}")
+
+    async def get_json(self, url: str, params: Optional[Dict] = None) -> Dict:
+        r = await self.get(url, params=params)
+        try:
+            return r.json()
+        except ValueError as e:
+            raise CrawlError(f"Invalid JSON from {url}: {e}") from e
+
+    async def get_text(self, url: str, params: Optional[Dict] = None) -> str:
+        return (await self.get(url, params=params)).text
+
+
+class Checkpoint:
+    """Append-only JSONL of completed work items: one ``{"key", "ts", "record"}`` per line.
+
+    Re-opening the same path reloads finished keys (last write wins); a torn last
+    line from a crash is ignored and cut off before new records are appended.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.done: Dict[str, Any] = {}
+        self.fetched_at: Dict[str, float] = {}
+        self.n_lines = 0
+        if path.exists():
+            with path.open("r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    try:
+                        obj = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    key = str(obj["key"])
+                    self.done[key] = obj["record"]
+                    self.fetched_at[key] = float(obj.get("ts", 0.0))
+                    self.n_lines += 1
+            self._drop_torn_tail()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = path.open("a", encoding="utf-8")
+
+    def _drop_torn_tail(self) -> None:
+        """Make the next append start on a fresh line.
+
+        An unterminated last line is truncated, unless it is a complete record
+        (torn just before its newline), which only gets the newline added.
+        """
+        with self.path.open("rb+") as f:
+            size = f.seek(0, 2)
+            pos = size
+            while pos > 0:
+                step = min(4096, pos)
+                f.seek(pos - step)
+                chunk = f.read(step)
+                nl = chunk.rfind(b"\n")
+                if nl >= 0:
+                    pos = pos - step + nl + 1
+                    break
+                pos -= step
+            if pos == size:
+                return
+            f.seek(pos)
+            try:
+                json.loads(f.read(size - pos))
+            except ValueError:
+                f.truncate(pos)
+            else:
+                f.seek(size)
+                f.write(b"\n")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.done
+
+    def add(self, key: str, record: Any) -> None:
+        ts = time.time()
+        self.done[key] = record
+        self.fetched_at[key] = ts
+        self._fh.write(json.dumps({"key": key, "ts": ts, "record": record}, ensure_ascii=False) + "\n")
+        self._fh.flush()
+        self.n_lines += 1
+
+    def is_fresh(self, key: str, max_age_sec: float) -> bool:
+        return key in self.done and time.time() - self.fetched_at[key] <= max_age_sec
+
+    def compact(self) -> None:
+        """Rewrite the file with only the latest record per key."""
+        self._fh.close()
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            for key, record in self.done.items():
+                f.write(json.dumps({"key": key, "ts": self.fetched_at[key], "record": record}, ensure_ascii=False) + "\n")
+        tmp.replace(self.path)
+        self.n_lines = len(self.done)
+        self._fh = self.path.open("a", encoding="utf-8")
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def discard(self) -> None:
+        """Remove the checkpoint after a completed crawl."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+def zapier_row(slug: str, tool_id: str, name: str, description: str = "") -> Dict:
+    return {
+        "source": "zapier",
+        "tool_id": tool_id,
+        "tool_name": name,
+        "slug": slug,
+        "headline": "",
+        "description": description,
+        "tags": "",
+        "tool_url": f"https://zapier.com/apps/{slug}/integrations",
+    }
+
+
+@dataclass
+class DetailCrawlStats:
+    apps: int = 0
+    fresh_cached: int = 0
+    fetched: int = 0
+    failed: int = 0
+    skipped_budget: int = 0
+    stale_reused: int = 0
+    with_description: int = 0
+    elapsed_sec: float = 0.0
+
+    def summary(self) -> str:
+        rate = self.fetched / self.elapsed_sec if self.elapsed_sec > 0 else 0.0
+        coverage = self.with_description / self.apps if self.apps else 0.0
+        return (
+            f"[zapier] detail coverage {self.with_description}/{self.apps} ({coverage:.1%}); "
+            f"fresh cached {self.fresh_cached}, fetched {self.fetched}, failed {self.failed}, "
+            f"over budget {self.skipped_budget} (stale reused {self.stale_reused}); "
+            f"{rate:.1f} apps/s over {self.elapsed_sec:.0f}s"
+        )
+
+
+async def crawl_zapier(
+    crawler: AsyncCrawler,
+    checkpoint_dir: Path,
+    detail_cache_path: Optional[Path] = None,
+    detail_limit: Optional[int] = None,
+    max_age_days: float = 30.0,
+    time_budget_sec: Optional[float] = None,
+) -> List[Dict]:
+    """Zapier app universe from the a-z index, with detail JSON for every app.
+
+    Details are streamed into an append-only cache (``detail_cache_path``, default
+    ``<checkpoint_dir>/zapier_detail.jsonl``) that persists across runs; apps whose
+    cached record is younger than ``max_age_days`` are not re-fetched. Missing apps
+    are fetched first, then stale ones oldest first. Once ``time_budget_sec`` is
+    spent no new fetches start; those apps keep their stale record, or fall back to
+    the index label. ``detail_limit`` optionally caps the number of apps with details.
+    """
+    started = time.monotonic()
+    html = await crawler.get_text(ZAPIER_APPS_URL)
+    m = re.search(r"_next/static/([^/]+)/_buildManifest\.js", html)
+    if not m:
+        raise RuntimeError("Cannot parse Zapier build id from /apps page.")
+    build_id = m.group(1)
+    base = f"{ZAPIER_DATA_HOST}/_next/data/{build_id}/find-apps"
+
+    # 1) Index pages (a-z + 0-9) -> slugs. Keys carry the build id, so a new
+    # deployment re-crawls the index; empty pages are not checkpointed and are
+    # retried on the next run.
+    index_ck = Checkpoint(checkpoint_dir / "zapier_index.jsonl")
+
+    async def fetch_index(letter: str) -> None:
+        data = await crawler.get_json(f"{base}/{letter}.json")
+        page = data.get("pageProps") if isinstance(data, dict) else None
+        items = page.get("linkColumnItems") if isinstance(page, dict) else None
+        entries = []
+        for it in items if isinstance(items, list) else []:
+            if not isinstance(it, dict):
+                continue
+            parts = str(it.get("href", "")).strip("/").split("/")
+            if len(parts) >= 3 and parts[0] == "find-apps" and parts[2]:
+                entries.append([parts[1], parts[2], str(it.get("label", "")).strip()])
+        if entries:
+            index_ck.add(f"{build_id}/{letter}", entries)
+        else:
+            print(f"[zapier] index page {letter!r} has no apps; will retry on the next run")
+
+    letters = list(string.ascii_lowercase) + ["0-9"]
+    await asyncio.gather(*(fetch_index(s) for s in letters if f"{build_id}/{s}" not in index_ck))
+    rows: List[Tuple[str, str, str]] = []
+    seen = set()
+    for s in letters:
+        for starts_with, slug, label in index_ck.done.get(f"{build_id}/{s}", []):
+            if slug not in seen:
+                seen.add(slug)
+                rows.append((starts_with, slug, label))
+    if not rows:
+        raise RuntimeError("Zapier index crawl produced no tools.")
+
+    # 2) Detail JSON per slug, skipping fresh cache entries.
+    cache = Checkpoint(detail_cache_path or checkpoint_dir / "zapier_detail.jsonl")
+    max_age_sec = max_age_days * 86400.0
+    detail_rows = rows if detail_limit is None else rows[: min(detail_limit, len(rows))]
+    stats = DetailCrawlStats(apps=len(rows))
+    todo = [r for r in detail_rows if not cache.is_fresh(r[1], max_age_sec)]
+    todo.sort(key=lambda r: cache.fetched_at.get(r[1], -1.0))
+    stats.fresh_cached = len(detail_rows) - len(todo)
+    print(f"[zapier] {len(rows)} apps, detail {stats.fresh_cached} fresh in cache / {len(todo)} to fetch")
+
+    deadline = None if time_budget_sec is None else started + time_budget_sec
+    fetched_now = set()
+    queue: asyncio.Queue = asyncio.Queue()
+    for r in todo:
+        queue.put_nowait(r)
+
+    async def worker() -> None:
+        while True:
+            try:
+                starts_with, slug, label = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if deadline is not None and time.monotonic() >= deadline:
+                stats.skipped_budget += 1
+                continue
+            try:
+                obj = await crawler.get_json(f"{base}/{starts_with}/{slug}.json")
+            except CrawlError:
+                stats.failed += 1
+                continue
+            if not isinstance(obj, dict):
+                stats.failed += 1
+                continue
+            page = obj.get("pageProps")
+            app = page.get("app") if isinstance(page, dict) else None
+            if not isinstance(app, dict):
+                app = {}
+            name = str(app.get("name", label)).strip() or label
+            cache.add(slug, zapier_row(slug, str(app.get("id", slug)), name, str(app.get("description", "")).strip()))
+            fetched_now.add(slug)
+            stats.fetched += 1
+            if stats.fetched % 500 == 0:
+                el = time.monotonic() - started
+                print(f"[zapier] fetched detail {stats.fetched}/{len(todo)} ({stats.fetched / el:.1f} apps/s)")
+
+    # Bounded fan-out: as many consumers as the data host allows in flight.
+    host_policy = crawler.policies.get(urlparse(ZAPIER_DATA_HOST).netloc, crawler.default_policy)
+    await asyncio.gather(*(worker() for _ in range(max(1, host_policy.max_concurrency))))
+
+    detail_slugs = {r[1] for r in detail_rows}
+    out = []
+    for _, slug, label in rows:
+        if slug in cache and slug in detail_slugs:
+            rec = cache.done[slug]
+            if slug not in fetched_now and not cache.is_fresh(slug, max_age_sec):
+                stats.stale_reused += 1
+        else:
+            rec = zapier_row(slug, slug, label)
+        stats.with_description += bool(rec["description"])
+        out.append(rec)
+    stats.elapsed_sec = time.monotonic() - started
+    print(stats.summary())
+
+    if cache.n_lines > 2 * max(len(cache.done), 1):
+        cache.compact()
+    cache.close()
+    index_ck.discard()
+    return out
+
+
+def opentools_row(it: Dict) -> Dict:
+    tags = it.get("tags", [])
+    if isinstance(tags, list):
+        tags_s = ", ".join(str(x) for x in tags if isinstance(x, str))
+    else:
+        tags_s = str(tags)
+    return {
+        "source": "opentools",
+        "tool_id": str(it.get("id", "")),
+        "tool_name": str(it.get("tool_name", "")).strip(),
+        "slug": str(it.get("slug", "")).strip(),
+        "headline": str(it.get("headline", "")).strip(),
+        "description": str(it.get("summary", "") or it.get("description", "")).strip(),
+        "tags": tags_s,
+        "tool_url": str(it.get("tool_url", "")),
+    }
+
+
+async def crawl_opentools(crawler: AsyncCrawler, checkpoint_dir: Path, limit: int = 1000) -> List[Dict]:
+    """All OpenTools entries following ``nextOffset``; each page is checkpointed by its offset."""
+    ck = Checkpoint(checkpoint_dir / "opentools_pages.jsonl")
+    rows: List[Dict] = []
+    offset: Any = 0
+    total = None
+    while True:
+        key = str(offset)
+        if key in ck:
+            page = ck.done[key]
+        else:
+            obj = await crawler.get_json(OPENTOOLS_API_URL, params={"offset": offset, "limit": limit})
+            page = {
+                "rows": [opentools_row(it) for it in obj.get("data", [])],
+                "total": obj.get("total"),
+                "next": obj.get("nextOffset") if obj.get("hasNextPage") else None,
+            }
+            ck.add(key, page)
+        rows.extend(page["rows"])
+        total = page["total"] if page["total"] is not None else total
+        print(f"[opentools] collected {len(rows)} / {total if total is not None else '?'}")
+        offset = page["next"]
+        if offset is None:
+            break
+    ck.discard()
+    return rows
+
+
+async def fetch_mcp_readme(crawler: AsyncCrawler) -> str:
+    return await crawler.get_text(MCP_README_URL)
+
+
+def run(coro_fn, *args: Any, crawler_kwargs: Optional[Dict] = None, **kwargs: Any) -> Any:
+    """Run ``coro_fn(crawler, *args, **kwargs)`` inside a fresh crawler and event loop."""
+
+    async def _main() -> Any:
+        async with AsyncCrawler(**(crawler_kwargs or {})) as crawler:
+            result = await coro_fn(crawler, *args, **kwargs)
+            s = crawler.stats
+            print(f"[crawler] {s.requests} requests, {s.retries} retries, {s.failures} failures, {s.bytes / 1024**2:.1f} MB")
+            return result
+
+    return asyncio.run(_main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Year-parallel industry / occupation exposure aggregation with phase timings.
+
+Each year of OEWS data is independent: the industry (nat4d) and national
+occupation readers only need the year and the occupation exposure table. This
+module fans years out over a process pool, gathers results back in ``years``
+order (so concatenation is deterministic and identical to the serial loop) and
+collects a per-year, per-phase timing breakdown (read, matvec and sector_map for the
+industry reader; read, filter and merge for the national occupation reader).
+
+Readers opt in by accepting ``timer: Optional[PhaseTimer] = None`` and calling
+``timer.lap(phase)`` after each phase.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+
+YearReader = Callable[..., pd.DataFrame]
+
+
+class PhaseTimer:
+    """Lap timer: ``lap(phase)`` books the time since the previous lap under ``phase``."""
+
+    def __init__(self, year: Optional[int] = None, step: str = ""):
+        self.year = year
+        self.step = step
+        self.records: List[Dict] = []
+        self._last = time.perf_counter()
+
+    def start(self, step: str) -> None:
+        self.step = step
+        self._last = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.records.append({"year": self.year, "step": self.step, "phase": phase, "seconds": now - self._last})
+        self._last = now
+
+
+def lap(timer: Optional[PhaseTimer], phase: str) -> None:
+    if timer is not None:
+        timer.lap(phase)
+
+
+def _year_job(args: Tuple[int, YearReader, YearReader, pd.DataFrame]) -> Tuple[pd.DataFrame, pd.DataFrame, List[Dict]]:
+    year, industry_reader, occupation_reader, occ_exposure = args
+    timer = PhaseTimer(year=year)
+    t0 = time.perf_counter()
+    timer.start("industry")
+    ind = industry_reader(year, occ_exposure, timer=timer)
+    timer.start("occupation")
+    occ = occupation_reader(year, occ_exposure, timer=timer)
+    timer.records.append({"year": year, "step": "total", "phase": "wall", "seconds": time.perf_counter() - t0})
+    return ind, occ, timer.records
+
+
+def aggregate_years(
+    years: Sequence[int],
+    occ_exposure: pd.DataFrame,
+    industry_reader: YearReader,
+    occupation_reader: YearReader,
+    workers: int = 1,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Run both readers for every year; returns (industry_ts, occupation_ts, timings).
+
+    ``workers=1`` runs in-process; ``workers<=0`` uses one process per year, capped
+    at the core count. Readers must be module-level functions (picklable).
+    """
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(years)))
+    jobs = [(int(y), industry_reader, occupation_reader, occ_exposure) for y in years]
+
+    t0 = time.perf_counter()
+    if workers == 1:
+        results = [_year_job(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_year_job, jobs))
+    wall = time.perf_counter() - t0
+
+    industry_ts = pd.concat([r[0] for r in results], ignore_index=True)
+    occupation_ts = pd.concat([r[1] for r in results], ignore_index=True)
+    records = [rec for r in results for rec in r[2]]
+    records.append({"year": None, "step": "all_years", "phase": "wall", "seconds": wall})
+    timings = pd.DataFrame(records, columns=["year", "step", "phase", "seconds"])
+    timings["year"] = timings["year"].astype("Int64")
+    timings["workers"] = workers
+    return industry_ts, occupation_ts, timings
+
+
+def format_timings(timings: pd.DataFrame) -> str:
+    """Year x (step/phase) table of seconds plus the overall wall time."""
+    per_phase = timings[timings["phase"] != "wall"].copy()
+    per_phase["col"] = per_phase["step"] + "/" + per_phase["phase"]
+    table = per_phase.pivot_table(index="year", columns="col", values="seconds", aggfunc="sum", sort=False)
+    year_wall = timings[(timings["step"] == "total")].set_index("year")["seconds"]
+    table["year_wall"] = year_wall
+    total = timings.loc[timings["step"] == "all_years", "seconds"]
+    lines = [table.round(3).to_string()]
+    if not total.empty:
+        lines.append(
+            f"all years wall: {float(total.iloc[0]):.2f}s with {int(timings['workers'].iloc[0])} worker(s); "
+            f"sum of per-year wall: {float(year_wall.sum()):.2f}s"
+        )
+    return "\n".join(lines)
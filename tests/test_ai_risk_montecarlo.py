@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from ai_risk_batch import ProfileBatch
+from ai_risk_benchmark import random_profiles
+from ai_risk_model import AIAutomationRiskModel
+
+
+@pytest.fixture(scope="module")
+def batch():
+    return ProfileBatch.from_profiles(random_profiles(2000, seed=1))
+
+
+@pytest.mark.parametrize("year", [None, 2030, 2035, 2040])
+def test_zero_noise_matches_point_estimate(batch, year):
+    model = AIAutomationRiskModel()
+    dist = model.simulate_timelines(batch, n_samples=4, growth_sigma=0, ceiling_sd=0, year=year)
+    expected = model.batch_assess(batch, year=year).预计替代年份
+    assert (dist.年份 == expected[:, None]).all()
+
+
+def test_noisy_median_stays_near_point_estimate_for_future_year(batch):
+    model = AIAutomationRiskModel()
+    dist = model.simulate_timelines(batch, n_samples=500, year=2035)
+    expected = model.batch_assess(batch, year=2035).预计替代年份
+    assert np.abs(dist.percentile(50) - expected).max() <= 3
+
+
+def test_chunking_does_not_change_result(batch):
+    model = AIAutomationRiskModel()
+    a = model.simulate_timelines(batch, n_samples=200, year=2032)
+    b = model.simulate_timelines(batch, n_samples=200, year=2032, max_cells=200 * 37)
+    assert (a.年份 == b.年份).all()
+
+
+def test_workers_do_not_change_result(batch):
+    model = AIAutomationRiskModel()
+    a = model.simulate_timelines(batch, n_samples=200, year=2032)
+    b = model.simulate_timelines(batch, n_samples=200, year=2032, workers=3, max_cells=200 * 37)
+    assert (a.年份 == b.年份).all()
@@ -0,0 +1,18 @@
+from ai_risk_model import AIAutomationRiskModel
+
+
+def test_every_year_has_the_same_benchmark_keys():
+    model = AIAutomationRiskModel()
+    trajectory = model.trajectory
+    for year in trajectory.years:
+        table, default = trajectory.benchmarks(year)
+        for entry in list(table.values()) + [default]:
+            assert set(entry) == {"当前", "年增长率", "上限", "瞬时增长率"}
+
+
+def test_base_year_entry_is_the_raw_benchmark():
+    model = AIAutomationRiskModel()
+    table, _ = model.trajectory.benchmarks(model.current_year)
+    for name, raw in AIAutomationRiskModel.AI_CAPABILITY_BENCHMARKS.items():
+        assert table[name]["当前"] == raw["当前"]
+        assert table[name]["瞬时增长率"] == raw["年增长率"]
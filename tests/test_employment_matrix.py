@@ -0,0 +1,66 @@
+import os
+
+import pandas as pd
+import pytest
+
+import bls_cache
+import employment_matrix
+
+
+def _detail(emp):
+    return pd.DataFrame(
+        {
+            "o_group": ["detailed", "detailed", "major"],
+            "area": ["99", "99", "99"],
+            "naics": ["111100", "222200", "111100"],
+            "naics_title": ["Farms", "Mines", "Farms"],
+            "occ_code": ["11-1011", "11-1011", "11-0000"],
+            "tot_emp": [emp, 5.0, 99.0],
+        }
+    )
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    tables = {"emp": 10.0}
+    calls = []
+
+    def read(path, columns=None, **kwargs):
+        calls.append(path)
+        return _detail(tables["emp"])
+
+    monkeypatch.setattr(bls_cache, "read_bls_table", read)
+    return tables, calls
+
+
+def test_cache_survives_touch_but_not_content_or_source_change(tmp_path, builds):
+    tables, calls = builds
+    src = tmp_path / "a" / "nat4d_M2024_dl.xlsx"
+    src.parent.mkdir()
+    src.write_bytes(b"v1")
+    cache = tmp_path / "cache"
+
+    E = employment_matrix.load(2024, src, cache)
+    assert E.industry_totals().tolist() == [10.0, 5.0]
+    employment_matrix.load(2024, src, cache)
+    assert len(calls) == 1
+
+    # Same bytes, new mtime: the sha256 fallback keeps the entry.
+    st = src.stat()
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    employment_matrix.load(2024, src, cache)
+    assert len(calls) == 1
+
+    # Same size and mtime but another workbook path: rebuilt.
+    other = tmp_path / "b" / "nat4d_M2024_dl.xlsx"
+    other.parent.mkdir()
+    other.write_bytes(b"v1")
+    os.utime(other, ns=(src.stat().st_atime_ns, src.stat().st_mtime_ns))
+    employment_matrix.load(2024, other, cache)
+    assert len(calls) == 2
+
+    # New content: rebuilt.
+    tables["emp"] = 20.0
+    other.write_bytes(b"v2")
+    assert employment_matrix.load(2024, other, cache).industry_totals().tolist() == [20.0, 5.0]
+    assert len(calls) == 3
@@ -0,0 +1,97 @@
+import functools
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import compute_task_exposure_paper_method as base
+import sparse_topk
+import tfidf_cache
+
+
+WORDS = [
+    "schedule", "invoice", "email", "report", "customer", "ledger", "payroll", "ticket", "calendar", "inventory",
+    "shipment", "contract", "survey", "budget", "forecast", "lead", "campaign", "document", "spreadsheet", "meeting",
+]
+
+
+def _text(rnd, n):
+    return " ".join(rnd.choice(WORDS) for _ in range(n))
+
+
+def _tasks(rnd, n=60):
+    return pd.DataFrame(
+        {
+            "onet_soc_code": [f"11-{1000 + i // 5}.00" for i in range(n)],
+            "task_id": [str(i) for i in range(n)],
+            "task_text_clean": [_text(rnd, rnd.randint(3, 8)) for _ in range(n)],
+        }
+    )
+
+
+def _tools(rows):
+    return pd.DataFrame(rows, columns=["source", "tool_name", "tool_text"])
+
+
+@pytest.fixture(autouse=True)
+def no_tfidf_disk_cache(monkeypatch):
+    monkeypatch.setattr(base.tfidf_cache, "fit_transform_cached", functools.partial(tfidf_cache.fit_transform_cached, use_cache=False))
+
+
+def _full_reference(task_df, tools_df, state_dir):
+    vec = tfidf_cache.load_vectorizer(state_dir, base.TOOL_TFIDF_PARAMS)
+    x_tasks = vec.transform(task_df["task_text_clean"].tolist()).tocsr()
+    x_tools = vec.transform(tools_df["tool_text"].tolist()).tocsr()
+    idx, vals = sparse_topk.topk(x_tasks, x_tools, k=1)
+    return vals[:, 0].astype(np.float32), idx[:, 0].astype(np.int32)
+
+
+def test_incremental_matches_full_topk_with_frozen_vectorizer(tmp_path):
+    rnd = random.Random(7)
+    task_df = _tasks(rnd)
+    v1 = _tools([("zapier", f"app{i}", _text(rnd, rnd.randint(2, 6))) for i in range(40)])
+    state = tmp_path / "state"
+    first = base.map_tools_to_tasks(task_df, v1, save_state=True, state_dir=state)
+
+    # Pick edits that hit current top tools so the stale path is exercised.
+    tops = first["top_tool_idx"].value_counts().index.tolist()
+    removed, modified, tied = tops[0], tops[1], tops[2]
+    rows = [tuple(r) for r in v1.itertuples(index=False)]
+    v2 = []
+    for i, (src, name, text) in enumerate(rows):
+        if i == tied:
+            # Exact tie: identical text, one copy ahead of the original (wins), one behind (loses).
+            v2.append(("opentools", "clone-ahead", text))
+        background = i not in (removed, modified, tied)
+        if i == removed or (background and i % 9 == 4):
+            continue
+        if i == modified or (background and i % 7 == 3):
+            text = _text(rnd, 4)
+        v2.append((src, name, text))
+        if i == tied:
+            v2.append(("opentools", "clone-behind", text))
+        if i % 10 == 5:
+            v2.append(("mcp_servers", f"new{i}", _text(rnd, rnd.randint(2, 6))))
+    v2 = _tools(v2)
+
+    want_sim, want_idx = _full_reference(task_df, v2, state)
+    got = base.map_tools_to_tasks_incremental(task_df, v2, state_dir=state)
+    np.testing.assert_array_equal(got["tool_similarity"].to_numpy(np.float32), want_sim)
+    np.testing.assert_array_equal(got["top_tool_idx"].to_numpy(), want_idx)
+    ahead = int(np.flatnonzero(v2["tool_name"] == "clone-ahead")[0])
+    assert (got["top_tool_idx"] == ahead).any()
+    assert not (got["top_tool_name"] == "clone-behind").any()
+
+    # A second refresh with nothing changed keeps the same answer.
+    again = base.map_tools_to_tasks_incremental(task_df, v2, state_dir=state)
+    np.testing.assert_array_equal(again["top_tool_idx"].to_numpy(), want_idx)
+    np.testing.assert_array_equal(again["tool_similarity"].to_numpy(np.float32), want_sim)
+
+
+def test_tool_keys_ignore_row_order_of_repeated_names():
+    rows = [("zapier", "Slack", "chat a"), ("zapier", "Slack", "chat b"), ("mcp_servers", "Git", "repo tool")]
+    keys = base.tool_keys(_tools(rows))
+    reordered = base.tool_keys(_tools(rows[::-1]))
+    assert dict(zip(keys, [r[2] for r in rows])) == dict(zip(reordered, [r[2] for r in rows[::-1]]))
+    assert keys.iloc[2] == "mcp_servers|Git"
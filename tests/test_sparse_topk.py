@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from sklearn.metrics.pairwise import linear_kernel
+
+import sparse_topk
+
+
+def quantized_csr(rng, n_rows, n_cols, density):
+    """Random CSR with values from a tiny set, so many rows have exact ties."""
+    m = sp.random(n_rows, n_cols, density=density, format="csr", random_state=rng, data_rvs=lambda s: rng.integers(1, 4, size=s) / 2.0)
+    keep = np.ones(n_rows)
+    keep[rng.choice(n_rows, size=max(1, n_rows // 10), replace=False)] = 0  # some all-zero rows
+    m = (sp.diags(keep) @ m).tocsr()
+    m.eliminate_zeros()
+    return m
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    rng = np.random.default_rng(3)
+    return quantized_csr(rng, 300, 40, 0.15), quantized_csr(rng, 120, 40, 0.12)
+
+
+@pytest.mark.parametrize("k", [1, 3, 5])
+@pytest.mark.parametrize("max_chunk_nnz", [sparse_topk.DEFAULT_MAX_CHUNK_NNZ, 50])
+def test_topk_is_bit_identical_to_dense_reference(corpus, k, max_chunk_nnz):
+    x_query, x_index = corpus
+    want_idx, want_val = sparse_topk.dense_topk(linear_kernel(x_query, x_index), k)
+    idx, val = sparse_topk.topk(x_query, x_index, k=k, max_chunk_nnz=max_chunk_nnz)
+    np.testing.assert_array_equal(idx, want_idx)
+    np.testing.assert_array_equal(val, want_val)
+
+
+@pytest.mark.parametrize("k", [1, 3, 5])
+def test_parallel_topk_matches_sequential_reference(corpus, k):
+    x_query, x_index = corpus
+    want_idx, want_val = sparse_topk.topk(x_query, x_index, k=k)
+    idx, val = sparse_topk.parallel_topk(x_query, x_index, k=k, workers=3, max_chunk_nnz=50)
+    np.testing.assert_array_equal(idx, want_idx)
+    np.testing.assert_array_equal(val, want_val)
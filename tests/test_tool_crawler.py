@@ -0,0 +1,262 @@
+import asyncio
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import tool_crawler
+from tool_crawler import AsyncCrawler, Checkpoint, CrawlError, HostPolicy
+
+
+class StubServer:
+    """Local HTTP server; ``routes`` maps a path to ``fn(query) -> (status, headers, body)``."""
+
+    def __init__(self):
+        self.routes = {}
+        self.hits = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                with stub.lock:
+                    stub.hits[url.path] += 1
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    route = stub.routes.get(url.path)
+                    status, headers, body = route(query) if route else (404, {}, "not found")
+                finally:
+                    with stub.lock:
+                        stub.in_flight -= 1
+                data = body if isinstance(body, bytes) else (body if isinstance(body, str) else json.dumps(body)).encode()
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.host = f"127.0.0.1:{self.httpd.server_address[1]}"
+        self.url = f"http://{self.host}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def sequence(self, path, responses):
+        """Serve ``responses`` in order, repeating the last one."""
+        it = iter(responses)
+        last = [None]
+
+        def route(query):
+            last[0] = next(it, last[0])
+            return last[0]
+
+        self.routes[path] = route
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = StubServer()
+    yield server
+    server.close()
+
+
+FAST = dict(policies={}, default_policy=HostPolicy(max_concurrency=8, rate_per_sec=1000.0, burst=1000), backoff_base=0.01, timeout=5.0)
+
+
+def crawl(coro_fn, **crawler_kwargs):
+    async def main():
+        async with AsyncCrawler(**{**FAST, **crawler_kwargs}) as crawler:
+            return crawler, await coro_fn(crawler)
+
+    return asyncio.run(main())
+
+
+def test_retries_429_and_5xx_with_exponential_backoff(stub, monkeypatch):
+    monkeypatch.setattr(tool_crawler.random, "random", lambda: 0.5)
+    stub.sequence(
+        "/flaky",
+        [(429, {"Retry-After": "0.05"}, "slow down"), (503, {}, "busy"), (500, {}, "oops"), (200, {}, {"ok": 1})],
+    )
+    delays = []
+
+    async def fetch(crawler):
+        backoff = crawler._backoff
+
+        def recording(attempt, retry_after=None):
+            delays.append(backoff(attempt, retry_after))
+            return delays[-1]
+
+        crawler._backoff = recording
+        return await crawler.get_json(f"{stub.url}/flaky")
+
+    crawler, body = crawl(fetch, max_retries=3, backoff_base=0.02)
+    assert body == {"ok": 1}
+    assert stub.hits["/flaky"] == 4
+    assert crawler.stats.retries == 3
+    assert delays == pytest.approx([0.05, 0.04, 0.08])
+
+
+def test_gives_up_after_max_retries_and_does_not_retry_4xx(stub):
+    stub.sequence("/down", [(503, {}, "busy")])
+    with pytest.raises(CrawlError, match="after 3 attempts"):
+        crawl(lambda c: c.get(f"{stub.url}/down"), max_retries=2)
+    assert stub.hits["/down"] == 3
+
+    with pytest.raises(CrawlError, match="HTTP 404"):
+        crawl(lambda c: c.get(f"{stub.url}/missing"), max_retries=2)
+    assert stub.hits["/missing"] == 1
+
+
+def test_per_host_concurrency_limit(stub):
+    def slow(query):
+        time.sleep(0.1)
+        return 200, {}, "ok"
+
+    stub.routes["/slow"] = slow
+    policy = HostPolicy(max_concurrency=3, rate_per_sec=1000.0, burst=1000)
+
+    async def fan_out(crawler):
+        await asyncio.gather(*(crawler.get(f"{stub.url}/slow") for _ in range(12)))
+
+    crawl(fan_out, policies={stub.host: policy})
+    assert stub.hits["/slow"] == 12
+    assert 2 <= stub.max_in_flight <= 3
+
+
+def test_token_bucket_rate_limit(stub):
+    stub.sequence("/fast", [(200, {}, "ok")])
+    policy = HostPolicy(max_concurrency=10, rate_per_sec=20.0, burst=2)
+
+    async def fan_out(crawler):
+        t0 = time.monotonic()
+        await asyncio.gather(*(crawler.get(f"{stub.url}/fast") for _ in range(10)))
+        return time.monotonic() - t0
+
+    _, elapsed = crawl(fan_out, policies={stub.host: policy})
+    # 2 requests from the burst, the other 8 at 20/s.
+    assert elapsed >= 0.35
+    assert stub.hits["/fast"] == 10
+
+
+def opentools_pages(stub, fail_second_page):
+    pages = {
+        "0": {"data": [{"id": 1, "tool_name": "A"}, {"id": 2, "tool_name": "B"}], "total": 4, "hasNextPage": True, "nextOffset": "cur-2"},
+        "cur-2": {"data": [{"id": 3, "tool_name": "C"}], "total": 4, "hasNextPage": True, "nextOffset": "cur-3"},
+        "cur-3": {"data": [{"id": 4, "tool_name": "D"}], "total": 4, "hasNextPage": False, "nextOffset": "cur-4"},
+    }
+    seen = Counter()
+
+    def route(query):
+        offset = query["offset"]
+        seen[offset] += 1
+        if fail_second_page[0] and offset == "cur-2":
+            return 503, {}, "busy"
+        return 200, {}, pages[offset]
+
+    stub.routes["/api/tools"] = route
+    return seen
+
+
+def test_opentools_follows_next_offset(stub, tmp_path, monkeypatch):
+    monkeypatch.setattr(tool_crawler, "OPENTOOLS_API_URL", f"{stub.url}/api/tools")
+    seen = opentools_pages(stub, [False])
+    _, rows = crawl(lambda c: tool_crawler.crawl_opentools(c, tmp_path, limit=2))
+    assert [r["tool_id"] for r in rows] == ["1", "2", "3", "4"]
+    assert seen == {"0": 1, "cur-2": 1, "cur-3": 1}
+    assert not (tmp_path / "opentools_pages.jsonl").exists()
+
+
+def test_opentools_resumes_from_checkpoint_after_interruption(stub, tmp_path, monkeypatch):
+    monkeypatch.setattr(tool_crawler, "OPENTOOLS_API_URL", f"{stub.url}/api/tools")
+    fail = [True]
+    seen = opentools_pages(stub, fail)
+    with pytest.raises(CrawlError):
+        crawl(lambda c: tool_crawler.crawl_opentools(c, tmp_path), max_retries=1)
+    checkpoint = tmp_path / "opentools_pages.jsonl"
+    assert list(Checkpoint(checkpoint).done) == ["0"]
+
+    fail[0] = False
+    _, rows = crawl(lambda c: tool_crawler.crawl_opentools(c, tmp_path))
+    assert [r["tool_name"] for r in rows] == ["A", "B", "C", "D"]
+    assert seen["0"] == 1
+    assert not checkpoint.exists()
+
+
+def test_checkpoint_ignores_torn_last_line(tmp_path):
+    path = tmp_path / "ck.jsonl"
+    ck = Checkpoint(path)
+    ck.add("a", [1])
+    ck.add("b", [2])
+    ck.close()
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"key": "c", "ts": 1, "rec')
+    again = Checkpoint(path)
+    assert again.done == {"a": [1], "b": [2]}
+    again.add("d", [4])
+    again.close()
+    assert Checkpoint(path).done == {"a": [1], "b": [2], "d": [4]}
+
+
+def test_checkpoint_keeps_complete_record_missing_its_newline(tmp_path):
+    path = tmp_path / "ck.jsonl"
+    path.write_text('{"key": "a", "ts": 1, "record": [1]}\n{"key": "b", "ts": 1, "record": [2]}', encoding="utf-8")
+    ck = Checkpoint(path)
+    ck.add("c", [3])
+    ck.close()
+    assert Checkpoint(path).done == {"a": [1], "b": [2], "c": [3]}
+
+
+def zapier_site(stub, build_id, index):
+    stub.routes["/apps"] = lambda q: (200, {}, f'<script src="/_next/static/{build_id}/_buildManifest.js"></script>')
+    for letter in tool_crawler.string.ascii_lowercase + "0":
+        key = "0-9" if letter == "0" else letter
+        items = [{"href": f"/find-apps/{key}/{slug}", "label": label} for slug, label in index.get(key, [])]
+        stub.routes[f"/_next/data/{build_id}/find-apps/{key}.json"] = (
+            lambda q, items=items: (200, {}, {"pageProps": {"linkColumnItems": items}})
+        )
+
+
+def test_zapier_retries_empty_index_pages_and_ignores_other_builds(stub, tmp_path, monkeypatch):
+    monkeypatch.setattr(tool_crawler, "ZAPIER_APPS_URL", f"{stub.url}/apps")
+    monkeypatch.setattr(tool_crawler, "ZAPIER_DATA_HOST", stub.url)
+    stale = Checkpoint(tmp_path / "zapier_index.jsonl")
+    stale.add("OLD/a", [["a", "gone", "Gone"]])
+    stale.close()
+
+    zapier_site(stub, "B1", {})
+    with pytest.raises(RuntimeError, match="no tools"):
+        crawl(lambda c: tool_crawler.crawl_zapier(c, tmp_path))
+
+    zapier_site(stub, "B1", {"a": [("asana", "Asana")], "s": [("slack", "Slack")]})
+    stub.routes["/_next/data/B1/find-apps/s/slack.json"] = lambda q: (
+        200,
+        {},
+        {"pageProps": {"app": {"id": 7, "name": "Slack", "description": "Team chat"}}},
+    )
+    _, rows = crawl(lambda c: tool_crawler.crawl_zapier(c, tmp_path))
+    assert [(r["slug"], r["tool_name"], r["description"]) for r in rows] == [
+        ("asana", "Asana", ""),
+        ("slack", "Slack", "Team chat"),
+    ]
+    assert stub.hits["/_next/data/B1/find-apps/a.json"] == 2
+    assert not (tmp_path / "zapier_index.jsonl").exists()